@@ -1,7 +1,18 @@
 import argparse
 import asyncio
+import multiprocessing
 import sys
 import signal
+import time
+
+# 启动性能分析：须在导入其它项目模块之前安装导入计时器
+if "--profile-startup" in sys.argv:
+    from src.utils.startup_profiler import install_import_profiler
+
+    install_import_profiler()
+
+# 最先导入的项目模块：作为启动计时起点
+from src.utils.startup_timeline import get_startup_timeline
 
 from src.application import Application
 from src.utils.logging_config import get_logger, setup_logging
@@ -31,6 +42,11 @@ def parse_args():
         action="store_true",
         help="跳过激活流程，直接启动应用（仅用于调试）",
     )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="记录模块导入与各启动阶段耗时，就绪后写出 logs/startup_profile.txt",
+    )
     return parser.parse_args()
 
 
@@ -64,10 +80,12 @@ async def start_app(mode: str, protocol: str, skip_activation: bool) -> int:
     启动应用的统一入口（在已有事件循环中执行）.
     """
     logger.info("启动小智AI客户端")
+    timeline = get_startup_timeline()
 
     # 处理激活流程
     if not skip_activation:
-        activation_success = await handle_activation(mode)
+        with timeline.phase("activation"):
+            activation_success = await handle_activation(mode)
         if not activation_success:
             logger.error("设备激活失败，程序退出")
             return 1
@@ -75,15 +93,24 @@ async def start_app(mode: str, protocol: str, skip_activation: bool) -> int:
         logger.warning("跳过激活流程（调试模式）")
 
     # 创建并启动应用程序
-    app = Application.get_instance()
+    with timeline.phase("app_init"):
+        app = Application.get_instance()
     return await app.run(mode=mode, protocol=protocol)
 
 
 if __name__ == "__main__":
+    # 打包环境下支持多进程（八字计算工作进程等）
+    multiprocessing.freeze_support()
     exit_code = 1
+    startup_timeline = get_startup_timeline()
+    startup_timeline.record("imports", startup_timeline.origin, time.perf_counter())
     try:
         args = parse_args()
         setup_logging()
+        if args.profile_startup:
+            from src.utils.startup_profiler import write_report
+
+            startup_timeline.on_ready(write_report)
 
         # 检测Wayland环境并设置Qt平台插件配置
         import os
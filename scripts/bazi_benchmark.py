@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+八字模块基准测试与回归校验.
+
+用固定的出生时间语料跑 build_bazi、get_solar_times、婚姻时机/合婚分析：
+- 将每个用例输出的规范化 JSON 摘要与 bazi_golden.json 对比，确认排盘结果未变
+- 统计每个函数的冷/热耗时（冷：清空引擎缓存后首次调用）与内存分配
+
+用法:
+    python scripts/bazi_benchmark.py            # 校验并输出性能报告
+    python scripts/bazi_benchmark.py --record   # 重新生成金标准（确认结果变化合理后）
+    python scripts/bazi_benchmark.py --dump out # 额外写出完整输出便于对比差异
+
+婚姻分析内部使用集合，输出顺序依赖字符串哈希，脚本会以 PYTHONHASHSEED=0 重新启动自身。
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+# 固定哈希种子，保证集合迭代顺序可复现
+if os.environ.get("PYTHONHASHSEED") != "0":
+    os.environ["PYTHONHASHSEED"] = "0"
+    os.execv(sys.executable, [sys.executable] + sys.argv)
+
+# 添加项目根目录到Python路径 - 必须在导入src模块之前
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.mcp.tools.bazi.bazi_calculator import get_bazi_calculator  # noqa: E402
+from src.mcp.tools.bazi.engine import get_bazi_engine  # noqa: E402
+from src.mcp.tools.bazi.marriage_tools import (  # noqa: E402
+    _marriage_compatibility_sync,
+    _marriage_timing_sync,
+)
+
+GOLDEN_FILE = Path(__file__).parent / "bazi_golden.json"
+
+# 固定语料：覆盖立春/节气交界、早晚子时、世纪边界等情况
+SOLAR_CORPUS = [
+    "1900-01-31 06:00:00",
+    "1955-12-31 12:00:00",
+    "1984-02-04 23:30:00",
+    "1984-02-05 00:30:00",
+    "1990-05-15 08:30:00",
+    "1992-11-03 21:10:00",
+    "2000-01-01 00:00:00",
+    "2008-03-01T13:00:00+08:00",
+    "2020-08-07 15:45:00",
+    "2023-06-21 17:45:00",
+    "2033-12-22 10:00:00",
+    "2099-12-31 23:59:59",
+]
+
+LUNAR_CORPUS = [
+    "2000-5-5 12:00:00",
+    "2020-4-15 08:00:00",
+    "1990-12-30 22:00:00",
+]
+
+COMPATIBILITY_PAIRS = [
+    ("1990-05-15 08:30:00", "1992-11-03 21:10:00"),
+    ("1984-02-04 23:30:00", "1988-07-19 06:20:00"),
+    ("2000-01-01 00:00:00", "2001-09-09 09:09:00"),
+]
+
+
+def _digest(value: Any) -> str:
+    canonical = json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _build_cases() -> List[Tuple[str, str, Callable[[], Any]]]:
+    """
+    返回 (函数名, 用例ID, 调用) 列表.
+    """
+    calculator = get_bazi_calculator()
+    cases = []
+
+    for solar in SOLAR_CORPUS:
+        for gender in (0, 1):
+            cases.append(
+                (
+                    "build_bazi",
+                    f"solar:{solar}:{gender}",
+                    lambda s=solar, g=gender: calculator.build_bazi(
+                        solar_datetime=s, gender=g
+                    ).to_dict(),
+                )
+            )
+    for lunar in LUNAR_CORPUS:
+        cases.append(
+            (
+                "build_bazi",
+                f"lunar:{lunar}:1",
+                lambda s=lunar: calculator.build_bazi(
+                    lunar_datetime=s, gender=1
+                ).to_dict(),
+            )
+        )
+
+    for solar in SOLAR_CORPUS:
+        cases.append(
+            (
+                "get_solar_times",
+                f"bazi_of:{solar}",
+                lambda s=solar: calculator.get_solar_times(
+                    calculator.build_bazi(solar_datetime=s).bazi
+                ),
+            )
+        )
+
+    for solar in SOLAR_CORPUS:
+        for gender in (0, 1):
+            cases.append(
+                (
+                    "marriage_timing",
+                    f"{solar}:{gender}",
+                    lambda s=solar, g=gender: _marriage_timing_sync(s, None, g, 2),
+                )
+            )
+
+    for male, female in COMPATIBILITY_PAIRS:
+        cases.append(
+            (
+                "marriage_compatibility",
+                f"{male}|{female}",
+                lambda m=male, f=female: _marriage_compatibility_sync(m, None, f, None),
+            )
+        )
+
+    return cases
+
+
+def _measure(call: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """
+    测量冷/热耗时与分配情况，返回结果及统计.
+    """
+    engine = get_bazi_engine()
+
+    # 冷启动：清空转换缓存后调用，同时统计内存分配
+    engine.clear_cache()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = call()
+    cold = time.perf_counter() - start
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+
+    warm = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        warm.append(time.perf_counter() - start)
+
+    return {
+        "result": result,
+        "cold": cold,
+        "warm": statistics.median(warm) if warm else cold,
+        "peak": peak,
+        "blocks": blocks,
+    }
+
+
+def _print_report(stats: Dict[str, List[Dict[str, Any]]]):
+    print()
+    print(
+        f"{'函数':<24}{'用例':>6}{'冷启动(ms)':>14}{'热调用(ms)':>14}"
+        f"{'峰值内存(KB)':>16}{'存活块数':>12}"
+    )
+    print("-" * 86)
+    for name, items in stats.items():
+        cold = statistics.mean(i["cold"] for i in items) * 1000
+        warm = statistics.mean(i["warm"] for i in items) * 1000
+        peak = max(i["peak"] for i in items) / 1024
+        blocks = statistics.mean(i["blocks"] for i in items)
+        print(
+            f"{name:<24}{len(items):>6}{cold:>14.2f}{warm:>14.2f}"
+            f"{peak:>16.1f}{blocks:>12.0f}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="八字模块基准测试与回归校验")
+    parser.add_argument("--record", action="store_true", help="重新生成金标准文件")
+    parser.add_argument("--repeat", type=int, default=3, help="热调用重复次数")
+    parser.add_argument("--dump", type=Path, help="将完整输出写入该目录")
+    args = parser.parse_args()
+
+    golden = {}
+    if not args.record:
+        if not GOLDEN_FILE.exists():
+            print(f"金标准文件不存在: {GOLDEN_FILE}，请先使用 --record 生成")
+            return 1
+        golden = json.loads(GOLDEN_FILE.read_text(encoding="utf-8"))
+
+    if args.dump:
+        args.dump.mkdir(parents=True, exist_ok=True)
+
+    stats: Dict[str, List[Dict[str, Any]]] = {}
+    digests: Dict[str, str] = {}
+    mismatches = []
+
+    for name, case_id, call in _build_cases():
+        measured = _measure(call, args.repeat)
+        stats.setdefault(name, []).append(measured)
+
+        key = f"{name}/{case_id}"
+        digests[key] = _digest(measured["result"])
+        if not args.record and golden.get(key) != digests[key]:
+            mismatches.append(key)
+
+        if args.dump:
+            safe_name = hashlib.md5(key.encode("utf-8")).hexdigest()[:12]
+            (args.dump / f"{name}-{safe_name}.json").write_text(
+                json.dumps(
+                    {"case": key, "result": measured["result"]},
+                    ensure_ascii=False,
+                    indent=2,
+                    sort_keys=True,
+                    default=str,
+                ),
+                encoding="utf-8",
+            )
+
+    _print_report(stats)
+
+    if args.record:
+        GOLDEN_FILE.write_text(
+            json.dumps(digests, ensure_ascii=False, indent=2, sort_keys=True) + "\n",
+            encoding="utf-8",
+        )
+        print(f"\n已记录 {len(digests)} 个用例的金标准: {GOLDEN_FILE}")
+        return 0
+
+    missing = sorted(set(golden) - set(digests))
+    if mismatches or missing:
+        print(f"\n✗ 回归校验失败：{len(mismatches)} 个用例输出变化")
+        for key in mismatches:
+            print(f"  - {key}")
+        for key in missing:
+            print(f"  - {key}（金标准中存在但未运行）")
+        return 1
+
+    print(f"\n✓ 回归校验通过：{len(digests)} 个用例输出与金标准一致")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+生成打包资源清单.
+
+打包前运行，遍历随应用打包的资源目录（默认 assets、models、libs，与 build.json 的 add_data
+一致），把全部文件和目录的相对路径写入 assets/resource_manifest.json。清单随 assets 一起打包，
+打包环境中 ResourceFinder 查找这些目录下的资源时直接查表，不再逐个基础路径 stat。
+
+资源目录内容变化后需重新生成；开发环境不使用清单。
+
+用法:
+    python scripts/build_resource_manifest.py
+    python scripts/build_resource_manifest.py --roots assets models libs --check
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.resource_finder import (  # noqa: E402
+    MANIFEST_NAME,
+    MANIFEST_PATH,
+    MANIFEST_VERSION,
+)
+
+DEFAULT_ROOTS = ["assets", "models", "libs"]
+
+
+def build_manifest(base: Path, roots) -> dict:
+    files, dirs = [], []
+    for root in roots:
+        root_dir = base / root
+        if not root_dir.is_dir():
+            print(f"跳过不存在的目录: {root_dir}", file=sys.stderr)
+            continue
+        dirs.append(root)
+        for current, dir_names, file_names in os.walk(root_dir):
+            dir_names[:] = sorted(
+                d for d in dir_names if d != "__pycache__" and not d.startswith(".")
+            )
+            rel = Path(current).relative_to(base).as_posix()
+            dirs.extend(f"{rel}/{d}" for d in dir_names)
+            files.extend(
+                f"{rel}/{name}"
+                for name in sorted(file_names)
+                if not name.startswith(".")
+            )
+
+    manifest_file = MANIFEST_PATH.as_posix()
+    if manifest_file not in files and (base / "assets").is_dir():
+        files.append(manifest_file)
+
+    return {
+        "version": MANIFEST_VERSION,
+        "roots": [root for root in roots if (base / root).is_dir()],
+        "files": sorted(files),
+        "dirs": sorted(dirs),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=f"生成 {MANIFEST_NAME}")
+    parser.add_argument("--base", default=str(project_root), help="项目根目录")
+    parser.add_argument(
+        "--roots", nargs="+", default=DEFAULT_ROOTS, help="随应用打包的资源目录"
+    )
+    parser.add_argument(
+        "--check", action="store_true", help="只检查现有清单是否与目录一致"
+    )
+    args = parser.parse_args()
+
+    base = Path(args.base).resolve()
+    manifest = build_manifest(base, args.roots)
+    output = base / MANIFEST_PATH
+
+    if args.check:
+        try:
+            current = json.loads(output.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            print(f"清单不存在或无法读取: {output}")
+            return 1
+        if current != manifest:
+            print("清单已过期，请重新生成")
+            return 1
+        print("清单与资源目录一致")
+        return 0
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(
+        json.dumps(manifest, ensure_ascii=False, indent=1), encoding="utf-8"
+    )
+    print(
+        f"已生成 {output}: {len(manifest['files'])} 个文件，"
+        f"{len(manifest['dirs'])} 个目录"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+启动导入耗时预算检查.
+
+在全新的解释器中以 -X importtime 导入目标模块（默认 src.application），多次取中位数：
+- 累计导入耗时超过预算时失败（退出码 1），并列出耗时最高的模块
+- 目标模块的导入链中出现应延迟导入的重量级依赖（PyQt5、cv2、sherpa_onnx 等）时失败
+
+插件模块和协议实现都在 Application.run 中按需导入，这里的耗时就是 main.py 开始处理
+命令行参数之前的固定开销，可放进 CI 防止启动耗时回退。
+
+用法:
+    python scripts/import_budget.py                     # 默认预算
+    python scripts/import_budget.py --budget-ms 250     # 指定预算
+    python scripts/import_budget.py --module main --runs 7
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+project_root = Path(__file__).parent.parent
+
+DEFAULT_BUDGET_MS = 300
+
+# 不应在导入 src.application 时加载的模块（应在插件 setup 或工具调用时按需导入）
+DEFERRED_MODULES = (
+    "PyQt5",
+    "qasync",
+    "cv2",
+    "pygame",
+    "sherpa_onnx",
+    "lunar_python",
+    "pendulum",
+    "pynput",
+    "soxr",
+    "opuslib",
+    "sounddevice",
+    "miniaudio",
+    "paho",
+    "websockets",
+    "aiohttp",
+)
+
+
+def measure(module: str) -> Tuple[float, Dict[str, Tuple[float, float]]]:
+    """在子进程中导入模块.
+
+    Returns:
+        (目标模块累计耗时ms, {模块名: (自身耗时ms, 累计耗时ms)})
+    """
+    env = dict(os.environ, PYTHONPROFILEIMPORTTIME="1")
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    result = subprocess.run(
+        [sys.executable, "-c", f"import {module}"],
+        cwd=project_root,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        tail = result.stderr.strip().splitlines()[-5:]
+        raise RuntimeError(f"导入 {module} 失败:\n" + "\n".join(tail))
+
+    modules: Dict[str, Tuple[float, float]] = {}
+    for line in result.stderr.splitlines():
+        # 格式: "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            own, cumulative, name = line[len("import time:") :].split("|")
+            modules[name.strip()] = (int(own) / 1000, int(cumulative) / 1000)
+        except ValueError:
+            continue
+
+    if module not in modules:
+        raise RuntimeError(f"未找到 {module} 的导入耗时（可能已被提前导入）")
+    return modules[module][1], modules
+
+
+def deferred_violations(modules: Dict[str, Tuple[float, float]]) -> List[str]:
+    found = []
+    for name in modules:
+        top = name.partition(".")[0]
+        if top in DEFERRED_MODULES and top not in found:
+            found.append(top)
+    return found
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="检查冷启动导入耗时预算")
+    parser.add_argument("--module", default="src.application", help="被测模块")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.environ.get("XIAOZHI_IMPORT_BUDGET_MS", DEFAULT_BUDGET_MS)),
+        help=f"累计导入耗时预算，默认 {DEFAULT_BUDGET_MS}ms"
+        "（也可用环境变量 XIAOZHI_IMPORT_BUDGET_MS 指定）",
+    )
+    parser.add_argument("--runs", type=int, default=5, help="测量次数，取中位数")
+    parser.add_argument("--top", type=int, default=15, help="超出预算时列出的模块数")
+    args = parser.parse_args()
+
+    try:
+        # 预热一次：生成 .pyc，避免首轮编译计入
+        measure(args.module)
+        runs = [measure(args.module) for _ in range(max(1, args.runs))]
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    totals = [total for total, _ in runs]
+    median = statistics.median(totals)
+    # 取最接近中位数的一次作为明细
+    _, modules = min(runs, key=lambda run: abs(run[0] - median))
+
+    print(
+        f"{args.module}: 中位数 {median:.1f}ms（最小 {min(totals):.1f}ms，"
+        f"最大 {max(totals):.1f}ms，{len(totals)} 次），预算 {args.budget_ms:.0f}ms"
+    )
+
+    failed = False
+    violations = deferred_violations(modules)
+    if violations:
+        failed = True
+        print(f"失败：以下重量级依赖应延迟导入: {', '.join(violations)}")
+
+    if median > args.budget_ms:
+        failed = True
+        print(f"失败：导入耗时超出预算 {median - args.budget_ms:.1f}ms")
+        print(f"\n{'模块':<50}{'自身ms':>10}{'累计ms':>10}")
+        ranked = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)
+        for name, (own, cumulative) in ranked[: args.top]:
+            print(f"{name:<50}{own:>10.1f}{cumulative:>10.1f}")
+
+    if not failed:
+        print("通过")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
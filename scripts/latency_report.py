@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+语音交互延迟报告.
+
+汇总一个或多个设备导出的 logs/latency.jsonl（含滚动备份 latency.jsonl.1 等），
+按区间输出样本数与 p50/p95/p99（毫秒），可按触发方式分组。
+
+用法:
+    python scripts/latency_report.py                          # 本机 logs/latency.jsonl*
+    python scripts/latency_report.py dev1/ dev2/latency.jsonl # 多台设备收集的文件或目录
+    python scripts/latency_report.py --by-trigger             # 按 wake_word/manual/... 分组
+    python scripts/latency_report.py --since 2025-01-01       # 只统计该日期之后的轮次
+"""
+
+import argparse
+import json
+import sys
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+project_root = Path(__file__).parent.parent
+
+# 报告中的区间顺序（与 src/utils/latency_tracer.py 的 INTERVALS 一致）
+INTERVAL_ORDER = [
+    "turn_to_first_audio",
+    "stt_to_first_audio",
+    "stt_to_tts_start",
+    "downlink_to_played",
+    "wake_to_listen",
+    "listen_to_uplink",
+]
+
+
+def iter_files(paths: List[str]) -> Iterable[Path]:
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            yield from sorted(path.rglob("latency.jsonl*"))
+        elif path.exists():
+            yield path
+        else:
+            print(f"跳过不存在的路径: {path}", file=sys.stderr)
+
+
+def load_records(files: Iterable[Path], since: float) -> List[dict]:
+    records = []
+    for file in files:
+        with open(file, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get("started_at", 0) >= since:
+                    records.append(record)
+    return records
+
+
+def percentile(ordered: List[float], p: float) -> float:
+    index = min(len(ordered) - 1, max(0, round(p / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(records: List[dict], title: str):
+    samples: Dict[str, List[float]] = defaultdict(list)
+    for record in records:
+        for name, value in record.get("intervals_ms", {}).items():
+            samples[name].append(value)
+
+    print(f"\n{title}（{len(records)} 轮）")
+    print(f"{'区间':<22}{'样本':>8}{'p50':>10}{'p95':>10}{'p99':>10}")
+    names = INTERVAL_ORDER + sorted(set(samples) - set(INTERVAL_ORDER))
+    for name in names:
+        values = sorted(samples.get(name, []))
+        if not values:
+            continue
+        print(
+            f"{name:<22}{len(values):>8}"
+            f"{percentile(values, 50):>10.0f}"
+            f"{percentile(values, 95):>10.0f}"
+            f"{percentile(values, 99):>10.0f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="汇总语音交互延迟记录")
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        default=[str(project_root / "logs")],
+        help="latency.jsonl 文件或包含它们的目录",
+    )
+    parser.add_argument("--by-trigger", action="store_true", help="按触发方式分组")
+    parser.add_argument("--since", help="起始日期，如 2025-01-01")
+    args = parser.parse_args()
+
+    since = datetime.fromisoformat(args.since).timestamp() if args.since else 0
+    records = load_records(iter_files(args.paths), since)
+    if not records:
+        print("没有找到延迟记录")
+        return 1
+
+    report(records, "全部")
+    if args.by_trigger:
+        groups: Dict[str, List[dict]] = defaultdict(list)
+        for record in records:
+            groups[record.get("trigger", "unknown")].append(record)
+        for trigger, group in sorted(groups.items()):
+            report(group, f"触发方式: {trigger}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
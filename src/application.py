@@ -13,21 +13,13 @@ except Exception:
     pass
 
 from src.constants.constants import DeviceState, ListeningMode
-from src.plugins.calendar import CalendarPlugin
-from src.plugins.iot import IoTPlugin
 from src.plugins.manager import PluginManager
-from src.plugins.mcp import McpPlugin
-from src.plugins.shortcuts import ShortcutsPlugin
-from src.plugins.ui import UIPlugin
-from src.plugins.wake_word import WakeWordPlugin
-from src.protocols.mqtt_protocol import MqttProtocol
-from src.protocols.websocket_protocol import WebsocketProtocol
+from src.utils import latency_tracer
 from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
-from src.utils.opus_loader import setup_opus
+from src.utils.startup_timeline import get_startup_timeline
 
 logger = get_logger(__name__)
-setup_opus()
 
 
 class Application:
@@ -85,31 +77,30 @@ class Application:
         # 插件
         self.plugins = PluginManager()
 
+        # 每轮对话的延迟追踪
+        self.tracer = latency_tracer.get_latency_tracer()
+
     # -------------------------
     # 生命周期
     # -------------------------
     async def run(self, *, protocol: str = "websocket", mode: str = "gui") -> int:
         logger.info("启动Application，protocol=%s", protocol)
+        timeline = get_startup_timeline()
         try:
             self.running = True
             self._main_loop = asyncio.get_running_loop()
             self._initialize_async_objects()
-            self._set_protocol(protocol)
-            self._setup_protocol_callbacks()
-            # 插件：setup（延迟导入AudioPlugin，确保上面setup_opus已执行）
-            from src.plugins.audio import AudioPlugin
-
-            # 注册音频、UI、MCP、IoT、唤醒词、快捷键与日程插件（UI模式可通过配置 SYSTEM_OPTIONS.UI.MODE 指定 gui/cli）
-            self.plugins.register(
-                McpPlugin(),
-                IoTPlugin(),
-                AudioPlugin(),
-                WakeWordPlugin(),
-                CalendarPlugin(),
-                UIPlugin(mode="gui"),
-                ShortcutsPlugin(),
-            )
-            await self.plugins.setup_all(self)
+            with timeline.phase("protocol"):
+                self._set_protocol(protocol)
+                self._setup_protocol_callbacks()
+
+            with timeline.phase("plugin_imports"):
+                plugins = self._create_plugins()
+            self.plugins.register(*plugins)
+
+            # 插件：setup（无依赖关系的插件并发执行）
+            with timeline.phase("plugin_setup"):
+                await self.plugins.setup_all(self, timeline)
             # 启动后广播初始状态，确保 UI 就绪时能看到“待命”
             try:
                 await self.plugins.notify_device_state_changed(self.device_state)
@@ -117,7 +108,10 @@ class Application:
                 pass
             # await self.connect_protocol()
             # 插件：start
-            await self.plugins.start_all()
+            with timeline.phase("plugin_start"):
+                await self.plugins.start_all(timeline)
+            timeline.mark_ready()
+            timeline.log_report()
             # 等待关停
             await self._wait_shutdown()
             return 0
@@ -167,6 +161,35 @@ class Application:
             logger.error("协议连接超时")
             return False
 
+    def _create_plugins(self) -> list:
+        """创建插件实例.
+
+        插件模块在此处才导入，避免导入 Application 时加载全部依赖；
+        setup_opus 须在导入 AudioPlugin（opuslib）之前执行。
+        """
+        from src.utils.opus_loader import setup_opus
+
+        setup_opus()
+
+        from src.plugins.audio import AudioPlugin
+        from src.plugins.calendar import CalendarPlugin
+        from src.plugins.iot import IoTPlugin
+        from src.plugins.mcp import McpPlugin
+        from src.plugins.shortcuts import ShortcutsPlugin
+        from src.plugins.ui import UIPlugin
+        from src.plugins.wake_word import WakeWordPlugin
+
+        # 注册音频、UI、MCP、IoT、唤醒词、快捷键与日程插件（UI模式可通过配置 SYSTEM_OPTIONS.UI.MODE 指定 gui/cli）
+        return [
+            McpPlugin(),
+            IoTPlugin(),
+            AudioPlugin(),
+            WakeWordPlugin(),
+            CalendarPlugin(),
+            UIPlugin(mode="gui"),
+            ShortcutsPlugin(),
+        ]
+
     def _initialize_async_objects(self) -> None:
         logger.debug("初始化异步对象")
         self._shutdown_event = asyncio.Event()
@@ -175,9 +198,14 @@ class Application:
 
     def _set_protocol(self, protocol_type: str) -> None:
         logger.debug("设置协议类型: %s", protocol_type)
+        # 只导入实际使用的协议实现
         if protocol_type == "mqtt":
+            from src.protocols.mqtt_protocol import MqttProtocol
+
             self.protocol = MqttProtocol(asyncio.get_running_loop())
         else:
+            from src.protocols.websocket_protocol import WebsocketProtocol
+
             self.protocol = WebsocketProtocol()
 
     # -------------------------
@@ -196,7 +224,9 @@ class Application:
                 logger.info("说话中发送打断")
                 await self.protocol.send_abort_speaking(None)
                 await self.set_device_state(DeviceState.IDLE)
+            self.tracer.begin_turn("manual", reuse=False)
             await self.protocol.send_start_listening(ListeningMode.MANUAL)
+            self.tracer.mark(latency_tracer.LISTEN_START)
             await self.set_device_state(DeviceState.LISTENING)
         except Exception:
             pass
@@ -222,7 +252,10 @@ class Application:
             )
             self.listening_mode = mode
             self.keep_listening = True
+            # 唤醒词触发时沿用其 span
+            self.tracer.begin_turn("auto")
             await self.protocol.send_start_listening(mode)
+            self.tracer.mark(latency_tracer.LISTEN_START)
             await self.set_device_state(DeviceState.LISTENING)
         except Exception:
             pass
@@ -287,19 +320,21 @@ class Application:
             logger.error(error_message)
 
         self.keep_listening = False
+        self.tracer.end_turn("network_error")
         # 出错即请求关闭
         # if self._shutdown_event and not self._shutdown_event.is_set():
         #     self._shutdown_event.set()
 
     def _on_incoming_audio(self, data: bytes):
-        logger.debug(f"收到二进制消息，长度: {len(data)}")
+        logger.debug("收到二进制消息，长度: %d", len(data))
         # 转发给插件
         self.spawn(self.plugins.notify_incoming_audio(data), "plugin:on_audio")
 
     def _on_incoming_json(self, json_data):
         try:
             msg_type = json_data.get("type") if isinstance(json_data, dict) else None
-            logger.info(f"收到JSON消息: type={msg_type}")
+            logger.info("收到JSON消息: type=%s", msg_type)
+            self._trace_incoming_json(msg_type, json_data)
             # 将 TTS start/stop 映射为设备状态（支持自动/实时，且不污染手动模式）
             if msg_type == "tts":
                 state = json_data.get("state")
@@ -328,12 +363,16 @@ class Application:
                                     self.listening_mode == ListeningMode.REALTIME
                                     and self.device_state == DeviceState.LISTENING
                                 ):
+                                    self.tracer.begin_turn("continue", reuse=False)
                                     await self.protocol.send_start_listening(
                                         self.listening_mode
                                     )
+                                    self.tracer.mark(latency_tracer.LISTEN_START)
                             except Exception:
                                 pass
-                            self.keep_listening and await self.set_device_state(DeviceState.LISTENING)
+                            self.keep_listening and await self.set_device_state(
+                                DeviceState.LISTENING
+                            )
 
                         self.spawn(_restart_listening(), "state:tts_stop_restart")
                     else:
@@ -346,6 +385,22 @@ class Application:
         except Exception:
             logger.info("收到JSON消息")
 
+    def _trace_incoming_json(self, msg_type, json_data) -> None:
+        """
+        根据服务端消息记录延迟节点，TTS 结束时结束本轮.
+        """
+        if msg_type == "stt":
+            # 实时模式下连续对话不会重新发送开始聆听，以识别结果作为新一轮起点
+            if not self.tracer.has_active_turn():
+                self.tracer.begin_turn("realtime")
+            self.tracer.mark(latency_tracer.STT)
+        elif msg_type == "tts":
+            state = json_data.get("state")
+            if state == "start":
+                self.tracer.mark(latency_tracer.TTS_START)
+            elif state == "stop":
+                self.tracer.end_turn("tts_stop")
+
     async def _on_audio_channel_opened(self):
         logger.info("协议通道已打开")
         # 通道打开后进入 LISTENING（示例：简化为直读直写）
@@ -371,7 +426,7 @@ class Application:
         async with self._state_lock:
             if self.device_state == state:
                 return
-            logger.info(f"设置设备状态: {state}")
+            logger.info("设置设备状态: %s", state)
             self.device_state = state
         # 锁外广播，避免插件回调引起潜在的长耗时阻塞
         try:
@@ -420,6 +475,10 @@ class Application:
         """
 
         logger.info(f"中止语音输出，原因: {reason}")
+        self.tracer.end_turn("abort")
+        codec = getattr(self, "audio_codec", None)
+        if codec is not None:
+            codec.mark_playback_end()
         await self.protocol.send_abort_speaking(reason)
         await self.set_device_state(DeviceState.IDLE)
 
@@ -488,6 +547,7 @@ class Application:
             except Exception:
                 pass
 
+            self.tracer.close()
             logger.info("Application 关闭完成")
         except Exception as e:
             logger.error(f"关闭示例应用时出错: {e}", exc_info=True)
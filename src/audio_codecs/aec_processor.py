@@ -1,11 +1,15 @@
 import platform
-from collections import deque
 from typing import Any, Dict, Optional
 
 import numpy as np
 import sounddevice as sd
 
+from src.audio_codecs.reference_alignment import (
+    EchoDelayEstimator,
+    ReferenceResampler,
+)
 from src.constants.constants import AudioConfig
+from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -34,11 +38,22 @@ class AECProcessor:
         self.reference_device_id = None
         self.reference_sample_rate = None
 
-        # 缓冲区
-        self._reference_buffer = deque()
+        # 参考信号重采样/对齐（环形缓冲 + 漂移补偿）
+        self._reference_resampler: Optional[ReferenceResampler] = None
         self._webrtc_frame_size = 160  # WebRTC标准：16kHz, 10ms = 160 samples
         self._system_frame_size = AudioConfig.INPUT_FRAME_SIZE  # 系统配置的帧大小
 
+        # 流延迟：初始值来自配置，开启自动估计后按互相关结果动态更新
+        config = ConfigManager.get_instance()
+        self._stream_delay_ms = int(
+            config.get_config("AEC_OPTIONS.STREAM_DELAY_MS", 40)
+        )
+        self._delay_estimator: Optional[EchoDelayEstimator] = None
+        if config.get_config("AEC_OPTIONS.AUTO_DELAY", True):
+            self._delay_estimator = EchoDelayEstimator(
+                sample_rate=AudioConfig.INPUT_SAMPLE_RATE
+            )
+
         # 状态标志
         self._is_initialized = False
         self._is_closing = False
@@ -114,8 +129,8 @@ class AECProcessor:
             self.capture_config = self.apm.create_stream_config(sample_rate, channels)
             self.render_config = self.apm.create_stream_config(sample_rate, channels)
 
-            # 设置流延迟
-            self.apm.set_stream_delay_ms(40)  # 50ms延迟
+            # 设置初始流延迟（之后由延迟估计器动态更新）
+            self.apm.set_stream_delay_ms(self._stream_delay_ms)
 
             logger.info("WebRTC APM初始化完成")
 
@@ -140,6 +155,13 @@ class AECProcessor:
             self.reference_device_id = reference_device["id"]
             self.reference_sample_rate = int(reference_device["default_samplerate"])
 
+            # 参考信号流式重采样器：设备采样率 -> 16kHz
+            self._reference_resampler = ReferenceResampler(
+                self.reference_sample_rate,
+                AudioConfig.INPUT_SAMPLE_RATE,
+                AudioConfig.CHANNELS,
+            )
+
             # 创建参考信号输入流（固定使用10ms帧，匹配WebRTC标准）
             webrtc_frame_duration = 0.01  # 10ms，WebRTC标准帧长度
             reference_frame_size = int(
@@ -209,30 +231,12 @@ class AECProcessor:
         if status and "overflow" not in str(status).lower():
             logger.warning(f"参考信号流状态: {status}")
 
-        if self._is_closing:
+        if self._is_closing or self._reference_resampler is None:
             return
 
         try:
-            audio_data = indata.copy().flatten()
-
-            # 重采样到16kHz（如果需要）
-            if self.reference_sample_rate != AudioConfig.INPUT_SAMPLE_RATE:
-                # 简单的降采样处理（实际应用中应使用更好的重采样器）
-                ratio = AudioConfig.INPUT_SAMPLE_RATE / self.reference_sample_rate
-                target_length = int(len(audio_data) * ratio)
-                audio_data = np.interp(
-                    np.linspace(0, len(audio_data) - 1, target_length),
-                    np.arange(len(audio_data)),
-                    audio_data,
-                ).astype(np.int16)
-
-            # 添加到参考缓冲区
-            self._reference_buffer.extend(audio_data)
-
-            # 保持缓冲区大小合理
-            max_buffer_size = self._webrtc_frame_size * 20  # 保持约200ms的数据
-            while len(self._reference_buffer) > max_buffer_size:
-                self._reference_buffer.popleft()
+            # 重采样到16kHz并写入环形缓冲区（容量有限，满时丢弃最旧数据）
+            self._reference_resampler.push(indata.reshape(-1))
 
         except Exception as e:
             logger.error(f"参考信号回调错误: {e}")
@@ -299,6 +303,9 @@ class AECProcessor:
             # 获取参考信号
             reference_audio = self._get_reference_frame(self._webrtc_frame_size)
 
+            # 根据参考信号与麦克风信号的互相关动态更新流延迟
+            self._update_stream_delay(reference_audio, capture_audio)
+
             # 创建ctypes缓冲区
             capture_buffer = (ctypes.c_short * self._webrtc_frame_size)(*capture_audio)
             reference_buffer = (ctypes.c_short * self._webrtc_frame_size)(
@@ -319,7 +326,8 @@ class AECProcessor:
             if render_result != 0:
                 logger.warning(f"参考信号处理失败，错误码: {render_result}")
 
-            # 然后处理采集信号（capture stream）
+            # 然后处理采集信号（capture stream），WebRTC要求每帧前设置流延迟
+            self.apm.set_stream_delay_ms(self._stream_delay_ms)
             capture_result = self.apm.process_stream(
                 capture_buffer,
                 self.capture_config,
@@ -364,15 +372,30 @@ class AECProcessor:
         获取指定大小的参考信号帧.
         """
         # 如果没有参考信号或缓冲区不足，返回静音
-        if len(self._reference_buffer) < frame_size:
+        if self._reference_resampler is None:
             return np.zeros(frame_size, dtype=np.int16)
 
-        # 从缓冲区提取一帧
-        frame_data = []
-        for _ in range(frame_size):
-            frame_data.append(self._reference_buffer.popleft())
+        frame = self._reference_resampler.read(frame_size)
+        if frame is None:
+            return np.zeros(frame_size, dtype=np.int16)
+        return frame
+
+    def _update_stream_delay(
+        self, reference_audio: np.ndarray, capture_audio: np.ndarray
+    ):
+        """
+        推入参考帧/采集帧，延迟估计变化时更新APM流延迟.
+        """
+        if self._delay_estimator is None or self._reference_resampler is None:
+            return
 
-        return np.array(frame_data, dtype=np.int16)
+        delay_ms = self._delay_estimator.update(reference_audio, capture_audio)
+        if delay_ms is not None and delay_ms != self._stream_delay_ms:
+            logger.debug(
+                f"AEC流延迟更新: {self._stream_delay_ms}ms -> {delay_ms}ms "
+                f"(置信度 {self._delay_estimator.confidence:.2f})"
+            )
+            self._stream_delay_ms = delay_ms
 
     def is_reference_available(self) -> bool:
         """
@@ -386,7 +409,8 @@ class AECProcessor:
         return (
             self.reference_stream is not None
             and self.reference_stream.active
-            and len(self._reference_buffer) >= self._webrtc_frame_size
+            and self._reference_resampler is not None
+            and self._reference_resampler.available() >= self._webrtc_frame_size
         )
 
     def get_status(self) -> Dict[str, Any]:
@@ -416,7 +440,23 @@ class AECProcessor:
                     "aec_type": "webrtc_blackhole",
                     "description": "WebRTC + BlackHole 参考信号",
                     "reference_device_id": self.reference_device_id,
-                    "reference_buffer_size": len(self._reference_buffer),
+                    "reference_buffer_size": (
+                        self._reference_resampler.available()
+                        if self._reference_resampler
+                        else 0
+                    ),
+                    "reference_dropped_samples": (
+                        self._reference_resampler.dropped_samples
+                        if self._reference_resampler
+                        else 0
+                    ),
+                    "reference_inserted_samples": (
+                        self._reference_resampler.inserted_samples
+                        if self._reference_resampler
+                        else 0
+                    ),
+                    "stream_delay_ms": self._stream_delay_ms,
+                    "delay_auto_estimation": self._delay_estimator is not None,
                     "webrtc_apm_active": self.apm is not None,
                 }
             )
@@ -467,8 +507,12 @@ class AECProcessor:
                         self.render_config = None
                         self.apm = None
 
-            # 清理缓冲区
-            self._reference_buffer.clear()
+            # 清理参考信号重采样器与缓冲区
+            if self._reference_resampler:
+                self._reference_resampler.close()
+                self._reference_resampler = None
+            if self._delay_estimator:
+                self._delay_estimator.reset()
 
             self._is_initialized = False
             logger.info("AEC处理器已关闭")
@@ -10,7 +10,10 @@ import sounddevice as sd
 import soxr
 
 from src.audio_codecs.aec_processor import AECProcessor
+from src.audio_codecs.audio_metrics import AudioMetrics, format_summary
+from src.audio_codecs.output_mixer import OutputMixer, OutputSource
 from src.constants.constants import AudioConfig
+from src.utils import latency_tracer
 from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
 
@@ -22,7 +25,7 @@ class AudioCodec:
     音频编解码器，负责录音编码和播放解码
     主要功能：
     1. 录音：麦克风 -> 重采样16kHz -> Opus编码 -> 发送
-    2. 播放：接收 -> Opus解码24kHz -> 播放队列 -> 扬声器
+    2. 播放：接收 -> Opus解码24kHz -> 播放队列 -> 混音（音乐等附加音源）-> 扬声器
     """
 
     def __init__(self):
@@ -46,6 +49,8 @@ class AudioCodec:
         # 重采样缓冲区
         self._resample_input_buffer = deque()
         self._resample_output_buffer = deque()
+        # 重采样缓冲中尚未播放的语音样本数（缓冲中只有音乐时为 0）
+        self._resample_voice_samples = 0
 
         self._device_input_frame_size = None
         self._is_closing = False
@@ -65,6 +70,26 @@ class AudioCodec:
         self.aec_processor = AECProcessor()
         self._aec_enabled = False
 
+        # 播放混音器：附加音源（音乐）与语音混合，语音播放时自动压低
+        self.output_mixer = OutputMixer(
+            AudioConfig.OUTPUT_SAMPLE_RATE,
+            duck_gain=self.config.get_config("MUSIC_OPTIONS.DUCKING_GAIN", 0.2),
+        )
+
+        # 延迟追踪：记录每轮首个语音帧播放时间
+        self._tracer = latency_tracer.get_latency_tracer()
+
+        # 链路健康指标：溢出/欠载、丢帧、回调与重采样耗时、队列深度
+        self.metrics = AudioMetrics(
+            {
+                "wakeword": self._wakeword_buffer.maxsize,
+                "output": self._output_buffer.maxsize,
+            },
+            critical_queues=("output",),
+        )
+        self._metrics_task: Optional[asyncio.Task] = None
+        self._metrics_baseline = 0
+
     # -----------------------
     # 自动选择设备的辅助方法
     # -----------------------
@@ -212,6 +237,8 @@ class AudioCodec:
                 logger.warning(f"AEC处理器初始化失败，将使用原始音频: {e}")
                 self._aec_enabled = False
 
+            self._start_metrics_logging()
+
             logger.info("音频初始化完成")
         except Exception as e:
             logger.error(f"初始化音频设备失败: {e}")
@@ -405,7 +432,9 @@ class AudioCodec:
                 for k, v in audio_config_patch.items():
                     if k not in current:  # 只在原来没有时写入
                         current[k] = v
-                success = self.config.update_config("AUDIO_DEVICES", current)
+                success = self.config.update_config(
+                    "AUDIO_DEVICES", current, flush=True
+                )
                 if success:
                     logger.info("已写入默认音频设备到配置（首次）。")
                 else:
@@ -466,12 +495,15 @@ class AudioCodec:
         """
         录音回调，硬件驱动调用 处理流程：原始音频 -> 重采样16kHz -> 编码发送 + 唤醒词检测.
         """
-        if status and "overflow" not in str(status).lower():
-            logger.warning(f"输入流状态: {status}")
+        if status:
+            self.metrics.record_input_status(status)
+            if "overflow" not in str(status).lower():
+                logger.warning("输入流状态: %s", status)
 
         if self._is_closing:
             return
 
+        started = time.perf_counter()
         try:
             audio_data = indata.copy().flatten()
 
@@ -490,7 +522,7 @@ class AudioCodec:
                 try:
                     audio_data = self.aec_processor.process_audio(audio_data)
                 except Exception as e:
-                    logger.warning(f"AEC处理失败，使用原始音频: {e}")
+                    logger.warning("AEC处理失败，使用原始音频: %s", e)
 
             # 实时编码并发送（不走队列，减少延迟）
             if (
@@ -505,20 +537,31 @@ class AudioCodec:
                     if encoded_data:
                         self._encoded_audio_callback(encoded_data)
                 except Exception as e:
-                    logger.warning(f"实时录音编码失败: {e}")
+                    logger.warning("实时录音编码失败: %s", e)
 
             # 同时提供给唤醒词检测（走队列）
-            self._put_audio_data_safe(self._wakeword_buffer, audio_data.copy())
+            self._put_audio_data_safe(
+                self._wakeword_buffer, audio_data.copy(), "wakeword"
+            )
 
         except Exception as e:
-            logger.error(f"输入回调错误: {e}")
+            logger.error("输入回调错误: %s", e)
+        finally:
+            self.metrics.callbacks["input"].record(
+                (time.perf_counter() - started) * 1000,
+                frames * 1000 / self.device_input_sample_rate,
+            )
 
     def _process_input_resampling(self, audio_data):
         """
         输入重采样到16kHz.
         """
         try:
+            started = time.perf_counter()
             resampled_data = self.input_resampler.resample_chunk(audio_data, last=False)
+            self.metrics.resamplers["input"].record(
+                (time.perf_counter() - started) * 1000
+            )
             if len(resampled_data) > 0:
                 self._resample_input_buffer.extend(resampled_data.astype(np.int16))
 
@@ -533,30 +576,34 @@ class AudioCodec:
             return np.array(frame_data, dtype=np.int16)
 
         except Exception as e:
-            logger.error(f"输入重采样失败: {e}")
+            logger.error("输入重采样失败: %s", e)
             return None
 
-    def _put_audio_data_safe(self, queue, audio_data):
+    def _put_audio_data_safe(self, queue, audio_data, name: str):
         """
-        安全入队，队列满时丢弃最旧数据.
+        安全入队，队列满时丢弃最旧数据（计入该队列的丢帧数）
         """
         try:
             queue.put_nowait(audio_data)
         except asyncio.QueueFull:
+            self.metrics.record_drop(name)
             try:
                 queue.get_nowait()
                 queue.put_nowait(audio_data)
             except asyncio.QueueEmpty:
                 queue.put_nowait(audio_data)
+        self.metrics.record_depth(name, queue.qsize())
 
     def _output_callback(self, outdata: np.ndarray, frames: int, time_info, status):
         """
         播放回调，硬件驱动调用 从播放队列取数据输出到扬声器.
         """
         if status:
+            self.metrics.record_output_status(status)
             if "underflow" not in str(status).lower():
-                logger.warning(f"输出流状态: {status}")
+                logger.warning("输出流状态: %s", status)
 
+        started = time.perf_counter()
         try:
             if self.output_resampler is not None:
                 # 需要重采样：24kHz -> 设备采样率
@@ -566,58 +613,104 @@ class AudioCodec:
                 self._output_callback_direct(outdata, frames)
 
         except Exception as e:
-            logger.error(f"输出回调错误: {e}")
+            logger.error("输出回调错误: %s", e)
             outdata.fill(0)
+        finally:
+            self.metrics.callbacks["output"].record(
+                (time.perf_counter() - started) * 1000,
+                frames * 1000 / self.device_output_sample_rate,
+            )
 
     def _output_callback_direct(self, outdata: np.ndarray, frames: int):
         """
         直接播放24kHz数据（设备支持24kHz时）
         """
+        # 从播放队列获取音频数据
         try:
-            # 从播放队列获取音频数据
             audio_data = self._output_buffer.get_nowait()
-
-            if len(audio_data) >= frames * AudioConfig.CHANNELS:
-                output_frames = audio_data[: frames * AudioConfig.CHANNELS]
-                outdata[:] = output_frames.reshape(-1, AudioConfig.CHANNELS)
-            else:
-                out_len = len(audio_data) // AudioConfig.CHANNELS
-                if out_len > 0:
-                    outdata[:out_len] = audio_data[
-                        : out_len * AudioConfig.CHANNELS
-                    ].reshape(-1, AudioConfig.CHANNELS)
-                if out_len < frames:
-                    outdata[out_len:] = 0
-
+            self._tracer.mark(latency_tracer.FIRST_PLAYED)
         except asyncio.QueueEmpty:
+            audio_data = None
+        self.metrics.record_playback(
+            audio_data is not None,
+            audio_data is not None and len(audio_data) < frames * AudioConfig.CHANNELS,
+        )
+
+        # 混入附加音源（音乐）
+        if self.output_mixer.has_sources():
+            audio_data = self.output_mixer.mix(
+                audio_data, frames * AudioConfig.CHANNELS
+            )
+
+        if audio_data is None:
             # 无数据时输出静音
             outdata.fill(0)
+            return
+
+        if len(audio_data) >= frames * AudioConfig.CHANNELS:
+            output_frames = audio_data[: frames * AudioConfig.CHANNELS]
+            outdata[:] = output_frames.reshape(-1, AudioConfig.CHANNELS)
+        else:
+            out_len = len(audio_data) // AudioConfig.CHANNELS
+            if out_len > 0:
+                outdata[:out_len] = audio_data[
+                    : out_len * AudioConfig.CHANNELS
+                ].reshape(-1, AudioConfig.CHANNELS)
+            if out_len < frames:
+                outdata[out_len:] = 0
 
     def _output_callback_with_resample(self, outdata: np.ndarray, frames: int):
         """
         重采样播放（24kHz -> 设备采样率）
         """
+        has_voice = False
+        # 上次回调剩余的语音样本也算语音仍在播放，避免重采样分块造成的误报中断
+        voice_buffered = self._resample_voice_samples > 0
         try:
             # 持续处理24kHz数据进行重采样
             while len(self._resample_output_buffer) < frames * AudioConfig.CHANNELS:
                 try:
                     audio_data = self._output_buffer.get_nowait()
-                    # 24kHz -> 设备采样率重采样
-                    resampled_data = self.output_resampler.resample_chunk(
-                        audio_data, last=False
-                    )
-                    if len(resampled_data) > 0:
-                        self._resample_output_buffer.extend(
-                            resampled_data.astype(np.int16)
-                        )
+                    self._tracer.mark(latency_tracer.FIRST_PLAYED)
+                    has_voice = chunk_has_voice = True
                 except asyncio.QueueEmpty:
+                    audio_data = None
+                    chunk_has_voice = False
+
+                # 混入附加音源（音乐）
+                if self.output_mixer.has_sources():
+                    audio_data = self.output_mixer.mix(
+                        audio_data, AudioConfig.OUTPUT_FRAME_SIZE
+                    )
+                if audio_data is None:
                     break
 
+                # 24kHz -> 设备采样率重采样
+                resample_started = time.perf_counter()
+                resampled_data = self.output_resampler.resample_chunk(
+                    audio_data, last=False
+                )
+                self.metrics.resamplers["output"].record(
+                    (time.perf_counter() - resample_started) * 1000
+                )
+                if len(resampled_data) > 0:
+                    self._resample_output_buffer.extend(resampled_data.astype(np.int16))
+                    if chunk_has_voice:
+                        self._resample_voice_samples += len(resampled_data)
+
             need = frames * AudioConfig.CHANNELS
+            voice_playing = has_voice or voice_buffered
+            self.metrics.record_playback(
+                voice_playing,
+                voice_playing and len(self._resample_output_buffer) < need,
+            )
             if len(self._resample_output_buffer) >= need:
                 frame_data = [
                     self._resample_output_buffer.popleft() for _ in range(need)
                 ]
+                self._resample_voice_samples = max(
+                    0, self._resample_voice_samples - need
+                )
                 output_array = np.array(frame_data, dtype=np.int16)
                 outdata[:] = output_array.reshape(-1, AudioConfig.CHANNELS)
             else:
@@ -625,7 +718,7 @@ class AudioCodec:
                 outdata.fill(0)
 
         except Exception as e:
-            logger.warning(f"重采样输出失败: {e}")
+            logger.warning("重采样输出失败: %s", e)
             outdata.fill(0)
 
     def _input_finished_callback(self):
@@ -731,7 +824,7 @@ class AudioCodec:
         except asyncio.QueueEmpty:
             return None
         except Exception as e:
-            logger.error(f"获取唤醒词音频数据失败: {e}")
+            logger.error("获取唤醒词音频数据失败: %s", e)
             return None
 
     def set_encoded_audio_callback(self, callback):
@@ -745,6 +838,18 @@ class AudioCodec:
         else:
             logger.info("禁用编码回调")
 
+    def add_output_source(self, source: OutputSource):
+        """
+        添加附加输出音源（如音乐），与语音混合播放.
+        """
+        self.output_mixer.add_source(source)
+
+    def remove_output_source(self, source: OutputSource):
+        """
+        移除附加输出音源.
+        """
+        self.output_mixer.remove_source(source)
+
     def is_aec_enabled(self) -> bool:
         """
         检查AEC是否启用.
@@ -784,6 +889,69 @@ class AudioCodec:
         logger.info(f"AEC状态: {'启用' if self._aec_enabled else '禁用'}")
         return self._aec_enabled
 
+    def get_metrics(self) -> dict:
+        """
+        获取音频链路健康指标快照.
+        """
+        return self.metrics.snapshot(
+            depths={
+                "wakeword": self._wakeword_buffer.qsize(),
+                "output": self._output_buffer.qsize(),
+            },
+            resample_buffer_ms={
+                "input": len(self._resample_input_buffer)
+                * 1000
+                / (AudioConfig.INPUT_SAMPLE_RATE * AudioConfig.CHANNELS),
+                "output": len(self._resample_output_buffer)
+                * 1000
+                / ((self.device_output_sample_rate or 1) * AudioConfig.CHANNELS),
+            },
+        )
+
+    def mark_playback_end(self):
+        """
+        标记当前语音段结束（TTS stop 或打断），下一段回复不会被误计为播放中断.
+        """
+        self.metrics.end_playback()
+
+    def reset_metrics(self):
+        """
+        清零健康指标.
+        """
+        self.metrics.reset()
+        self._metrics_baseline = 0
+
+    def _start_metrics_logging(self):
+        """
+        启动周期性指标摘要日志（AUDIO_METRICS.LOG_INTERVAL 为 0 时关闭）
+        """
+        interval = self.config.get_config("AUDIO_METRICS.LOG_INTERVAL", 300)
+        if interval and self._metrics_task is None:
+            self._metrics_task = asyncio.create_task(self._metrics_loop(interval))
+
+    async def _metrics_loop(self, interval: float):
+        """周期输出指标摘要.
+
+        周期内出现卡顿相关事件时以 INFO 级别输出，否则为 DEBUG.
+        """
+        # 上次输出时的异常总数，reset_metrics() 会同时清零
+        self._metrics_baseline = self.metrics.glitch_count()
+        try:
+            while not self._is_closing:
+                await asyncio.sleep(interval)
+                glitches = self.metrics.glitch_count()
+                summary = format_summary(self.get_metrics())
+                if glitches > self._metrics_baseline:
+                    logger.info(
+                        f"音频链路指标（新增异常 {glitches - self._metrics_baseline}）: "
+                        f"{summary}"
+                    )
+                else:
+                    logger.debug(f"音频链路指标: {summary}")
+                self._metrics_baseline = glitches
+        except asyncio.CancelledError:
+            pass
+
     async def write_audio(self, opus_data: bytes):
         """
         解码音频并播放 网络接收的Opus数据 -> 解码24kHz -> 播放队列.
@@ -804,12 +972,12 @@ class AudioCodec:
                 return
 
             # 放入播放队列
-            self._put_audio_data_safe(self._output_buffer, audio_array)
+            self._put_audio_data_safe(self._output_buffer, audio_array, "output")
 
         except opuslib.OpusError as e:
-            logger.warning(f"Opus解码失败，丢弃此帧: {e}")
+            logger.warning("Opus解码失败，丢弃此帧: %s", e)
         except Exception as e:
-            logger.warning(f"音频写入失败，丢弃此帧: {e}")
+            logger.warning("音频写入失败，丢弃此帧: %s", e)
 
     async def wait_for_audio_complete(self, timeout=10.0):
         """
@@ -821,6 +989,7 @@ class AudioCodec:
             await asyncio.sleep(0.05)
 
         await asyncio.sleep(0.3)
+        self.metrics.end_playback()
 
         if not self._output_buffer.empty():
             output_remaining = self._output_buffer.qsize()
@@ -852,6 +1021,9 @@ class AudioCodec:
         if self._resample_output_buffer:
             cleared_count += len(self._resample_output_buffer)
             self._resample_output_buffer.clear()
+        self._resample_voice_samples = 0
+
+        self.metrics.end_playback()
 
         if cleared_count > 0:
             logger.info(f"清空音频队列，丢弃 {cleared_count} 帧音频数据")
@@ -938,6 +1110,10 @@ class AudioCodec:
         self._is_closing = True
         logger.info("开始关闭音频编解码器...")
 
+        if self._metrics_task is not None:
+            self._metrics_task.cancel()
+            self._metrics_task = None
+
         try:
             # 1. 停止音频流（停止硬件回调，这是最关键的第一步）
             if self.input_stream:
@@ -975,6 +1151,7 @@ class AudioCodec:
                 self._resample_input_buffer.clear()
             if self._resample_output_buffer:
                 self._resample_output_buffer.clear()
+            self._resample_voice_samples = 0
 
             # 5. 第一次 GC，清理队列和缓冲区中的对象
             gc.collect()
@@ -0,0 +1,290 @@
+"""实时音频链路健康指标.
+
+由录音/播放回调线程和事件循环直接更新计数（整数自增，不加锁），读取快照时允许轻微不一致。
+用于区分卡顿原因：
+- 设备问题：驱动上报的输入溢出/输出欠载
+- CPU 不足：回调耗时超出帧时长预算、重采样耗时高
+- 网络抖动：播放队列耗尽导致语音中断（短暂静音后又恢复播放）
+"""
+
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, Optional
+
+# 耗时直方图的桶上界（毫秒），最后一个桶收集超出上界的样本
+HISTOGRAM_BUCKETS_MS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 50.0)
+
+
+class LatencyHistogram:
+    """
+    固定分桶的耗时直方图.
+    """
+
+    __slots__ = ("counts", "count", "total_ms", "max_ms", "over_budget")
+
+    def __init__(self):
+        self.counts = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.over_budget = 0
+
+    def record(self, elapsed_ms: float, budget_ms: Optional[float] = None):
+        self.counts[bisect_left(HISTOGRAM_BUCKETS_MS, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+        if budget_ms is not None and elapsed_ms > budget_ms:
+            self.over_budget += 1
+
+    def percentile(self, p: float) -> float:
+        """
+        按桶上界估算百分位（毫秒）
+        """
+        if not self.count:
+            return 0.0
+        target = self.count * p / 100
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                if index < len(HISTOGRAM_BUCKETS_MS):
+                    return HISTOGRAM_BUCKETS_MS[index]
+                break
+        return self.max_ms
+
+    def snapshot(self) -> dict:
+        labels = [f"<={b:g}ms" for b in HISTOGRAM_BUCKETS_MS]
+        labels.append(f">{HISTOGRAM_BUCKETS_MS[-1]:g}ms")
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max_ms, 3),
+            "over_budget": self.over_budget,
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class QueueStats:
+    """
+    队列丢帧与深度统计.
+    """
+
+    __slots__ = ("maxsize", "dropped", "max_depth")
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.dropped = 0
+        self.max_depth = 0
+
+    def observe(self, depth: int):
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+
+class AudioMetrics:
+    """
+    音频链路指标.
+    """
+
+    # 播放静音持续不超过该时长后又恢复，视为语音中断（而非一句话结束）
+    GAP_MAX_SECONDS = 1.0
+
+    def __init__(self, queues: Dict[str, int], critical_queues: Iterable[str] = ()):
+        """
+        Args:
+            queues: 队列名称 -> 最大长度
+            critical_queues: 丢帧会造成可闻卡顿的队列（如播放队列）
+        """
+        self._queue_sizes = dict(queues)
+        self._critical_queues = tuple(critical_queues)
+        self.reset()
+
+    def reset(self):
+        """
+        原地清零全部指标（持有本对象引用的一方无需更新引用）
+        """
+        self.started_at = time.monotonic()
+
+        # 驱动上报的状态
+        self.input_overflows = 0
+        self.input_underflows = 0
+        self.output_underflows = 0
+        self.output_overflows = 0
+
+        # 软件层面的欠载：播放回调需要数据时队列不足
+        self.output_partial_frames = 0  # 数据不足一帧，补零
+        self.playback_gaps = 0  # 播放中途队列耗尽后又恢复
+
+        self.queues = {
+            name: QueueStats(size) for name, size in self._queue_sizes.items()
+        }
+
+        self.callbacks = {
+            "input": LatencyHistogram(),
+            "output": LatencyHistogram(),
+        }
+        self.resamplers = {
+            "input": LatencyHistogram(),
+            "output": LatencyHistogram(),
+        }
+
+        # 播放连续性跟踪（主要由播放回调线程访问）
+        self._playing = False
+        self._silent_since: Optional[float] = None
+        # 服务端已通知本段语音结束（TTS stop/打断），队列播完后的静音不计为中断
+        self._utterance_done = False
+
+    # -----------------------
+    # 更新接口
+    # -----------------------
+    def record_input_status(self, status):
+        """
+        记录录音回调的状态标志（sounddevice.CallbackFlags）
+        """
+        if status.input_overflow:
+            self.input_overflows += 1
+        if status.input_underflow:
+            self.input_underflows += 1
+
+    def record_output_status(self, status):
+        """
+        记录播放回调的状态标志（sounddevice.CallbackFlags）
+        """
+        if status.output_underflow:
+            self.output_underflows += 1
+        if status.output_overflow:
+            self.output_overflows += 1
+
+    def record_drop(self, queue_name: str):
+        stats = self.queues.get(queue_name)
+        if stats is not None:
+            stats.dropped += 1
+
+    def record_depth(self, queue_name: str, depth: int):
+        stats = self.queues.get(queue_name)
+        if stats is not None:
+            stats.observe(depth)
+
+    def record_playback(self, has_voice: bool, partial: bool = False):
+        """
+        记录播放回调是否取到语音数据，用于检测播放中途的中断.
+        """
+        if partial:
+            self.output_partial_frames += 1
+        if has_voice:
+            if (
+                self._silent_since is not None
+                and time.monotonic() - self._silent_since <= self.GAP_MAX_SECONDS
+            ):
+                self.playback_gaps += 1
+            self._playing = True
+            self._silent_since = None
+        elif self._playing:
+            self._playing = False
+            if self._utterance_done:
+                self._utterance_done = False
+                self._silent_since = None
+            else:
+                self._silent_since = time.monotonic()
+
+    def end_playback(self):
+        """一段语音结束（TTS stop、打断或队列已清空）
+
+        仍在播放时等剩余语音播完，之后的静音不计为中断；已经静音时立即生效.
+        """
+        if self._playing:
+            self._utterance_done = True
+        else:
+            self._utterance_done = False
+            self._silent_since = None
+
+    # -----------------------
+    # 读取接口
+    # -----------------------
+    def snapshot(self, depths: Optional[Dict[str, int]] = None, **extra) -> dict:
+        """
+        导出当前指标.
+
+        Args:
+            depths: 各队列当前深度
+            extra: 附加字段（如重采样缓冲延迟）
+        """
+        depths = depths or {}
+        result = {
+            "uptime_s": round(time.monotonic() - self.started_at, 1),
+            "device": {
+                "input_overflows": self.input_overflows,
+                "input_underflows": self.input_underflows,
+                "output_underflows": self.output_underflows,
+                "output_overflows": self.output_overflows,
+            },
+            "playback": {
+                "partial_frames": self.output_partial_frames,
+                "gaps": self.playback_gaps,
+            },
+            "queues": {
+                name: {
+                    "depth": depths.get(name, 0),
+                    "max_depth": stats.max_depth,
+                    "maxsize": stats.maxsize,
+                    "dropped": stats.dropped,
+                }
+                for name, stats in self.queues.items()
+            },
+            "callbacks": {
+                name: hist.snapshot() for name, hist in self.callbacks.items()
+            },
+            "resamplers": {
+                name: hist.snapshot()
+                for name, hist in self.resamplers.items()
+                if hist.count
+            },
+        }
+        result.update(extra)
+        return result
+
+    def glitch_count(self) -> int:
+        """
+        可能造成可闻卡顿的事件总数，用于判断周期内是否出现问题.
+        """
+        return (
+            self.input_overflows
+            + self.output_underflows
+            + self.playback_gaps
+            + sum(self.queues[name].dropped for name in self._critical_queues)
+            + sum(hist.over_budget for hist in self.callbacks.values())
+        )
+
+
+def format_summary(snapshot: dict) -> str:
+    """
+    将指标快照压缩为一行日志.
+    """
+    device = snapshot["device"]
+    playback = snapshot["playback"]
+    parts = [
+        f"输入溢出 {device['input_overflows']}",
+        f"输出欠载 {device['output_underflows']}",
+        f"播放中断 {playback['gaps']}",
+        f"补零帧 {playback['partial_frames']}",
+    ]
+    for name, q in snapshot["queues"].items():
+        parts.append(
+            f"{name} 丢帧 {q['dropped']} 深度 {q['depth']}/{q['max_depth']}/{q['maxsize']}"
+        )
+    for name, hist in snapshot["callbacks"].items():
+        parts.append(
+            f"{name}回调 p99 {hist['p99_ms']:g}ms max {hist['max_ms']:.2f}ms "
+            f"超时 {hist['over_budget']}"
+        )
+    for name, hist in snapshot["resamplers"].items():
+        parts.append(f"{name}重采样 avg {hist['avg_ms']:.3f}ms")
+    if "resample_buffer_ms" in snapshot:
+        buffered = snapshot["resample_buffer_ms"]
+        parts.append(
+            f"重采样缓冲 输入 {buffered['input']:.1f}ms 输出 {buffered['output']:.1f}ms"
+        )
+    return ", ".join(parts)
@@ -0,0 +1,149 @@
+import threading
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+import numpy as np
+
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class OutputSource(ABC):
+    """
+    附加输出音源接口（如音乐播放），由播放回调线程调用 read()
+    音频格式须与播放队列一致：OUTPUT_SAMPLE_RATE、单声道、int16.
+    """
+
+    # 音源自身增益（0.0 ~ 1.0）
+    gain = 1.0
+
+    @abstractmethod
+    def read(self, frames: int) -> Optional[np.ndarray]:
+        """读取 frames 个样本.
+
+        Returns:
+            不超过 frames 个样本；暂无数据时返回 None
+        """
+
+
+class OutputMixer:
+    """
+    播放混音器：将语音（TTS）帧与附加音源混合
+    主要功能：
+    1. 按音源增益混合，结果限幅到 int16
+    2. 有语音播放时自动压低附加音源（ducking），语音结束后平滑恢复
+    3. 增益逐样本线性过渡，避免音量突变产生爆音
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        duck_gain: float = 0.2,
+        attack_ms: int = 60,
+        release_ms: int = 400,
+        hold_ms: int = 300,
+    ):
+        self.sample_rate = sample_rate
+        self.duck_gain = duck_gain
+
+        self._attack_step = 1.0 / max(1, sample_rate * attack_ms // 1000)
+        self._release_step = 1.0 / max(1, sample_rate * release_ms // 1000)
+        self._hold_samples = sample_rate * hold_ms // 1000
+
+        self._sources: List[OutputSource] = []
+        self._lock = threading.Lock()
+
+        # 当前 ducking 增益与语音结束后的保持计数
+        self._duck_level = 1.0
+        self._hold_remaining = 0
+
+    def add_source(self, source: OutputSource):
+        with self._lock:
+            if source not in self._sources:
+                self._sources.append(source)
+
+    def remove_source(self, source: OutputSource):
+        with self._lock:
+            if source in self._sources:
+                self._sources.remove(source)
+
+    def has_sources(self) -> bool:
+        return bool(self._sources)
+
+    @property
+    def ducking(self) -> bool:
+        """
+        当前是否处于压低状态.
+        """
+        return self._duck_level < 1.0
+
+    def mix(self, voice: Optional[np.ndarray], frames: int) -> Optional[np.ndarray]:
+        """混合一帧输出.
+
+        Args:
+            voice: 语音帧（可为 None）
+            frames: 输出的样本数；语音帧更长时以语音帧长度为准，更短时补零
+
+        Returns:
+            混合后的 int16 帧；既无语音也无附加音源数据时返回 None
+        """
+        with self._lock:
+            sources = list(self._sources)
+
+        if not sources:
+            return voice
+
+        length = frames
+        if voice is not None:
+            length = max(frames, len(voice))
+            if len(voice) < length:
+                # 最后一段语音不足一帧：补零，音乐照常输出整帧
+                voice = np.concatenate(
+                    [voice, np.zeros(length - len(voice), dtype=voice.dtype)]
+                )
+        duck = self._duck_envelope(voice is not None, length)
+
+        mixed = None
+        for source in sources:
+            try:
+                data = source.read(length)
+            except Exception as e:
+                logger.warning(f"读取附加音源失败: {e}")
+                continue
+            if data is None or len(data) == 0:
+                continue
+            if mixed is None:
+                mixed = np.zeros(length, dtype=np.float32)
+            mixed[: len(data)] += data.astype(np.float32) * source.gain
+
+        if mixed is None:
+            return voice
+
+        mixed *= duck
+        if voice is not None:
+            mixed += voice.astype(np.float32)
+        return np.clip(mixed, -32768, 32767).astype(np.int16)
+
+    def _duck_envelope(self, voice_active: bool, length: int) -> np.ndarray:
+        """
+        计算本帧逐样本的 ducking 增益.
+        """
+        if voice_active:
+            self._hold_remaining = self._hold_samples
+            target, step = self.duck_gain, self._attack_step
+        elif self._hold_remaining > 0:
+            self._hold_remaining = max(0, self._hold_remaining - length)
+            target, step = self.duck_gain, self._attack_step
+        else:
+            target, step = 1.0, self._release_step
+
+        start = self._duck_level
+        if start == target:
+            return np.full(length, start, dtype=np.float32)
+
+        direction = 1.0 if target > start else -1.0
+        ramp = start + direction * step * np.arange(1, length + 1, dtype=np.float32)
+        ramp = np.minimum(ramp, target) if direction > 0 else np.maximum(ramp, target)
+        self._duck_level = float(ramp[-1])
+        return ramp
@@ -0,0 +1,288 @@
+import threading
+from typing import Optional
+
+import numpy as np
+import soxr
+
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class ReferenceResampler:
+    """
+    参考信号流式重采样器（仅 macOS BlackHole 参考信号使用）
+    主要功能：
+    1. 使用 soxr 流式重采样到 16kHz（带抗混叠滤波，保留跨回调的滤波器状态）
+    2. 预分配环形缓冲区，整块写入/读取，避免逐样本 popleft
+    3. 根据缓冲区水位做时钟漂移补偿（参考设备与采集设备时钟不同步）
+    """
+
+    def __init__(
+        self,
+        source_rate: int,
+        target_rate: int,
+        channels: int = 1,
+        capacity_ms: int = 400,
+        target_fill_ms: int = 30,
+        drift_tolerance_ms: int = 5,
+    ):
+        self.source_rate = source_rate
+        self.target_rate = target_rate
+
+        # soxr 流式重采样器（采样率一致时直通）
+        self._resampler = None
+        if source_rate != target_rate:
+            self._resampler = soxr.ResampleStream(
+                source_rate, target_rate, channels, dtype="int16", quality="HQ"
+            )
+
+        samples_per_ms = target_rate // 1000
+        self._capacity = capacity_ms * samples_per_ms
+        self._buffer = np.zeros(self._capacity, dtype=np.int16)
+        self._read_pos = 0
+        self._size = 0
+        self._lock = threading.Lock()
+
+        # 漂移补偿：维持缓冲区水位在目标值附近
+        self._target_fill = target_fill_ms * samples_per_ms
+        self._drift_tolerance = drift_tolerance_ms * samples_per_ms
+        self._fill_ema = None
+        self._fill_alpha = 0.02
+
+        # 统计
+        self.dropped_samples = 0
+        self.inserted_samples = 0
+        self.underruns = 0
+
+    def push(self, audio_data: np.ndarray):
+        """
+        写入一块参考信号（参考流回调线程调用）
+        """
+        if self._resampler is not None:
+            audio_data = self._resampler.resample_chunk(audio_data, last=False)
+        if len(audio_data) == 0:
+            return
+
+        audio_data = np.asarray(audio_data, dtype=np.int16)
+        with self._lock:
+            # 超出容量时只保留最新的数据
+            if len(audio_data) >= self._capacity:
+                audio_data = audio_data[-self._capacity :]
+
+            overflow = self._size + len(audio_data) - self._capacity
+            if overflow > 0:
+                self._advance(overflow)
+                self.dropped_samples += overflow
+
+            write_pos = (self._read_pos + self._size) % self._capacity
+            first = min(len(audio_data), self._capacity - write_pos)
+            self._buffer[write_pos : write_pos + first] = audio_data[:first]
+            if first < len(audio_data):
+                self._buffer[: len(audio_data) - first] = audio_data[first:]
+            self._size += len(audio_data)
+
+    def read(self, frame_size: int) -> Optional[np.ndarray]:
+        """读取一帧参考信号（采集线程调用）
+
+        Returns:
+            参考帧；缓冲区数据不足时返回 None
+        """
+        with self._lock:
+            if self._size < frame_size:
+                self.underruns += 1
+                return None
+
+            self._update_fill(self._size)
+
+            # 水位远高于目标（启动或长时间阻塞后）：一次性追上，避免延迟持续偏大
+            excess = self._size - self._target_fill - frame_size
+            if excess > 4 * self._drift_tolerance:
+                self._advance(excess)
+                self.dropped_samples += excess
+                self._fill_ema = float(self._size)
+
+            # 小幅漂移：每帧最多滑动一个样本
+            slip = 0
+            if self._fill_ema is not None:
+                if (
+                    self._fill_ema > self._target_fill + self._drift_tolerance
+                    and self._size > frame_size
+                ):
+                    slip = 1
+                elif self._fill_ema < self._target_fill - self._drift_tolerance:
+                    slip = -1
+
+            take = frame_size + slip
+            frame = self._peek(take)
+            self._advance(take)
+
+        if slip > 0:
+            # 丢弃一个样本
+            self.dropped_samples += 1
+            return np.delete(frame, len(frame) // 2)
+        if slip < 0:
+            # 重复一个样本
+            self.inserted_samples += 1
+            return np.insert(frame, len(frame) // 2, frame[len(frame) // 2])
+        return frame
+
+    def available(self) -> int:
+        """
+        当前缓冲的样本数.
+        """
+        return self._size
+
+    def clear(self):
+        """
+        清空缓冲区并重置漂移状态.
+        """
+        with self._lock:
+            self._read_pos = 0
+            self._size = 0
+            self._fill_ema = None
+
+    def close(self):
+        """
+        刷新并释放重采样器.
+        """
+        if self._resampler is not None:
+            try:
+                self._resampler.resample_chunk(np.array([], dtype=np.int16), last=True)
+            except Exception as e:
+                logger.debug(f"刷新参考重采样器失败: {e}")
+            self._resampler = None
+        self.clear()
+
+    def _peek(self, count: int) -> np.ndarray:
+        end = self._read_pos + count
+        if end <= self._capacity:
+            return self._buffer[self._read_pos : end].copy()
+        return np.concatenate(
+            (self._buffer[self._read_pos :], self._buffer[: end - self._capacity])
+        )
+
+    def _advance(self, count: int):
+        count = min(count, self._size)
+        self._read_pos = (self._read_pos + count) % self._capacity
+        self._size -= count
+
+    def _update_fill(self, fill: int):
+        if self._fill_ema is None:
+            self._fill_ema = float(fill)
+        else:
+            self._fill_ema += self._fill_alpha * (fill - self._fill_ema)
+
+
+class EchoDelayEstimator:
+    """
+    回声延迟估计器：对参考信号与麦克风信号做互相关，估计回声相对参考帧的延迟
+    结果用于动态调用 WebRTC APM 的 set_stream_delay_ms.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        window_ms: int = 500,
+        max_delay_ms: int = 250,
+        interval_ms: int = 1000,
+        history: int = 5,
+        min_confidence: float = 0.3,
+        min_change_ms: int = 4,
+    ):
+        self.sample_rate = sample_rate
+        self._samples_per_ms = sample_rate // 1000
+        self._window = window_ms * self._samples_per_ms
+        self._max_lag = max_delay_ms * self._samples_per_ms
+        self._interval = interval_ms * self._samples_per_ms
+        self._min_confidence = min_confidence
+        self._min_change_ms = min_change_ms
+
+        # 参考历史比采集窗口多 max_lag 个样本，末尾与采集窗口末尾对齐
+        self._reference = np.zeros(self._window + self._max_lag, dtype=np.float32)
+        self._capture = np.zeros(self._window, dtype=np.float32)
+        self._since_estimate = 0
+
+        self._fft_size = 1 << int(np.ceil(np.log2(len(self._reference) + self._window)))
+        self._estimates = []
+        self._history = history
+
+        self.delay_ms: Optional[int] = None
+        self.confidence = 0.0
+
+    def update(self, reference: np.ndarray, capture: np.ndarray) -> Optional[int]:
+        """推入一对对齐的参考帧/采集帧.
+
+        Returns:
+            延迟估计发生显著变化时返回新的延迟（毫秒），否则返回 None
+        """
+        n = len(capture)
+        # 原地平移，不分配新数组
+        self._reference[:-n] = self._reference[n:]
+        self._reference[-n:] = reference
+        self._capture[:-n] = self._capture[n:]
+        self._capture[-n:] = capture
+
+        self._since_estimate += n
+        if self._since_estimate < self._interval:
+            return None
+        self._since_estimate = 0
+
+        estimate = self._estimate()
+        if estimate is None:
+            return None
+
+        self._estimates.append(estimate)
+        if len(self._estimates) > self._history:
+            self._estimates.pop(0)
+        delay_ms = int(round(float(np.median(self._estimates))))
+
+        if (
+            self.delay_ms is None
+            or abs(delay_ms - self.delay_ms) >= self._min_change_ms
+        ):
+            self.delay_ms = delay_ms
+            return delay_ms
+        return None
+
+    def reset(self):
+        self._reference.fill(0)
+        self._capture.fill(0)
+        self._since_estimate = 0
+        self._estimates.clear()
+        self.delay_ms = None
+        self.confidence = 0.0
+
+    def _estimate(self) -> Optional[float]:
+        """
+        基于FFT的归一化互相关，返回延迟（毫秒）；参考信号过弱或相关性不足时返回 None.
+        """
+        ref = self._reference
+        cap = self._capture
+
+        cap_energy = float(np.dot(cap, cap))
+        if cap_energy <= 0 or float(np.dot(ref, ref)) < 1e3 * len(ref):
+            # 扬声器没有播放内容，无法估计
+            return None
+
+        # corr[k] = sum_i ref[k + i] * cap[i]，k = max_lag - delay
+        spectrum = np.fft.rfft(ref, self._fft_size) * np.conj(
+            np.fft.rfft(cap, self._fft_size)
+        )
+        corr = np.fft.irfft(spectrum, self._fft_size)[: self._max_lag + 1]
+
+        # 每个滑动窗口内的参考能量，用于归一化
+        cumsum = np.concatenate(([0.0], np.cumsum(ref.astype(np.float64) ** 2)))
+        ref_energy = (
+            cumsum[self._window : self._window + self._max_lag + 1]
+            - cumsum[: self._max_lag + 1]
+        )
+        norm = np.sqrt(np.maximum(ref_energy, 1e-9) * cap_energy)
+        normalized = np.abs(corr) / norm
+
+        k = int(np.argmax(normalized))
+        self.confidence = float(normalized[k])
+        if self.confidence < self._min_confidence:
+            return None
+
+        return (self._max_lag - k) / self._samples_per_ms
@@ -7,6 +7,7 @@ import numpy as np
 import sherpa_onnx
 
 from src.constants.constants import AudioConfig
+from src.utils import latency_tracer
 from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
 from src.utils.resource_finder import resource_finder
@@ -273,6 +274,11 @@ class WakeWordDetector:
 
         self.last_detection_time = current_time
 
+        # 唤醒词开启新一轮延迟追踪
+        tracer = latency_tracer.get_latency_tracer()
+        tracer.begin_turn("wake_word", reuse=False)
+        tracer.mark(latency_tracer.WAKE_WORD)
+
         # 触发回调
         if self.on_detected_callback:
             try:
@@ -172,7 +172,7 @@ class Ota:
             if mqtt_info:
                 # 更新配置
                 success = self.config.update_config(
-                    "SYSTEM_OPTIONS.NETWORK.MQTT_INFO", mqtt_info
+                    "SYSTEM_OPTIONS.NETWORK.MQTT_INFO", mqtt_info, flush=True
                 )
                 if success:
                     self.logger.info("MQTT配置已更新")
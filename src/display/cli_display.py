@@ -4,26 +4,46 @@ import os
 import shutil
 import sys
 import termios
+import time
 import tty
 from collections import deque
 from typing import Callable, Optional
 
 from src.display.base_display import BaseDisplay
+from src.utils.config_manager import ConfigManager
+from src.utils.latency_tracer import get_latency_tracer
 
 
 class CliDisplay(BaseDisplay):
+    # 日志缓冲行数及单条日志最大长度（多行异常堆栈只保留首行）
+    LOG_BUFFER_LINES = 6
+    LOG_LINE_MAX_CHARS = 240
+
     def __init__(self):
         super().__init__()
         self.running = True
         self._use_ansi = sys.stdout.isatty()
         self._loop = None
-        self._last_drawn_rows = 0
+
+        # 渲染调度：多次刷新请求合并为一帧，帧间隔不小于 1/CLI_MAX_FPS 秒
+        max_fps = ConfigManager.get_instance().get_config("DISPLAY.CLI_MAX_FPS", 10)
+        self._frame_interval = 1.0 / max(1, max_fps)
+        self._render_handle: Optional[asyncio.Handle] = None
+        self._render_requested = False
+        self._last_render_at = 0.0
+        # 上一帧已绘制的各行内容与终端尺寸，用于只重写变化的行
+        self._drawn_lines: list[str] = []
+        self._drawn_size = None
 
         # 仪表盘数据（顶部内容显示区）
         self._dash_status = ""
         self._dash_connected = False
         self._dash_text = ""
         self._dash_emotion = ""
+        # 是否在仪表盘显示首音延迟统计
+        self._show_latency = bool(
+            ConfigManager.get_instance().get_config("LATENCY_TRACE.SHOW_IN_CLI", False)
+        )
         # 布局：仅两块区域（显示区 + 输入区）
         # 预留两行输入空间（分隔线 + 输入行），并额外多留一行用于中文输入溢出的清理
         self._input_area_lines = 3
@@ -51,7 +71,7 @@ class CliDisplay(BaseDisplay):
         self.command_queue = asyncio.Queue()
 
         # 日志缓冲（只在 CLI 顶部显示，不直接打印到控制台）
-        self._log_lines: deque[str] = deque(maxlen=6)
+        self._log_lines: deque[str] = deque(maxlen=self.LOG_BUFFER_LINES)
         self._install_log_handler()
 
     async def set_callbacks(
@@ -77,7 +97,7 @@ class CliDisplay(BaseDisplay):
         """
         # 简化：按钮状态仅在仪表盘文本中展示
         self._dash_text = text
-        await self._render_dashboard()
+        self._request_render()
 
     async def update_status(self, status: str, connected: bool):
         """
@@ -85,7 +105,7 @@ class CliDisplay(BaseDisplay):
         """
         self._dash_status = status
         self._dash_connected = bool(connected)
-        await self._render_dashboard()
+        self._request_render()
 
     async def update_text(self, text: str):
         """
@@ -93,14 +113,14 @@ class CliDisplay(BaseDisplay):
         """
         if text and text.strip():
             self._dash_text = text.strip()
-            await self._render_dashboard()
+            self._request_render()
 
     async def update_emotion(self, emotion_name: str):
         """
         更新表情（仅更新仪表盘，不追加新行）。
         """
         self._dash_emotion = emotion_name
-        await self._render_dashboard()
+        self._request_render()
 
     async def start(self):
         """
@@ -149,7 +169,8 @@ class CliDisplay(BaseDisplay):
                     cmd = await asyncio.to_thread(self._read_line_raw)
                     # 清理输入区（含可能的中文换行残留）并刷新顶部内容
                     self._clear_input_area()
-                    await self._render_dashboard()
+                    # 回车可能使终端滚动，之前绘制的行已失效，需整屏重绘
+                    await self._render_dashboard(full=True)
                 else:
                     cmd = await asyncio.to_thread(input)
                 await self._handle_command(cmd.lower().strip())
@@ -165,15 +186,16 @@ class CliDisplay(BaseDisplay):
 
             def emit(self, record: logging.LogRecord) -> None:
                 try:
-                    msg = self.format(record)
-                    self.display._log_lines.append(msg)
-                    loop = self.display._loop
-                    if loop and self.display._use_ansi:
-                        loop.call_soon_threadsafe(
-                            lambda: asyncio.create_task(
-                                self.display._render_dashboard()
-                            )
-                        )
+                    msg = self.format(record).split("\n", 1)[0]
+                    limit = CliDisplay.LOG_LINE_MAX_CHARS
+                    if len(msg) > limit:
+                        msg = msg[: limit - 1] + "…"
+                    display = self.display
+                    display._log_lines.append(msg)
+                    loop = display._loop
+                    # 已有待绘制的帧时不再投递，避免错误风暴时塞满事件循环
+                    if loop and display._use_ansi and not display._render_requested:
+                        loop.call_soon_threadsafe(display._request_render)
                 except Exception:
                     pass
 
@@ -210,6 +232,9 @@ class CliDisplay(BaseDisplay):
         elif cmd == "x":
             if self.abort_callback:
                 await self.command_queue.put(self.abort_callback)
+        elif cmd == "l":
+            self._dash_text = f"首音延迟: {get_latency_tracer().summary_text()}"
+            self._request_render()
         else:
             if self.send_text_callback:
                 await self.send_text_callback(cmd)
@@ -219,13 +244,16 @@ class CliDisplay(BaseDisplay):
         关闭CLI显示.
         """
         self.running = False
+        self._cancel_render()
         print("\n正在关闭应用...\n")
 
     def _print_help(self):
         """
         将帮助信息写入顶部内容显示区，而非直接打印。
         """
-        help_text = "r: 开始/停止 | x: 打断 | q: 退出 | h: 帮助 | 其他: 发送文本"
+        help_text = (
+            "r: 开始/停止 | x: 打断 | l: 延迟统计 | q: 退出 | h: 帮助 | 其他: 发送文本"
+        )
         self._dash_text = help_text
 
     async def _init_screen(self):
@@ -316,9 +344,37 @@ class CliDisplay(BaseDisplay):
         sys.stdout.write(f"{prompt}{visible}")
         sys.stdout.flush()
 
+    # ===== 渲染调度 =====
+    def _request_render(self) -> None:
+        """
+        请求刷新仪表盘（须在事件循环线程调用），同一帧内的多次请求只绘制一次.
+        """
+        self._render_requested = True
+        if self._render_handle is not None or self._loop is None or not self.running:
+            return
+        delay = self._last_render_at + self._frame_interval - time.monotonic()
+        self._render_handle = self._loop.call_later(max(0.0, delay), self._render_frame)
+
+    def _render_frame(self) -> None:
+        self._render_handle = None
+        if self._render_requested and self.running:
+            self._draw_dashboard()
+
+    def _cancel_render(self) -> None:
+        if self._render_handle is not None:
+            self._render_handle.cancel()
+            self._render_handle = None
+        self._render_requested = False
+
     async def _render_dashboard(self, full: bool = False):
         """
-        在顶部固定区域更新内容显示，不触碰底部输入行。
+        立即绘制顶部固定区域，不触碰底部输入行.
+        """
+        self._draw_dashboard(full)
+
+    def _dashboard_frame(self, cols: int, rows: int) -> list[str]:
+        """
+        生成仪表盘各行内容（含边框）
         """
 
         # 截断长文本，避免换行撕裂界面
@@ -331,74 +387,77 @@ class CliDisplay(BaseDisplay):
             f"表情: {trunc(self._dash_emotion)}",
             f"文本: {trunc(self._dash_text)}",
         ]
-
-        if not self._use_ansi:
-            # 退化：仅打印最后一行状态
-            print(f"\r{lines[0]}        ", end="", flush=True)
-            return
-
-        cols, rows = self._term_size()
+        if self._show_latency:
+            lines.append(f"延迟: {trunc(get_latency_tracer().summary_text())}")
 
         # 可用显示行数 = 终端总行数 - 输入区行数
         usable_rows = max(5, rows - self._input_area_lines)
 
         # 一点点样式函数
         def style(s: str, *names: str) -> str:
-            if not self._use_ansi:
-                return s
             prefix = "".join(self._ansi.get(n, "") for n in names)
             return f"{prefix}{s}{self._ansi['reset']}"
 
+        width = max(2, cols - 2)
         title = style(" 小智 AI 终端 ", "bold", "cyan")
         # 头部框和底部框
-        top_bar = "┌" + ("─" * (max(2, cols - 2))) + "┐"
-        title_line = "│" + title.center(max(2, cols - 2)) + "│"
-        sep_line = "├" + ("─" * (max(2, cols - 2))) + "┤"
-        bottom_bar = "└" + ("─" * (max(2, cols - 2))) + "┘"
+        frame = [
+            "┌" + ("─" * width) + "┐",
+            "│" + title.center(width) + "│",
+            "├" + ("─" * width) + "┤",
+        ]
 
         # 内容区可用行数（减去上下框的4行）
         body_rows = max(1, usable_rows - 4)
-        body = []
         for i in range(body_rows):
             text = lines[i] if i < len(lines) else ""
             text = style(text, "green") if i == 0 else text
-            body.append("│" + text.ljust(max(2, cols - 2))[: max(2, cols - 2)] + "│")
+            frame.append("│" + text.ljust(width)[:width] + "│")
 
-        # 保存光标位置
-        sys.stdout.write("\x1b7")
+        frame.append("└" + ("─" * width) + "┘")
+        return [line[:cols] for line in frame]
 
-        # 在绘制前彻底清空上一帧可能残留的区域，避免视觉上出现“两层”
-        total_rows = 4 + body_rows  # 顶部框三行 + 底部框一行 + 正文行数
-        rows_to_clear = max(self._last_drawn_rows, total_rows)
-        for i in range(rows_to_clear):
-            self._goto(1 + i, 1)
-            sys.stdout.write("\x1b[2K")
+    def _draw_dashboard(self, full: bool = False) -> None:
+        self._render_requested = False
+        self._last_render_at = time.monotonic()
+        if self._render_handle is not None:
+            self._render_handle.cancel()
+            self._render_handle = None
 
-        # 绘制头部
-        self._goto(1, 1)
-        sys.stdout.write("\x1b[2K" + top_bar[:cols])
-        self._goto(2, 1)
-        sys.stdout.write("\x1b[2K" + title_line[:cols])
-        self._goto(3, 1)
-        sys.stdout.write("\x1b[2K" + sep_line[:cols])
-
-        # 绘制主体
-        for idx in range(body_rows):
-            self._goto(4 + idx, 1)
-            sys.stdout.write("\x1b[2K")
-            sys.stdout.write(body[idx][:cols])
+        if not self._use_ansi:
+            # 退化：仅在状态变化时打印最后一行状态
+            status_line = f"状态: {self._dash_status}"
+            if full or self._drawn_lines != [status_line]:
+                print(f"\r{status_line}        ", end="", flush=True)
+                self._drawn_lines = [status_line]
+            return
 
-        # 底部框
-        self._goto(4 + body_rows, 1)
-        sys.stdout.write("\x1b[2K" + bottom_bar[:cols])
+        cols, rows = self._term_size()
+        frame = self._dashboard_frame(cols, rows)
+        previous = self._drawn_lines
+        # 终端尺寸变化后旧行位置不可信，整屏重绘
+        if full or self._drawn_size != (cols, rows):
+            previous = []
+
+        out = []
+        for index, line in enumerate(frame):
+            if index < len(previous) and previous[index] == line:
+                continue
+            out.append(f"\x1b[{index + 1};1H\x1b[2K{line}")
+        # 清理上一帧多出的行（终端变矮或全量重绘时）
+        stale = max(len(self._drawn_lines), len(previous))
+        for index in range(len(frame), stale):
+            out.append(f"\x1b[{index + 1};1H\x1b[2K")
+
+        self._drawn_lines = frame
+        self._drawn_size = (cols, rows)
+        if not out:
+            return
 
-        # 恢复光标位置
-        sys.stdout.write("\x1b8")
+        # 保存光标位置，一次写出所有变化的行后恢复
+        sys.stdout.write("\x1b7" + "".join(out) + "\x1b8")
         sys.stdout.flush()
 
-        # 记录本次绘制高度
-        self._last_drawn_rows = total_rows
-
     def _clear_input_area(self):
         if not self._use_ansi:
             return
@@ -17,6 +17,8 @@ from PyQt5.QtWidgets import QApplication, QVBoxLayout, QWidget
 
 from src.display.base_display import BaseDisplay
 from src.display.gui_display_model import GuiDisplayModel
+from src.display.ui_update_coalescer import UiUpdateCoalescer
+from src.utils.config_manager import ConfigManager
 from src.utils.resource_finder import find_assets_dir
 
 
@@ -47,6 +49,14 @@ class GuiDisplay(BaseDisplay, QObject, metaclass=CombinedMeta):
         # Mô hình dữ liệu
         self.display_model = GuiDisplayModel()
 
+        # Gộp cập nhật thuộc tính theo khung hình, tránh QML vẽ lại liên tục khi phản hồi dạng luồng
+        self._ui_updates = UiUpdateCoalescer(
+            ConfigManager.get_instance().get_config(
+                "DISPLAY.GUI_MAX_FPS", UiUpdateCoalescer.DEFAULT_MAX_FPS
+            ),
+            parent=self,
+        )
+
         # Quản lý biểu cảm
         self._emotion_cache = {}
         self._last_emotion_name = None
@@ -98,6 +108,10 @@ class GuiDisplay(BaseDisplay, QObject, metaclass=CombinedMeta):
 
     async def update_status(self, status: str, connected: bool):
         """Cập nhật văn bản trạng thái và xử lý logic liên quan."""
+        self._ui_updates.post("status", lambda: self._apply_status(status, connected))
+
+    def _apply_status(self, status: str, connected: bool):
+        """Áp dụng trạng thái lên mô hình và khay hệ thống (trên luồng Qt)."""
         self.display_model.update_status(status, connected)
 
         # Theo dõi biến động trạng thái
@@ -115,7 +129,7 @@ class GuiDisplay(BaseDisplay, QObject, metaclass=CombinedMeta):
 
     async def update_text(self, text: str):
         """Cập nhật văn bản TTS."""
-        self.display_model.update_text(text)
+        self._ui_updates.post("text", lambda: self.display_model.update_text(text))
 
     async def update_emotion(self, emotion_name: str):
         """Cập nhật hiển thị biểu cảm."""
@@ -124,12 +138,16 @@ class GuiDisplay(BaseDisplay, QObject, metaclass=CombinedMeta):
 
         self._last_emotion_name = emotion_name
         asset_path = self._get_emotion_asset_path(emotion_name)
-        self.display_model.update_emotion(asset_path)
+        self._ui_updates.post(
+            "emotion", lambda: self.display_model.update_emotion(asset_path)
+        )
 
     async def update_button_status(self, text: str):
         """Cập nhật trạng thái nút."""
         if self.auto_mode:
-            self.display_model.update_button_text(text)
+            self._ui_updates.post(
+                "button", lambda: self.display_model.update_button_text(text)
+            )
 
     async def toggle_mode(self):
         """Chuyển đổi chế độ hội thoại."""
@@ -152,6 +170,7 @@ class GuiDisplay(BaseDisplay, QObject, metaclass=CombinedMeta):
     async def close(self):
         """Xử lý đóng cửa sổ."""
         self._running = False
+        self._ui_updates.close()
         if self.system_tray:
             self.system_tray.hide()
         if self.root:
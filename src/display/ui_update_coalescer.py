@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Bộ gộp cập nhật giao diện - gom các thay đổi thuộc tính theo khung hình.
+"""
+
+import threading
+import time
+from typing import Callable, Dict
+
+from PyQt5.QtCore import QObject, Qt, QTimer, pyqtSignal
+
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class UiUpdateCoalescer(QObject):
+    """Gộp các cập nhật giao diện và áp dụng trên luồng Qt với tần suất giới hạn.
+
+    Mỗi cập nhật được gửi kèm một khóa (ví dụ "text", "status"); trong cùng một khung hình
+    chỉ giữ lại giá trị mới nhất của mỗi khóa, các giá trị trung gian bị thay thế sẽ bị bỏ qua.
+    Có thể gọi post() từ bất kỳ luồng nào: lần gửi đầu tiên của mỗi đợt phát một tín hiệu
+    QueuedConnection để đánh thức luồng Qt, các lần gửi tiếp theo chỉ ghi vào bảng chờ.
+    """
+
+    DEFAULT_MAX_FPS = 30
+
+    _wake = pyqtSignal()
+
+    def __init__(self, max_fps: int = DEFAULT_MAX_FPS, parent=None):
+        super().__init__(parent)
+        self._interval = 1.0 / max(1, max_fps)
+        self._pending: Dict[str, Callable[[], None]] = {}
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._last_flush = 0.0
+        self._closed = False
+
+        # Thống kê
+        self.posted = 0
+        self.applied = 0
+        self.flushes = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+        self._wake.connect(self._on_wake, Qt.QueuedConnection)
+
+    def post(self, key: str, apply: Callable[[], None]):
+        """Gửi một cập nhật, thay thế cập nhật đang chờ có cùng khóa.
+
+        Args:
+            key: Khóa thuộc tính giao diện
+            apply: Hàm áp dụng cập nhật, được gọi trên luồng Qt
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._pending[key] = apply
+            self.posted += 1
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._wake.emit()
+
+    def _on_wake(self):
+        """Chạy trên luồng Qt: áp dụng ngay hoặc hẹn giờ đến khung hình kế tiếp."""
+        if self._timer.isActive():
+            return
+        delay = self._last_flush + self._interval - time.monotonic()
+        if delay <= 0:
+            self.flush()
+        else:
+            self._timer.start(max(1, int(delay * 1000)))
+
+    def flush(self):
+        """Áp dụng toàn bộ cập nhật đang chờ (phải gọi trên luồng Qt)."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._scheduled = False
+        if not pending:
+            return
+
+        self._last_flush = time.monotonic()
+        self.flushes += 1
+        for key, apply in pending.items():
+            try:
+                apply()
+                self.applied += 1
+            except Exception as e:
+                logger.error(f"Áp dụng cập nhật giao diện '{key}' thất bại: {e}")
+
+    def close(self):
+        """Dừng nhận cập nhật mới và hủy các cập nhật đang chờ."""
+        with self._lock:
+            self._closed = True
+            self._pending.clear()
+            self._scheduled = False
+        self._timer.stop()
+        if self.posted:
+            logger.debug(
+                f"Cập nhật giao diện: đã gửi {self.posted}, đã áp dụng {self.applied}, "
+                f"{self.flushes} khung hình"
+            )
@@ -5,6 +5,7 @@ Reference: https://modelcontextprotocol.io/specification/2024-11-05
 
 import asyncio
 import json
+import logging
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
@@ -220,6 +221,8 @@ class McpServer:
 
     def __init__(self):
         self.tools: List[McpTool] = []
+        # 工具名 -> 工具，与 tools 同步维护，按名称查找时无需遍历列表
+        self._tools_by_name: Dict[str, McpTool] = {}
         self._send_callback: Optional[Callable] = None
         self._camera = None
 
@@ -239,12 +242,19 @@ class McpServer:
             tool = McpTool(name, description, properties, callback)
 
         # 检查是否已存在
-        if any(t.name == tool.name for t in self.tools):
+        if tool.name in self._tools_by_name:
             logger.warning(f"Tool {tool.name} already added")
             return
 
         logger.info(f"Add tool: {tool.name}")
         self.tools.append(tool)
+        self._tools_by_name[tool.name] = tool
+
+    def get_tool(self, name: str) -> Optional[McpTool]:
+        """
+        按名称获取工具.
+        """
+        return self._tools_by_name.get(name)
 
     def add_common_tools(self):
         """
@@ -253,6 +263,7 @@ class McpServer:
         # 备份原有工具列表
         original_tools = self.tools.copy()
         self.tools.clear()
+        self._tools_by_name.clear()
 
         # 添加系统工具
         from src.mcp.tools.system import get_system_tools_manager
@@ -353,6 +364,8 @@ class McpServer:
 
         # 恢复原有工具
         self.tools.extend(original_tools)
+        for tool in original_tools:
+            self._tools_by_name.setdefault(tool.name, tool)
 
     async def parse_message(self, message: Union[str, Dict[str, Any]]):
         """
@@ -364,9 +377,15 @@ class McpServer:
             else:
                 data = message
 
-            logger.info(
-                f"[MCP] 解析消息: {json.dumps(data, ensure_ascii=False, indent=2)}"
-            )
+            # 序列化完整消息开销较大，仅在需要输出时进行
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[MCP] 解析消息: %s", json.dumps(data, ensure_ascii=False))
+            else:
+                logger.info(
+                    "[MCP] 解析消息: method=%s, id=%s",
+                    data.get("method"),
+                    data.get("id"),
+                )
 
             # 检查JSONRPC版本
             if data.get("jsonrpc") != "2.0":
@@ -479,12 +498,7 @@ class McpServer:
         logger.info(f"[MCP] 尝试调用工具: {tool_name}")
 
         # 查找工具
-        tool = None
-        for t in self.tools:
-            if t.name == tool_name:
-                tool = t
-                break
-
+        tool = self.get_tool(tool_name)
         if not tool:
             await self._reply_error(id, f"Unknown tool: {tool_name}")
             return
@@ -512,13 +526,12 @@ class McpServer:
             url = vision.get("url")
             token = vision.get("token")
             if url:
-                from src.mcp.tools.camera import get_camera_instance
+                from src.mcp.tools.camera.vision_client import get_vision_client
 
-                camera = get_camera_instance()
-                if hasattr(camera, "set_explain_url"):
-                    camera.set_explain_url(url)
-                if token and hasattr(camera, "set_explain_token"):
-                    camera.set_explain_token(token)
+                client = get_vision_client()
+                client.set_explain_url(url)
+                if token:
+                    client.set_explain_token(token)
                 logger.info(f"Vision service configured with URL: {url}")
 
     async def _reply_result(self, id: int, result: Any):
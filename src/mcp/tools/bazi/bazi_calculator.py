@@ -4,9 +4,11 @@
 
 from typing import Any, Dict, List, Optional
 
+from .calendar_index import get_calendar_index
 from .engine import get_bazi_engine
 from .models import BaziAnalysis, EightChar, LunarTime, SolarTime
 from .professional_analyzer import get_professional_analyzer
+from .professional_data import get_changsheng_state, get_ten_gods_relation
 
 
 class BaziCalculator:
@@ -36,7 +38,7 @@ class BaziCalculator:
         """
         计算十神关系.
         """
-        return self.professional_analyzer.get_ten_gods_analysis(day_master, other_stem)
+        return get_ten_gods_relation(day_master, other_stem)
 
     def build_sixty_cycle_object(
         self, sixty_cycle, day_master: Optional[str] = None
@@ -88,8 +90,6 @@ class BaziCalculator:
         """
         计算十二长生.
         """
-        from .professional_data import get_changsheng_state
-
         return get_changsheng_state(stem, branch)
 
     def build_gods_object(
@@ -584,66 +584,11 @@ class BaziCalculator:
         ):
             raise ValueError("八字格式错误，每柱应为两个字符")
 
-        year_gan, year_zhi = year_pillar[0], year_pillar[1]
-        month_gan, month_zhi = month_pillar[0], month_pillar[1]
-        day_gan, day_zhi = day_pillar[0], day_pillar[1]
-        hour_gan, hour_zhi = hour_pillar[0], hour_pillar[1]
-
-        result_times = []
-
-        # 扩大搜索范围：1900-2100年，并优化搜索策略
-        for year in range(1900, 2100):
-            try:
-                # 尝试匹配年柱
-                if self._match_year_pillar(year, year_gan, year_zhi):
-                    # 遍历月份
-                    for month in range(1, 13):
-                        if self._match_month_pillar(year, month, month_gan, month_zhi):
-                            # 遍历日期，使用更精确的日期范围
-                            import calendar
-
-                            max_day = calendar.monthrange(year, month)[1]
-
-                            for day in range(1, max_day + 1):
-                                try:
-                                    if self._match_day_pillar(
-                                        year, month, day, day_gan, day_zhi
-                                    ):
-                                        # 遍历时辰，使用每个时辰的中心点
-                                        for hour in [
-                                            0,
-                                            2,
-                                            4,
-                                            6,
-                                            8,
-                                            10,
-                                            12,
-                                            14,
-                                            16,
-                                            18,
-                                            20,
-                                            22,
-                                        ]:  # 12个时辰的中心点
-                                            if self._match_hour_pillar(
-                                                hour,
-                                                hour_gan,
-                                                hour_zhi,
-                                                year,
-                                                month,
-                                                day,
-                                            ):
-                                                solar_time = f"{year}-{month:02d}-{day:02d} {hour:02d}:00:00"
-                                                result_times.append(solar_time)
-
-                                                # 适当增加返回数量限制
-                                                if len(result_times) >= 20:
-                                                    return result_times
-                                except ValueError:
-                                    continue  # 无效日期跳过
-            except Exception:
-                continue
-
-        return result_times[:20]  # 返回前20个匹配结果
+        # 通过预构建的干支历索引直接查表，匹配规则与逐年排盘一致：
+        # 年柱取年初/年中/年末，月柱取月内多个采样日，时辰取偶数整点
+        return get_calendar_index().find_solar_times(
+            year_pillar, month_pillar, day_pillar, hour_pillar, limit=20
+        )
 
     def _calculate_start_age(
         self, solar_time: SolarTime, eight_char: EightChar, gender: int
@@ -651,8 +596,6 @@ class BaziCalculator:
         """
         计算起运年龄.
         """
-        from lunar_python import Solar
-
         from .professional_data import GAN_YINYANG
 
         # 获取年柱干支阴阳
@@ -660,22 +603,15 @@ class BaziCalculator:
         year_gan_yinyang = GAN_YINYANG.get(year_gan, 1)
 
         try:
-            # 创建出生时间的Solar对象
-            birth_solar = Solar.fromYmdHms(
-                solar_time.year,
-                solar_time.month,
-                solar_time.day,
-                solar_time.hour,
-                solar_time.minute,
-                solar_time.second,
-            )
+            # 出生时间的农历/公历对象（引擎缓存）
+            lunar = self.engine.get_lunar(solar_time)
+            birth_solar = lunar.getSolar()
 
             # 起运规则：阳男阴女顺行，阴男阳女逆行
             if (gender == 1 and year_gan_yinyang == 1) or (
                 gender == 0 and year_gan_yinyang == -1
             ):
                 # 顺行：计算出生到下一个节气的天数
-                lunar = birth_solar.getLunar()
                 next_jieqi = lunar.getNextJieQi()
 
                 if next_jieqi:
@@ -691,7 +627,6 @@ class BaziCalculator:
                     start_age = 3  # 默认值
             else:
                 # 逆行：计算上一个节气到出生的天数
-                lunar = birth_solar.getLunar()
                 prev_jieqi = lunar.getPrevJieQi()
 
                 if prev_jieqi:
@@ -896,148 +831,12 @@ class BaziCalculator:
         except Exception:
             return 3  # 默认值
 
-    def _match_year_pillar(self, year: int, gan: str, zhi: str) -> bool:
-        """匹配年柱 - 修复版本，考虑立春节气"""
-        try:
-            from lunar_python import Solar
-
-            # 年柱以立春为界，需要检查立春前后的年柱
-            # 检查年初（立春前）
-            solar_start = Solar.fromYmdHms(year, 1, 1, 0, 0, 0)
-            lunar_start = solar_start.getLunar()
-            bazi_start = lunar_start.getEightChar()
-
-            # 检查年中（立春后）
-            solar_mid = Solar.fromYmdHms(year, 6, 1, 0, 0, 0)
-            lunar_mid = solar_mid.getLunar()
-            bazi_mid = lunar_mid.getEightChar()
-
-            # 检查年末
-            solar_end = Solar.fromYmdHms(year, 12, 31, 23, 59, 59)
-            lunar_end = solar_end.getLunar()
-            bazi_end = lunar_end.getEightChar()
-
-            # 如果年中任何一个时间点的年柱匹配，就认为匹配
-            year_gans = [
-                bazi_start.getYearGan(),
-                bazi_mid.getYearGan(),
-                bazi_end.getYearGan(),
-            ]
-            year_zhis = [
-                bazi_start.getYearZhi(),
-                bazi_mid.getYearZhi(),
-                bazi_end.getYearZhi(),
-            ]
-
-            for i in range(len(year_gans)):
-                if year_gans[i] == gan and year_zhis[i] == zhi:
-                    return True
-
-            return False
-        except Exception:
-            return False
-
-    def _match_month_pillar(self, year: int, month: int, gan: str, zhi: str) -> bool:
-        """匹配月柱 - 修复版本，考虑节气边界"""
-        try:
-            from lunar_python import Solar
-
-            # 月柱以节气为界，检查月中几个时间点
-            # 月初、月中、月末的月柱可能不同，需要都检查
-            test_days = [1, 8, 15, 22, 28]  # 检查多个日期
-
-            month_pillars = set()
-            for day in test_days:
-                try:
-                    # 确保日期有效
-                    import calendar
-
-                    max_day = calendar.monthrange(year, month)[1]
-                    if day > max_day:
-                        day = max_day
-
-                    solar = Solar.fromYmdHms(year, month, day, 12, 0, 0)
-                    lunar = solar.getLunar()
-                    bazi = lunar.getEightChar()
-
-                    month_gan = bazi.getMonthGan()
-                    month_zhi = bazi.getMonthZhi()
-                    month_pillars.add(f"{month_gan}{month_zhi}")
-                except Exception:
-                    continue
-
-            # 如果月中任何一天的月柱匹配，就认为匹配
-            target_pillar = f"{gan}{zhi}"
-            return target_pillar in month_pillars
-
-        except Exception:
-            return False
-
-    def _match_day_pillar(
-        self, year: int, month: int, day: int, gan: str, zhi: str
-    ) -> bool:
-        """
-        匹配日柱.
-        """
-        try:
-            from lunar_python import Solar
-
-            solar = Solar.fromYmdHms(year, month, day, 0, 0, 0)
-            lunar = solar.getLunar()
-            bazi = lunar.getEightChar()
-
-            day_gan = bazi.getDayGan()
-            day_zhi = bazi.getDayZhi()
-
-            return day_gan == gan and day_zhi == zhi
-        except Exception:
-            return False
-
-    def _match_hour_pillar(
-        self,
-        hour: int,
-        gan: str,
-        zhi: str,
-        year: int = None,
-        month: int = None,
-        day: int = None,
-    ) -> bool:
-        """匹配时柱 - 修复版本，使用实际日期"""
-        try:
-            from lunar_python import Solar
-
-            # 使用实际日期或默认日期配合时辰
-            use_year = year if year else 2024
-            use_month = month if month else 1
-            use_day = day if day else 1
-
-            solar = Solar.fromYmdHms(use_year, use_month, use_day, hour, 0, 0)
-            lunar = solar.getLunar()
-            bazi = lunar.getEightChar()
-
-            hour_gan = bazi.getTimeGan()
-            hour_zhi = bazi.getTimeZhi()
-
-            return hour_gan == gan and hour_zhi == zhi
-        except Exception:
-            return False
-
     def _get_zodiac_by_lunar_year(self, solar_time: SolarTime) -> str:
         """
         根据农历年份获取生肖（以春节为界，不是立春）
         """
         try:
-            from lunar_python import Solar
-
-            solar = Solar.fromYmdHms(
-                solar_time.year,
-                solar_time.month,
-                solar_time.day,
-                solar_time.hour,
-                solar_time.minute,
-                solar_time.second,
-            )
-            lunar = solar.getLunar()
+            lunar = self.engine.get_lunar(solar_time)
 
             # 使用lunar-python直接获取农历生肖（以春节为界）
             return lunar.getYearShengXiao()
@@ -0,0 +1,157 @@
+"""
+干支历反查索引.
+
+年、月、日、时柱都遵循六十甲子的连续循环：
+- 年柱：以立春为界，公历年份 y 立春后为 (y - 4) mod 60
+- 月柱：以节为界，每过一个节前进一位，寅月起于立春
+- 日柱：每日前进一位，与儒略日序号线性对应
+- 时柱：由日干按五鼠遁推出
+
+索引在首次使用时一次性构建，之后八字反查公历时间只需查表，
+不再逐年逐月调用 lunar_python 排盘。
+"""
+
+import calendar
+from datetime import date
+from typing import Dict, List, Optional
+
+from .professional_data import GAN, ZHI
+
+# 六十甲子序列
+SIXTY_CYCLE = [GAN[i % 10] + ZHI[i % 12] for i in range(60)]
+SIXTY_CYCLE_INDEX = {name: i for i, name in enumerate(SIXTY_CYCLE)}
+
+# 日柱偏移：date(2000, 1, 1) 为戊午日
+_DAY_OFFSET = (SIXTY_CYCLE_INDEX["戊午"] - date(2000, 1, 1).toordinal()) % 60
+
+# 反查使用的时辰采样点（每个时辰取偶数整点）
+HOUR_SAMPLES = [0, 2, 4, 6, 8, 10, 12, 14, 16, 18, 20, 22]
+
+
+def year_pillar_index(year: int) -> int:
+    """
+    公历年份立春之后的年柱序号.
+    """
+    return (year - 4) % 60
+
+
+def month_pillar_index(year: int, month: int) -> int:
+    """
+    公历 year 年 month 月交节之后的月柱序号（1月为丑月，2月为寅月……12月为子月）
+    """
+    # 1984年2月（甲子年寅月）为丙寅
+    return (year * 12 + month + 12) % 60
+
+
+def day_pillar_index(year: int, month: int, day: int) -> int:
+    """
+    日柱序号.
+    """
+    return (date(year, month, day).toordinal() + _DAY_OFFSET) % 60
+
+
+def hour_pillar_index(day_index: int, hour: int) -> int:
+    """
+    时柱序号（五鼠遁：甲己还加甲，乙庚丙作初……）
+    """
+    branch = ((hour + 1) // 2) % 12
+    stem = ((day_index % 5) * 2 + branch) % 10
+    # 满足 n % 10 == stem 且 n % 12 == branch 的唯一 n
+    return (6 * stem - 5 * branch) % 60
+
+
+class SexagenaryCalendarIndex:
+    """
+    干支历反查索引：柱 -> 公历日期范围.
+    """
+
+    def __init__(self, start_year: int = 1900, end_year: int = 2100):
+        self.start_year = start_year
+        self.end_year = end_year
+
+        # 年柱 -> 年份列表（年初在立春前属上一年柱，年中年末属本年柱）
+        self._years_by_pillar: Dict[int, List[int]] = {}
+        # 月柱 -> {年份: [月份]}（月初在交节前属上一月柱，月中以后属本月柱）
+        self._months_by_pillar: Dict[int, Dict[int, List[int]]] = {}
+
+        self._build()
+
+    def _build(self):
+        for year in range(self.start_year, self.end_year):
+            for pillar in sorted(
+                {year_pillar_index(year - 1), year_pillar_index(year)}
+            ):
+                self._years_by_pillar.setdefault(pillar, []).append(year)
+
+            for month in range(1, 13):
+                after = month_pillar_index(year, month)
+                for pillar in ((after - 1) % 60, after):
+                    self._months_by_pillar.setdefault(pillar, {}).setdefault(
+                        year, []
+                    ).append(month)
+
+    def find_solar_times(
+        self,
+        year_pillar: str,
+        month_pillar: str,
+        day_pillar: str,
+        hour_pillar: str,
+        limit: int = 20,
+    ) -> List[str]:
+        """按年、月、日、时顺序列出匹配的公历时间（每个时辰取偶数整点）
+
+        Returns:
+            形如 "YYYY-MM-DD HH:00:00" 的字符串列表，最多 limit 个
+        """
+        year_idx = SIXTY_CYCLE_INDEX.get(year_pillar)
+        month_idx = SIXTY_CYCLE_INDEX.get(month_pillar)
+        day_idx = SIXTY_CYCLE_INDEX.get(day_pillar)
+        hour_idx = SIXTY_CYCLE_INDEX.get(hour_pillar)
+        if None in (year_idx, month_idx, day_idx, hour_idx):
+            return []
+
+        hour = self._hour_for(day_idx, hour_idx)
+        if hour is None:
+            return []
+
+        months_by_year = self._months_by_pillar.get(month_idx, {})
+        results = []
+        for year in self._years_by_pillar.get(year_idx, []):
+            for month in months_by_year.get(year, []):
+                for day in self._days_for(year, month, day_idx):
+                    results.append(f"{year}-{month:02d}-{day:02d} {hour:02d}:00:00")
+                    if len(results) >= limit:
+                        return results
+        return results
+
+    @staticmethod
+    def _days_for(year: int, month: int, day_idx: int) -> range:
+        """
+        某月中日柱为 day_idx 的日期（每60天出现一次，一个月内至多一天）
+        """
+        first = day_pillar_index(year, month, 1)
+        max_day = calendar.monthrange(year, month)[1]
+        return range(1 + (day_idx - first) % 60, max_day + 1, 60)
+
+    @staticmethod
+    def _hour_for(day_idx: int, hour_idx: int) -> Optional[int]:
+        """
+        日柱下时柱为 hour_idx 的时辰采样点，日干与时干不相配时返回 None.
+        """
+        for hour in HOUR_SAMPLES:
+            if hour_pillar_index(day_idx, hour) == hour_idx:
+                return hour
+        return None
+
+
+_calendar_index = None
+
+
+def get_calendar_index() -> SexagenaryCalendarIndex:
+    """
+    获取干支历索引单例.
+    """
+    global _calendar_index
+    if _calendar_index is None:
+        _calendar_index = SexagenaryCalendarIndex()
+    return _calendar_index
@@ -3,7 +3,8 @@
 """
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
 import pendulum
 from lunar_python import Lunar, Solar
@@ -26,8 +27,36 @@ from .professional_data import (
     ZHI_CANG_GAN,
     ZHI_WUXING,
     ZHI_YINYANG,
+    get_nayin,
 )
 
+# 转换缓存容量（按规范化的公历时间缓存）
+_CONVERSION_CACHE_SIZE = 512
+
+
+@lru_cache(maxsize=_CONVERSION_CACHE_SIZE)
+def _lunar_from_solar(
+    year: int, month: int, day: int, hour: int, minute: int, second: int
+) -> Lunar:
+    """
+    公历转 lunar_python 农历对象（带缓存，Lunar 内部也会缓存八字）
+    """
+    return Solar.fromYmdHms(year, month, day, hour, minute, second).getLunar()
+
+
+def _solar_key(solar_time: SolarTime) -> Tuple[int, int, int, int, int, int]:
+    """
+    规范化公历时间作为缓存键.
+    """
+    return (
+        int(solar_time.year),
+        int(solar_time.month),
+        int(solar_time.day),
+        int(solar_time.hour),
+        int(solar_time.minute),
+        int(solar_time.second),
+    )
+
 
 class BaziEngine:
     """
@@ -63,6 +92,39 @@ class BaziEngine:
         """
         初始化.
         """
+        # 预计算六十甲子对象（纳音、旬、空亡），排盘时直接查表
+        self._sixty_cycles: Dict[Tuple[str, str], SixtyCycle] = {}
+        for i in range(60):
+            gan_name, zhi_name = GAN[i % 10], ZHI[i % 12]
+            self._sixty_cycles[(gan_name, zhi_name)] = self._build_sixty_cycle(
+                gan_name, zhi_name
+            )
+
+        # 转换结果缓存
+        self._lunar_time_cache = lru_cache(maxsize=_CONVERSION_CACHE_SIZE)(
+            self._solar_to_lunar
+        )
+        self._eight_char_cache = lru_cache(maxsize=_CONVERSION_CACHE_SIZE)(
+            self._build_eight_char
+        )
+        self._calendar_cache = lru_cache(maxsize=_CONVERSION_CACHE_SIZE)(
+            self._get_chinese_calendar
+        )
+
+    def get_lunar(self, solar_time: SolarTime) -> Lunar:
+        """
+        获取公历时间对应的 lunar_python 农历对象（带缓存）
+        """
+        return _lunar_from_solar(*_solar_key(solar_time))
+
+    def clear_cache(self):
+        """
+        清空转换缓存.
+        """
+        _lunar_from_solar.cache_clear()
+        self._lunar_time_cache.cache_clear()
+        self._eight_char_cache.cache_clear()
+        self._calendar_cache.cache_clear()
 
     def parse_solar_time(self, iso_date: str) -> SolarTime:
         """
@@ -138,17 +200,12 @@ class BaziEngine:
         """
         公历转农历 - 增强闰月处理.
         """
+        return self._lunar_time_cache(_solar_key(solar_time))
+
+    def _solar_to_lunar(self, key: Tuple[int, ...]) -> LunarTime:
         try:
             # 使用lunar-python进行真正的公历农历转换
-            solar = Solar.fromYmdHms(
-                solar_time.year,
-                solar_time.month,
-                solar_time.day,
-                solar_time.hour,
-                solar_time.minute,
-                solar_time.second,
-            )
-            lunar = solar.getLunar()
+            lunar = _lunar_from_solar(*key)
 
             # 判断是否为闰月
             is_leap = lunar.isLeap() if hasattr(lunar, "isLeap") else False
@@ -215,18 +272,12 @@ class BaziEngine:
         """
         构建八字.
         """
+        return self._eight_char_cache(_solar_key(solar_time))
+
+    def _build_eight_char(self, key: Tuple[int, ...]) -> EightChar:
         try:
             # 使用lunar-python计算八字
-            solar = Solar.fromYmdHms(
-                solar_time.year,
-                solar_time.month,
-                solar_time.day,
-                solar_time.hour,
-                solar_time.minute,
-                solar_time.second,
-            )
-            lunar = solar.getLunar()
-            bazi = lunar.getEightChar()
+            bazi = _lunar_from_solar(*key).getEightChar()
 
             # 获取年柱
             year_gan = bazi.getYearGan()
@@ -255,6 +306,15 @@ class BaziEngine:
             raise ValueError(f"构建八字失败: {e}")
 
     def _create_sixty_cycle(self, gan_name: str, zhi_name: str) -> SixtyCycle:
+        """
+        获取六十甲子对象（查预计算表）
+        """
+        cycle = self._sixty_cycles.get((gan_name, zhi_name))
+        if cycle is None:
+            cycle = self._build_sixty_cycle(gan_name, zhi_name)
+        return cycle
+
+    def _build_sixty_cycle(self, gan_name: str, zhi_name: str) -> SixtyCycle:
         """
         创建六十甲子对象.
         """
@@ -286,14 +346,10 @@ class BaziEngine:
         """
         获取纳音.
         """
-        from .professional_data import get_nayin
-
         return get_nayin(gan, zhi)
 
     def _get_ten(self, gan: str, zhi: str) -> str:
         """获取旬 - 使用六十甲子旬空算法"""
-        from .professional_data import GAN, ZHI
-
         try:
             # 使用标准的六十甲子计算方法
             gan_idx = GAN.index(gan)
@@ -321,8 +377,6 @@ class BaziEngine:
 
     def _get_kong_wang(self, gan: str, zhi: str) -> List[str]:
         """获取空亡 - 使用传统旬空算法"""
-        from .professional_data import GAN, ZHI
-
         try:
             gan_idx = GAN.index(gan)
             zhi_idx = ZHI.index(zhi)
@@ -377,16 +431,13 @@ class BaziEngine:
                 now.year, now.month, now.day, now.hour, now.minute, now.second
             )
 
+        return self._calendar_cache(_solar_key(solar_time))
+
+    def _get_chinese_calendar(self, key: Tuple[int, ...]) -> ChineseCalendar:
+        solar_time = SolarTime(*key)
         try:
-            solar = Solar.fromYmdHms(
-                solar_time.year,
-                solar_time.month,
-                solar_time.day,
-                solar_time.hour,
-                solar_time.minute,
-                solar_time.second,
-            )
-            lunar = solar.getLunar()
+            lunar = _lunar_from_solar(*key)
+            solar = lunar.getSolar()
 
             # 获取详细信息
             bazi = lunar.getEightChar()
@@ -457,15 +508,8 @@ class BaziEngine:
         获取详细的农历信息.
         """
         try:
-            solar = Solar.fromYmdHms(
-                solar_time.year,
-                solar_time.month,
-                solar_time.day,
-                solar_time.hour,
-                solar_time.minute,
-                solar_time.second,
-            )
-            lunar = solar.getLunar()
+            lunar = self.get_lunar(solar_time)
+            solar = lunar.getSolar()
 
             # 获取节气信息
             current_jieqi = lunar.getJieQi()
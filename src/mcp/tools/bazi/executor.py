@@ -0,0 +1,146 @@
+"""
+八字计算执行器.
+
+八字排盘、婚姻分析都是纯 Python 的 CPU 密集计算，直接在事件循环中执行会卡住
+音频播放和唤醒词检测。执行器按配置将这些计算放到进程池（默认）、线程池或当前
+线程中执行，进程池中的工作进程在启动时预热（加载 lunar_python 数据表、构建引擎单例）。
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from src.utils.config_manager import ConfigManager
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# 执行模式
+MODE_PROCESS = "process"
+MODE_THREAD = "thread"
+MODE_INLINE = "inline"
+
+
+def _warm_up_worker():
+    """
+    工作进程初始化：构建引擎/计算器单例并完成一次排盘，预加载农历数据表.
+    """
+    from .bazi_calculator import get_bazi_calculator
+    from .calendar_index import get_calendar_index
+    from .marriage_analyzer import get_marriage_analyzer
+
+    calculator = get_bazi_calculator()
+    get_calendar_index()
+    get_marriage_analyzer()
+    try:
+        calculator.build_bazi(solar_datetime="2000-01-01 12:00:00", gender=1)
+    except Exception:
+        # 预热失败不影响后续实际计算
+        pass
+
+
+def _ping() -> bool:
+    return True
+
+
+class BaziExecutor:
+    """
+    八字计算执行器.
+    """
+
+    def __init__(self):
+        config = ConfigManager.get_instance()
+        self.mode = config.get_config("BAZI_OPTIONS.EXECUTION_MODE", MODE_PROCESS)
+        self.max_workers = max(1, int(config.get_config("BAZI_OPTIONS.MAX_WORKERS", 1)))
+        if self.mode not in (MODE_PROCESS, MODE_THREAD, MODE_INLINE):
+            logger.warning(f"未知的八字执行模式 {self.mode}，使用进程池")
+            self.mode = MODE_PROCESS
+
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self.mode == MODE_INLINE:
+            return None
+
+        if self._executor is None:
+            if self.mode == MODE_PROCESS:
+                # 统一使用 spawn：主进程已有音频/Qt线程，fork 不安全
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_up_worker,
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="bazi"
+                )
+            logger.info(f"八字执行器已创建: {self.mode}, workers={self.max_workers}")
+        return self._executor
+
+    def prewarm(self):
+        """
+        提前拉起工作进程（非阻塞），首次工具调用无需等待进程启动与数据加载.
+        """
+        if self.mode != MODE_PROCESS:
+            return
+        try:
+            self._get_executor().submit(_ping)
+        except Exception as e:
+            logger.warning(f"八字工作进程预热失败，将回退到线程池: {e}")
+            self._fallback_to_thread()
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        在执行器中运行同步函数并异步返回结果（func 须为模块级函数以便跨进程传递）
+        """
+        executor = self._get_executor()
+        if executor is None:
+            return func(*args)
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(executor, func, *args)
+        except BrokenProcessPool as e:
+            # 工作进程异常退出（被杀、打包环境不支持多进程等）
+            logger.warning(f"八字工作进程不可用，回退到线程池: {e}")
+            self._fallback_to_thread()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+
+    def _fallback_to_thread(self):
+        old = self._executor
+        self._executor = None
+        self.mode = MODE_THREAD
+        if old is not None:
+            old.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        """
+        关闭执行器.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            logger.info("八字执行器已关闭")
+
+
+_bazi_executor = None
+
+
+def get_bazi_executor() -> BaziExecutor:
+    """
+    获取八字执行器单例.
+    """
+    global _bazi_executor
+    if _bazi_executor is None:
+        _bazi_executor = BaziExecutor()
+    return _bazi_executor
+
+
+def shutdown_bazi_executor():
+    """
+    关闭八字执行器（若已创建）
+    """
+    if _bazi_executor is not None:
+        _bazi_executor.shutdown()
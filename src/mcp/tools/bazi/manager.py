@@ -252,6 +252,11 @@ class BaziManager:
             )
         )
 
+        # 提前拉起八字计算工作进程，避免首次调用等待进程启动
+        from .executor import get_bazi_executor
+
+        get_bazi_executor().prewarm()
+
 
 # 全局管理器实例
 _bazi_manager = None
@@ -8,11 +8,93 @@ from typing import Any, Dict, List
 from src.utils.logging_config import get_logger
 
 from .bazi_calculator import get_bazi_calculator
+from .executor import get_bazi_executor
 from .marriage_analyzer import get_marriage_analyzer
 
 logger = get_logger(__name__)
 
 
+def _marriage_timing_sync(
+    solar_datetime: str,
+    lunar_datetime: str,
+    gender: int,
+    eight_char_provider_sect: int,
+) -> Dict[str, Any]:
+    """
+    婚姻时机分析（在八字执行器中运行）
+    """
+    # 先获取基础八字信息
+    calculator = get_bazi_calculator()
+    bazi_result = calculator.build_bazi(
+        solar_datetime=solar_datetime,
+        lunar_datetime=lunar_datetime,
+        gender=gender,
+        eight_char_provider_sect=eight_char_provider_sect,
+    )
+
+    # 进行婚姻专项分析
+    marriage_analyzer = get_marriage_analyzer()
+
+    # 构建适合婚姻分析的八字数据格式
+    eight_char_dict = {
+        "year": bazi_result.year_pillar,
+        "month": bazi_result.month_pillar,
+        "day": bazi_result.day_pillar,
+        "hour": bazi_result.hour_pillar,
+    }
+
+    marriage_analysis = marriage_analyzer.analyze_marriage_timing(
+        eight_char_dict, gender
+    )
+
+    # 合并结果
+    return {
+        "basic_info": {
+            "八字": bazi_result.bazi,
+            "性别": "男" if gender == 1 else "女",
+            "日主": bazi_result.day_master,
+            "生肖": bazi_result.zodiac,
+        },
+        "marriage_analysis": marriage_analysis,
+    }
+
+
+def _marriage_compatibility_sync(
+    male_solar: str, male_lunar: str, female_solar: str, female_lunar: str
+) -> Dict[str, Any]:
+    """
+    合婚分析（在八字执行器中运行）
+    """
+    calculator = get_bazi_calculator()
+
+    # 获取男方八字
+    male_bazi = calculator.build_bazi(
+        solar_datetime=male_solar, lunar_datetime=male_lunar, gender=1
+    )
+
+    # 获取女方八字
+    female_bazi = calculator.build_bazi(
+        solar_datetime=female_solar, lunar_datetime=female_lunar, gender=0
+    )
+
+    # 进行合婚分析
+    compatibility_result = _analyze_compatibility(male_bazi, female_bazi)
+
+    return {
+        "male_info": {
+            "八字": male_bazi.bazi,
+            "日主": male_bazi.day_master,
+            "生肖": male_bazi.zodiac,
+        },
+        "female_info": {
+            "八字": female_bazi.bazi,
+            "日主": female_bazi.day_master,
+            "生肖": female_bazi.zodiac,
+        },
+        "compatibility": compatibility_result,
+    }
+
+
 async def analyze_marriage_timing(args: Dict[str, Any]) -> str:
     """
     分析婚姻时机和配偶信息.
@@ -32,41 +114,14 @@ async def analyze_marriage_timing(args: Dict[str, Any]) -> str:
                 ensure_ascii=False,
             )
 
-        # 先获取基础八字信息
-        calculator = get_bazi_calculator()
-        bazi_result = calculator.build_bazi(
-            solar_datetime=solar_datetime,
-            lunar_datetime=lunar_datetime,
-            gender=gender,
-            eight_char_provider_sect=eight_char_provider_sect,
+        result = await get_bazi_executor().run(
+            _marriage_timing_sync,
+            solar_datetime,
+            lunar_datetime,
+            gender,
+            eight_char_provider_sect,
         )
 
-        # 进行婚姻专项分析
-        marriage_analyzer = get_marriage_analyzer()
-
-        # 构建适合婚姻分析的八字数据格式
-        eight_char_dict = {
-            "year": bazi_result.year_pillar,
-            "month": bazi_result.month_pillar,
-            "day": bazi_result.day_pillar,
-            "hour": bazi_result.hour_pillar,
-        }
-
-        marriage_analysis = marriage_analyzer.analyze_marriage_timing(
-            eight_char_dict, gender
-        )
-
-        # 合并结果
-        result = {
-            "basic_info": {
-                "八字": bazi_result.bazi,
-                "性别": "男" if gender == 1 else "女",
-                "日主": bazi_result.day_master,
-                "生肖": bazi_result.zodiac,
-            },
-            "marriage_analysis": marriage_analysis,
-        }
-
         return json.dumps(
             {"success": True, "data": result}, ensure_ascii=False, indent=2
         )
@@ -101,35 +156,14 @@ async def analyze_marriage_compatibility(args: Dict[str, Any]) -> str:
                 ensure_ascii=False,
             )
 
-        calculator = get_bazi_calculator()
-
-        # 获取男方八字
-        male_bazi = calculator.build_bazi(
-            solar_datetime=male_solar, lunar_datetime=male_lunar, gender=1
+        result = await get_bazi_executor().run(
+            _marriage_compatibility_sync,
+            male_solar,
+            male_lunar,
+            female_solar,
+            female_lunar,
         )
 
-        # 获取女方八字
-        female_bazi = calculator.build_bazi(
-            solar_datetime=female_solar, lunar_datetime=female_lunar, gender=0
-        )
-
-        # 进行合婚分析
-        compatibility_result = _analyze_compatibility(male_bazi, female_bazi)
-
-        result = {
-            "male_info": {
-                "八字": male_bazi.bazi,
-                "日主": male_bazi.day_master,
-                "生肖": male_bazi.zodiac,
-            },
-            "female_info": {
-                "八字": female_bazi.bazi,
-                "日主": female_bazi.day_master,
-                "生肖": female_bazi.zodiac,
-            },
-            "compatibility": compatibility_result,
-        }
-
         return json.dumps(
             {"success": True, "data": result}, ensure_ascii=False, indent=2
         )
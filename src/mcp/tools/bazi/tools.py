@@ -9,10 +9,30 @@ from src.utils.logging_config import get_logger
 
 from .bazi_calculator import get_bazi_calculator
 from .engine import get_bazi_engine
+from .executor import get_bazi_executor
 
 logger = get_logger(__name__)
 
 
+def _build_bazi_dict(
+    solar_datetime: str,
+    lunar_datetime: str,
+    gender: int,
+    eight_char_provider_sect: int,
+) -> Dict[str, Any]:
+    """
+    排盘并转换为字典（在八字执行器中运行）
+    """
+    calculator = get_bazi_calculator()
+    result = calculator.build_bazi(
+        solar_datetime=solar_datetime,
+        lunar_datetime=lunar_datetime,
+        gender=gender,
+        eight_char_provider_sect=eight_char_provider_sect,
+    )
+    return result.to_dict()
+
+
 async def get_bazi_detail(args: Dict[str, Any]) -> str:
     """
     根据时间（公历或农历）、性别来获取八字信息。
@@ -32,16 +52,16 @@ async def get_bazi_detail(args: Dict[str, Any]) -> str:
                 ensure_ascii=False,
             )
 
-        calculator = get_bazi_calculator()
-        result = calculator.build_bazi(
-            solar_datetime=solar_datetime,
-            lunar_datetime=lunar_datetime,
-            gender=gender,
-            eight_char_provider_sect=eight_char_provider_sect,
+        result = await get_bazi_executor().run(
+            _build_bazi_dict,
+            solar_datetime,
+            lunar_datetime,
+            gender,
+            eight_char_provider_sect,
         )
 
         return json.dumps(
-            {"success": True, "data": result.to_dict()}, ensure_ascii=False, indent=2
+            {"success": True, "data": result}, ensure_ascii=False, indent=2
         )
 
     except Exception as e:
@@ -123,18 +143,15 @@ async def build_bazi_from_lunar_datetime(args: Dict[str, Any]) -> str:
                 ensure_ascii=False,
             )
 
-        calculator = get_bazi_calculator()
-        result = calculator.build_bazi(
-            lunar_datetime=lunar_datetime,
-            gender=gender,
-            eight_char_provider_sect=eight_char_provider_sect,
+        result = await get_bazi_executor().run(
+            _build_bazi_dict, None, lunar_datetime, gender, eight_char_provider_sect
         )
 
         return json.dumps(
             {
                 "success": True,
                 "message": "此方法已弃用，请使用get_bazi_detail",
-                "data": result.to_dict(),
+                "data": result,
             },
             ensure_ascii=False,
             indent=2,
@@ -163,18 +180,15 @@ async def build_bazi_from_solar_datetime(args: Dict[str, Any]) -> str:
                 ensure_ascii=False,
             )
 
-        calculator = get_bazi_calculator()
-        result = calculator.build_bazi(
-            solar_datetime=solar_datetime,
-            gender=gender,
-            eight_char_provider_sect=eight_char_provider_sect,
+        result = await get_bazi_executor().run(
+            _build_bazi_dict, solar_datetime, None, gender, eight_char_provider_sect
         )
 
         return json.dumps(
             {
                 "success": True,
                 "message": "此方法已弃用，请使用get_bazi_detail",
-                "data": result.to_dict(),
+                "data": result,
             },
             ensure_ascii=False,
             indent=2,
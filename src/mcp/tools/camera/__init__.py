@@ -2,6 +2,8 @@
 Camera tool for MCP.
 """
 
+import asyncio
+
 from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
 
@@ -29,7 +31,7 @@ def get_camera_instance():
     return NormalCamera.get_instance()
 
 
-def take_photo(arguments: dict) -> str:
+async def take_photo(arguments: dict) -> str:
     """
     拍照并分析的工具函数.
     """
@@ -39,12 +41,12 @@ def take_photo(arguments: dict) -> str:
     question = arguments.get("question", "")
     logger.info(f"Taking photo with question: {question}")
 
-    # 拍照
-    success = camera.capture()
+    # 拍照（读取摄像头和JPEG编码在线程中执行）
+    success = await asyncio.to_thread(camera.capture)
     if not success:
         logger.error("Failed to capture photo")
         return '{"success": false, "message": "Failed to capture photo"}'
 
     # 分析图片
     logger.info("Photo captured, starting analysis...")
-    return camera.analyze(question)
+    return await camera.analyze(question)
@@ -39,11 +39,17 @@ class BaseCamera(ABC):
         """
 
     @abstractmethod
-    def analyze(self, question: str) -> str:
+    async def analyze_image(self, image: bytes, question: str) -> str:
         """
-        分析图像.
+        分析给定的JPEG图像.
         """
 
+    async def analyze(self, question: str) -> str:
+        """
+        分析最近一次捕获的图像.
+        """
+        return await self.analyze_image(self.jpeg_data["buf"], question)
+
     def get_jpeg_data(self) -> Dict[str, any]:
         """
         获取JPEG数据.
@@ -6,6 +6,8 @@ import requests
 from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
 
+from .capture_service import get_capture_service
+
 logger = get_logger(__name__)
 
 
@@ -61,22 +63,11 @@ class Camera:
         try:
             logger.info("Accessing camera...")
 
-            # 尝试打开摄像头
-            cap = cv2.VideoCapture(self.camera_index)
-            if not cap.isOpened():
-                logger.error(f"Cannot open camera at index {self.camera_index}")
-                return False
-
-            # 设置摄像头参数
-            cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.frame_width)
-            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.frame_height)
-
-            # 读取图像
-            ret, frame = cap.read()
-            cap.release()
-
-            if not ret:
-                logger.error("Failed to capture image")
+            # 从常驻采集服务获取最新一帧（设备保持打开，无需重复预热）
+            frame = get_capture_service().capture_frame(
+                self.camera_index, self.frame_width, self.frame_height
+            )
+            if frame is None:
                 return False
 
             # 获取原始图像尺寸
@@ -0,0 +1,282 @@
+"""
+Persistent camera capture service.
+
+每次拍照都重新打开摄像头需要经历设备打开、自动曝光收敛和驱动协商（通常 0.5~2 秒），
+而且第一帧往往偏暗。该服务在视觉会话期间保持设备打开，由后台线程持续抓帧到单槽缓冲区，
+拍照时直接取最新一帧；空闲超时后自动释放设备。
+"""
+
+import threading
+import time
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from src.utils.config_manager import ConfigManager
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class CameraCaptureService:
+    """
+    摄像头常驻采集服务（单例）
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    # 打开设备后丢弃的预热时长/帧数，等待自动曝光收敛
+    WARMUP_SECONDS = 0.4
+    WARMUP_FRAMES = 5
+
+    def __init__(self):
+        config = ConfigManager.get_instance()
+        # 空闲多少秒后释放设备；0 表示不常驻，每次拍照单独打开
+        self.keep_alive_seconds = float(
+            config.get_config("CAMERA.keep_alive_seconds", 30)
+        )
+
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        # 当前设备参数；每次打开设备的会话有独立的代号，旧线程只在代号一致时才写共享状态
+        self._device: Optional[Tuple[int, int, int]] = None
+        self._generation = 0
+
+        # 单槽最新帧缓冲
+        self._frame: Optional[np.ndarray] = None
+        self._frame_seq = 0
+        self._ready = False
+        self._error: Optional[str] = None
+        self._last_request = 0.0
+
+    @classmethod
+    def get_instance(cls):
+        """
+        获取单例实例.
+        """
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def capture_frame(
+        self, camera_index: int, width: int, height: int, timeout: float = 3.0
+    ) -> Optional[np.ndarray]:
+        """获取一帧图像（BGR）
+
+        常驻模式下返回后台线程抓到的最新一帧，首次调用会等待设备打开并完成预热。
+
+        Returns:
+            图像帧，失败时返回 None
+        """
+        if self.keep_alive_seconds <= 0:
+            return self._capture_once(camera_index, width, height)
+
+        device = (camera_index, width, height)
+        with self._cond:
+            self._last_request = time.monotonic()
+            if self._device != device and self._running:
+                # 设备参数变化：停止旧线程后重新打开
+                self._stop_locked()
+            if not self._running:
+                self._start_locked(device)
+            generation = self._generation
+
+            # 等待预热完成后的一帧新画面
+            seq = self._frame_seq
+            deadline = time.monotonic() + timeout
+            while (
+                self._running
+                and self._generation == generation
+                and (not self._ready or self._frame_seq == seq)
+            ):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            if self._generation != generation:
+                logger.error("Camera session changed while waiting for frame")
+                return None
+            if self._error:
+                logger.error(self._error)
+                return None
+            if not self._ready or self._frame is None:
+                logger.error("Timed out waiting for camera frame")
+                return None
+            return self._frame.copy()
+
+    def release(self):
+        """
+        立即释放摄像头（例如设置界面需要独占预览时）
+        """
+        with self._cond:
+            self._stop_locked()
+        thread = self._thread
+        if thread and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=2.0)
+
+    def is_active(self) -> bool:
+        """
+        设备当前是否处于常驻打开状态.
+        """
+        return self._running
+
+    def _start_locked(self, device: Tuple[int, int, int]):
+        self._generation += 1
+        self._device = device
+        self._frame = None
+        self._ready = False
+        self._error = None
+        self._running = True
+        # 旧线程可能仍持有设备，新线程打开设备前先等它释放
+        previous = self._thread
+        self._thread = threading.Thread(
+            target=self._capture_loop,
+            args=(device, self._generation, previous),
+            name="CameraCapture",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _stop_locked(self):
+        # 作废当前会话，旧线程退出时不再改动共享状态
+        self._generation += 1
+        self._running = False
+        self._device = None
+        self._frame = None
+        self._ready = False
+        self._cond.notify_all()
+
+    def _end_session_locked(self, generation: int, error: Optional[str] = None):
+        """
+        抓帧线程自行结束会话（打开失败、连续读取失败、空闲超时）
+        """
+        if self._generation != generation:
+            return
+        if error:
+            self._error = error
+        self._running = False
+        self._device = None
+        self._cond.notify_all()
+
+    def _capture_loop(
+        self,
+        device: Tuple[int, int, int],
+        generation: int,
+        previous: Optional[threading.Thread] = None,
+    ):
+        """
+        后台抓帧线程：持续读取最新帧，空闲超时后释放设备.
+        """
+        if previous is not None and previous.is_alive():
+            previous.join(timeout=2.0)
+
+        with self._cond:
+            if self._generation != generation:
+                return
+
+        camera_index, width, height = device
+        cap = self._open(camera_index, width, height)
+        if cap is None:
+            with self._cond:
+                self._end_session_locked(
+                    generation, f"Cannot open camera at index {camera_index}"
+                )
+            return
+
+        logger.info(f"Camera capture service started (index {camera_index})")
+        opened_at = time.monotonic()
+        frames = 0
+        failures = 0
+        try:
+            while True:
+                with self._cond:
+                    if self._generation != generation:
+                        break
+                    if time.monotonic() - self._last_request > self.keep_alive_seconds:
+                        logger.info("Camera idle timeout, releasing device")
+                        self._end_session_locked(generation)
+                        break
+
+                ret, frame = cap.read()
+                if not ret:
+                    failures += 1
+                    if failures >= 10:
+                        with self._cond:
+                            self._end_session_locked(
+                                generation, "Failed to capture image"
+                            )
+                        break
+                    time.sleep(0.05)
+                    continue
+                failures = 0
+                frames += 1
+
+                with self._cond:
+                    if self._generation != generation:
+                        break
+                    self._frame = frame
+                    self._frame_seq += 1
+                    if not self._ready and (
+                        frames >= self.WARMUP_FRAMES
+                        and time.monotonic() - opened_at >= self.WARMUP_SECONDS
+                    ):
+                        self._ready = True
+                    self._cond.notify_all()
+        finally:
+            cap.release()
+            with self._cond:
+                if self._generation == generation:
+                    self._ready = False
+                    self._frame = None
+                self._cond.notify_all()
+            logger.info("Camera capture service stopped")
+
+    def _capture_once(
+        self, camera_index: int, width: int, height: int
+    ) -> Optional[np.ndarray]:
+        """
+        单次拍照：打开设备、丢弃预热帧、读取一帧后释放.
+        """
+        cap = self._open(camera_index, width, height)
+        if cap is None:
+            logger.error(f"Cannot open camera at index {camera_index}")
+            return None
+        try:
+            ret, frame = False, None
+            deadline = time.monotonic() + self.WARMUP_SECONDS
+            for i in range(self.WARMUP_FRAMES + 1):
+                ret, frame = cap.read()
+                if i >= 1 and time.monotonic() >= deadline:
+                    break
+            if not ret:
+                logger.error("Failed to capture image")
+                return None
+            return frame
+        finally:
+            cap.release()
+
+    @staticmethod
+    def _open(camera_index: int, width: int, height: int):
+        cap = cv2.VideoCapture(camera_index)
+        if not cap.isOpened():
+            cap.release()
+            return None
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        # 尽量减小驱动缓冲，保证取到的是最新画面
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return cap
+
+
+def get_capture_service() -> CameraCaptureService:
+    """
+    获取摄像头采集服务单例.
+    """
+    return CameraCaptureService.get_instance()
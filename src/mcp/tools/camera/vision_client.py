@@ -0,0 +1,234 @@
+"""
+Async vision explain client.
+
+拍照/截图分析原先在工具调用中用 requests 同步上传，既阻塞事件循环，又每次新建连接。
+该客户端复用一个带 keep-alive 连接池的 aiohttp 会话，直接接收图像字节上传，
+并负责按配置压缩 JPEG；服务端返回 413 时自动降低分辨率重试一次。
+"""
+
+import asyncio
+import json
+from typing import Optional
+
+import aiohttp
+import cv2
+import numpy as np
+
+from src.utils.config_manager import ConfigManager
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def encode_jpeg(frame: np.ndarray, max_side: int, quality: int) -> Optional[bytes]:
+    """将图像帧等比缩放到最长边不超过 max_side 后编码为 JPEG.
+
+    Returns:
+        JPEG 字节数据，编码失败返回 None
+    """
+    height, width = frame.shape[:2]
+    longest = max(height, width)
+    if max_side > 0 and longest > max_side:
+        scale = max_side / longest
+        frame = cv2.resize(
+            frame,
+            (int(width * scale), int(height * scale)),
+            interpolation=cv2.INTER_AREA,
+        )
+
+    success, jpeg_data = cv2.imencode(
+        ".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), int(quality)]
+    )
+    if not success:
+        return None
+    return jpeg_data.tobytes()
+
+
+def shrink_jpeg(data: bytes, max_side: int, quality: int) -> bytes:
+    """
+    将已编码的 JPEG 缩放到最长边不超过 max_side，无需缩放或解码失败时原样返回.
+    """
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None or max(image.shape[:2]) <= max_side:
+        return data
+    return encode_jpeg(image, max_side, quality) or data
+
+
+def _halve_jpeg(data: bytes, quality: int) -> bytes:
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        return data
+    return encode_jpeg(image, max(160, max(image.shape[:2]) // 2), quality) or data
+
+
+def _error(message: str) -> str:
+    return json.dumps({"success": False, "message": message}, ensure_ascii=False)
+
+
+class VisionClient:
+    """
+    视觉解释服务客户端（单例）
+    """
+
+    def __init__(self):
+        config = ConfigManager.get_instance()
+        self.explain_url = ""
+        self.explain_token = ""
+
+        self._load_options(config)
+        # 设置窗口修改摄像头配置后重新读取（超时时间在下次新建连接池时生效）
+        config.subscribe("CAMERA", lambda path, value: self._load_options(config))
+
+        # 每次请求都会读取的请求头字段
+        self._device_id = config.accessor("SYSTEM_OPTIONS.DEVICE_ID")
+        self._client_id = config.accessor("SYSTEM_OPTIONS.CLIENT_ID")
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _load_options(self, config: ConfigManager):
+        self.timeout = float(config.get_config("CAMERA.vision_timeout", 15))
+        self.jpeg_quality = int(config.get_config("CAMERA.vision_jpeg_quality", 85))
+        self.max_side = int(config.get_config("CAMERA.vision_max_side", 320))
+        self.screenshot_max_side = int(
+            config.get_config("CAMERA.screenshot_max_side", 1920)
+        )
+
+    def set_explain_url(self, url: str):
+        """
+        设置解释服务的URL.
+        """
+        self.explain_url = url
+        logger.info(f"Vision service URL set to: {url}")
+
+    def set_explain_token(self, token: str):
+        """
+        设置解释服务的token.
+        """
+        self.explain_token = token
+        if token:
+            logger.info("Vision service token has been set")
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        获取（必要时创建）绑定当前事件循环的连接池会话.
+        """
+        loop = asyncio.get_running_loop()
+        if (
+            self._session is None
+            or self._session.closed
+            or self._session_loop is not loop
+        ):
+            connector = aiohttp.TCPConnector(
+                limit=4, keepalive_timeout=60, ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(
+                    total=self.timeout, sock_connect=min(5.0, self.timeout)
+                ),
+            )
+            self._session_loop = loop
+        return self._session
+
+    def _build_headers(self) -> dict:
+        headers = {
+            "Device-Id": self._device_id.get(),
+            "Client-Id": self._client_id.get(),
+        }
+        if self.explain_token:
+            headers["Authorization"] = f"Bearer {self.explain_token}"
+        # aiohttp 不接受值为 None 的请求头
+        return {key: value for key, value in headers.items() if value}
+
+    async def explain(
+        self, image: bytes, question: str, filename: str = "camera.jpg"
+    ) -> str:
+        """上传图像并返回解释服务的响应文本.
+
+        Args:
+            image: JPEG 字节数据
+            question: 用户问题
+            filename: 上传文件名
+
+        Returns:
+            服务端返回的 JSON 字符串，失败时返回 success=false 的 JSON
+        """
+        if not self.explain_url:
+            return _error("Image explain URL is not set")
+        if not image:
+            return _error("Camera buffer is empty")
+
+        try:
+            status, text = await self._post(image, question, filename)
+
+            # 图片过大：降低分辨率和质量后重试一次
+            if status == 413:
+                smaller = await asyncio.to_thread(
+                    _halve_jpeg, image, max(50, self.jpeg_quality - 15)
+                )
+                if len(smaller) < len(image):
+                    logger.warning(
+                        f"Image rejected as too large ({len(image)} bytes), "
+                        f"retrying with {len(smaller)} bytes"
+                    )
+                    image = smaller
+                    status, text = await self._post(image, question, filename)
+
+            if status != 200:
+                error_msg = f"Failed to upload photo, status code: {status}"
+                logger.error(error_msg)
+                return _error(error_msg)
+
+            logger.info(f"Explain image size={len(image)}, question={question}\n{text}")
+            return text
+
+        except asyncio.TimeoutError:
+            error_msg = f"Explain request timed out after {self.timeout:.0f}s"
+            logger.error(error_msg)
+            return _error(error_msg)
+        except aiohttp.ClientError as e:
+            error_msg = f"Failed to connect to explain URL: {str(e)}"
+            logger.error(error_msg)
+            return _error(error_msg)
+
+    async def _post(self, image: bytes, question: str, filename: str):
+        form = aiohttp.FormData()
+        form.add_field("question", question)
+        form.add_field("file", image, filename=filename, content_type="image/jpeg")
+
+        session = self._get_session()
+        async with session.post(
+            self.explain_url, headers=self._build_headers(), data=form
+        ) as response:
+            return response.status, await response.text()
+
+    async def close(self):
+        """
+        关闭连接池会话.
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
+
+_vision_client = None
+
+
+def get_vision_client() -> VisionClient:
+    """
+    获取视觉解释客户端单例.
+    """
+    global _vision_client
+    if _vision_client is None:
+        _vision_client = VisionClient()
+    return _vision_client
+
+
+async def close_vision_client():
+    """
+    关闭视觉解释客户端（若已创建）
+    """
+    if _vision_client is not None:
+        await _vision_client.close()
@@ -2,15 +2,17 @@
 VL camera implementation using Zhipu AI.
 """
 
+import asyncio
 import base64
 
-import cv2
 from openai import OpenAI
 
 from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
 
 from .base_camera import BaseCamera
+from .capture_service import get_capture_service
+from .vision_client import encode_jpeg, get_vision_client
 
 logger = get_logger(__name__)
 
@@ -36,6 +38,7 @@ class VLCamera(BaseCamera):
                 "CAMERA.Local_VL_url",
                 "https://open.bigmodel.cn/api/paas/v4/chat/completions",
             ),
+            timeout=get_vision_client().timeout,
         )
         self.model = config.get_config("CAMERA.models", "glm-4v-plus")
         logger.info(f"VL Camera initialized with model: {self.model}")
@@ -58,48 +61,22 @@ class VLCamera(BaseCamera):
         try:
             logger.info("Accessing camera...")
 
-            # 尝试打开摄像头
-            cap = cv2.VideoCapture(self.camera_index)
-            if not cap.isOpened():
-                logger.error(f"Cannot open camera at index {self.camera_index}")
-                return False
-
-            # 设置摄像头参数
-            cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.frame_width)
-            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.frame_height)
-
-            # 读取图像
-            ret, frame = cap.read()
-            cap.release()
-
-            if not ret:
-                logger.error("Failed to capture image")
+            # 从常驻采集服务获取最新一帧（设备保持打开，无需重复预热）
+            frame = get_capture_service().capture_frame(
+                self.camera_index, self.frame_width, self.frame_height
+            )
+            if frame is None:
                 return False
 
-            # 获取原始图像尺寸
-            height, width = frame.shape[:2]
-
-            # 计算缩放比例，使最长边为320
-            max_dim = max(height, width)
-            scale = 320 / max_dim if max_dim > 320 else 1.0
-
-            # 等比例缩放图像
-            if scale < 1.0:
-                new_width = int(width * scale)
-                new_height = int(height * scale)
-                frame = cv2.resize(
-                    frame, (new_width, new_height), interpolation=cv2.INTER_AREA
-                )
-
-            # 直接将图像编码为JPEG字节流
-            success, jpeg_data = cv2.imencode(".jpg", frame)
-
-            if not success:
+            # 按配置等比缩放并编码为JPEG字节流
+            client = get_vision_client()
+            jpeg_data = encode_jpeg(frame, client.max_side, client.jpeg_quality)
+            if jpeg_data is None:
                 logger.error("Failed to encode image to JPEG")
                 return False
 
             # 保存字节数据
-            self.set_jpeg_data(jpeg_data.tobytes())
+            self.set_jpeg_data(jpeg_data)
             logger.info(
                 f"Image captured successfully (size: {self.jpeg_data['len']} bytes)"
             )
@@ -109,16 +86,22 @@ class VLCamera(BaseCamera):
             logger.error(f"Exception during capture: {e}")
             return False
 
-    def analyze(self, question: str) -> str:
+    async def analyze_image(self, image: bytes, question: str) -> str:
+        """
+        使用智普AI分析图像（流式请求在线程中执行，不阻塞事件循环）
+        """
+        return await asyncio.to_thread(self._analyze_sync, image, question)
+
+    def _analyze_sync(self, image: bytes, question: str) -> str:
         """
         使用智普AI分析图像.
         """
         try:
-            if not self.jpeg_data["buf"]:
+            if not image:
                 return '{"success": false, "message": "Camera buffer is empty"}'
 
             # 将图像转换为Base64
-            image_base64 = base64.b64encode(self.jpeg_data["buf"]).decode("utf-8")
+            image_base64 = base64.b64encode(image).decode("utf-8")
 
             # 准备消息
             messages = [
@@ -0,0 +1,305 @@
+"""音乐下载缓存管理.
+
+下载完成时记录文件长度与 SHA-256，命中缓存时先校验长度（截断的文件直接丢弃重新下载），
+播放时更新最近播放时间；后台整理任务校验校验和、清理残留临时文件、登记未记录的文件，
+并在缓存超出字节预算时按最近播放时间（LRU）淘汰，避免小容量存储被写满。
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from src.utils.logging_config import get_logger
+
+from .library_index import MUSIC_EXTENSIONS
+
+logger = get_logger(__name__)
+
+# 缓存记录结构版本，变化时重建表
+_SCHEMA_VERSION = 1
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_checksum(file_path: Path) -> str:
+    """
+    计算文件的 SHA-256.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class MusicCacheManager:
+    """
+    音乐缓存管理器.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_bytes: int,
+        temp_dir: Optional[Path] = None,
+        db_file: Optional[Path] = None,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.temp_dir = Path(temp_dir) if temp_dir else self.cache_dir / "temp"
+        self.db_file = Path(db_file) if db_file else self.cache_dir / "cache.db"
+        self.max_bytes = max_bytes
+
+        self._lock = threading.RLock()
+        self._ensure_database()
+
+    @contextmanager
+    def _get_connection(self):
+        """
+        获取数据库连接的上下文管理器.
+        """
+        conn = None
+        try:
+            conn = sqlite3.connect(self.db_file)
+            conn.row_factory = sqlite3.Row
+            yield conn
+            conn.commit()
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"音乐缓存记录操作失败: {e}")
+            raise
+        finally:
+            if conn:
+                conn.close()
+
+    def _ensure_database(self):
+        """
+        确保数据库和表存在，结构版本变化时重建.
+        """
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        with self._get_connection() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != _SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS entries")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_played REAL NOT NULL,
+                    verified_at REAL NOT NULL
+                )
+            """)
+            conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    # -----------------------
+    # 下载/播放路径
+    # -----------------------
+    def record(self, file_path: Path, size: int, sha256: str):
+        """
+        登记下载完成的文件（长度与校验和在下载过程中计算）
+        """
+        now = time.time()
+        with self._lock, self._get_connection() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO entries
+                    (path, size, sha256, created_at, last_played, verified_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (str(file_path), size, sha256, now, now, now),
+            )
+
+    def lookup(self, file_path: Path) -> bool:
+        """检查缓存文件是否可用.
+
+        已登记的文件只比较长度（完整校验和由后台整理任务负责）；长度不符说明文件被截断，
+        删除后返回 False。未登记的旧文件暂时信任，由后台整理任务补登记。
+        """
+        try:
+            size = file_path.stat().st_size
+        except OSError:
+            self.forget(file_path)
+            return False
+
+        with self._lock, self._get_connection() as conn:
+            row = conn.execute(
+                "SELECT size FROM entries WHERE path = ?", (str(file_path),)
+            ).fetchone()
+
+        if row is not None and row["size"] != size:
+            logger.warning(
+                f"缓存文件长度不符（{size}/{row['size']}），丢弃: {file_path.name}"
+            )
+            self._discard(file_path)
+            return False
+        return size > 0
+
+    def touch(self, file_path: Path):
+        """
+        更新最近播放时间.
+        """
+        with self._lock, self._get_connection() as conn:
+            conn.execute(
+                "UPDATE entries SET last_played = ? WHERE path = ?",
+                (time.time(), str(file_path)),
+            )
+
+    def forget(self, file_path: Path):
+        """
+        删除缓存记录（不删除文件）
+        """
+        with self._lock, self._get_connection() as conn:
+            conn.execute("DELETE FROM entries WHERE path = ?", (str(file_path),))
+
+    def total_bytes(self) -> int:
+        with self._lock, self._get_connection() as conn:
+            return conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()[0]
+
+    # -----------------------
+    # 整理与淘汰
+    # -----------------------
+    def evict(self, protect: Iterable[Path] = ()) -> List[Path]:
+        """按最近播放时间淘汰文件，直到缓存不超过字节预算.
+
+        Args:
+            protect: 不可淘汰的文件（如正在播放的歌曲）
+
+        Returns:
+            被删除的文件列表
+        """
+        protected = {str(p) for p in protect}
+        removed = []
+        with self._lock:
+            total = self.total_bytes()
+            if total <= self.max_bytes:
+                return removed
+
+            with self._get_connection() as conn:
+                rows = conn.execute(
+                    "SELECT path, size FROM entries ORDER BY last_played ASC"
+                ).fetchall()
+
+            for row in rows:
+                if total <= self.max_bytes:
+                    break
+                if row["path"] in protected:
+                    continue
+                path = Path(row["path"])
+                self._discard(path)
+                total -= row["size"]
+                removed.append(path)
+
+        if removed:
+            logger.info(
+                f"音乐缓存超出预算，已淘汰 {len(removed)} 个文件，"
+                f"当前 {total / 1024 / 1024:.1f}MB / "
+                f"{self.max_bytes / 1024 / 1024:.1f}MB"
+            )
+        return removed
+
+    def compact(
+        self, protect: Iterable[Path] = (), verify_interval: float = 7 * 24 * 3600
+    ) -> List[Path]:
+        """后台整理缓存.
+
+        1. 删除残留的临时下载文件（超过1小时未修改）
+        2. 移除文件已不存在的记录，登记未记录的文件
+        3. 对超过 verify_interval 未校验的文件重新计算校验和，不一致则删除
+        4. 按字节预算淘汰
+
+        Returns:
+            被删除的缓存文件列表（调用方据此更新音乐库索引）
+        """
+        protected = {str(p) for p in protect}
+        removed: List[Path] = []
+        now = time.time()
+
+        self._clean_stale_temp(now)
+
+        on_disk = {}
+        if self.cache_dir.exists():
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    if entry.name.lower().endswith(MUSIC_EXTENSIONS) and entry.is_file(
+                        follow_symlinks=False
+                    ):
+                        on_disk[entry.path] = entry.stat().st_size
+
+        with self._lock:
+            with self._get_connection() as conn:
+                rows = {
+                    row["path"]: row
+                    for row in conn.execute(
+                        "SELECT path, size, sha256, verified_at FROM entries"
+                    )
+                }
+
+            missing = [path for path in rows if path not in on_disk]
+            if missing:
+                with self._get_connection() as conn:
+                    conn.executemany(
+                        "DELETE FROM entries WHERE path = ?", [(p,) for p in missing]
+                    )
+
+        # 校验和计算较慢，不持有锁
+        for path, size in on_disk.items():
+            if path in protected:
+                continue
+            row = rows.get(path)
+            if row is not None and now - row["verified_at"] < verify_interval:
+                continue
+            try:
+                checksum = file_checksum(Path(path))
+            except OSError as e:
+                logger.warning(f"读取缓存文件失败: {path}, {e}")
+                continue
+
+            if row is None:
+                # 未登记的文件（旧版本下载或手动放入）直接登记
+                self.record(Path(path), size, checksum)
+            elif row["size"] != size or row["sha256"] != checksum:
+                logger.warning(f"缓存文件校验失败，删除: {Path(path).name}")
+                self._discard(Path(path))
+                removed.append(Path(path))
+            else:
+                with self._lock, self._get_connection() as conn:
+                    conn.execute(
+                        "UPDATE entries SET verified_at = ? WHERE path = ?",
+                        (now, path),
+                    )
+
+        removed.extend(self.evict(protect))
+        return removed
+
+    def _clean_stale_temp(self, now: float, max_age: float = 3600):
+        """
+        删除中断下载遗留的临时文件（正在进行的下载不会超过 max_age）
+        """
+        if not self.temp_dir.exists():
+            return
+        for file_path in self.temp_dir.glob("*"):
+            try:
+                if file_path.is_file() and now - file_path.stat().st_mtime > max_age:
+                    file_path.unlink()
+                    logger.debug(f"已删除残留临时文件: {file_path.name}")
+            except OSError as e:
+                logger.warning(f"删除临时文件失败: {file_path.name}, {e}")
+
+    def _discard(self, file_path: Path):
+        try:
+            file_path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"删除缓存文件失败: {file_path.name}, {e}")
+            return
+        self.forget(file_path)
@@ -0,0 +1,551 @@
+"""本地音乐库持久化索引.
+
+以 路径 + 修改时间 + 文件大小 为键将元数据保存在 SQLite 中，扫描时只对新增或变化的文件
+调用 mutagen 提取元数据；内存中为标题/艺术家/专辑/文件名及拼音首字母建立单字/二元组倒排
+索引，为拼音建立音节倒排索引，搜索先按倒排表求交集得到候选再逐条校验：
+- 原文按子串匹配
+- 拼音按整音节顺序匹配，只有最后一个音节允许前缀（"ai" 不会匹配 "hai"）
+- 拼音首字母只用于纯字母查询
+- 中文查询按拼音音节完全匹配同音字
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from src.utils.logging_config import get_logger
+
+# 尝试导入音乐元数据库
+try:
+    from mutagen import File as MutagenFile
+    from mutagen.id3 import ID3NoHeaderError
+
+    MUTAGEN_AVAILABLE = True
+except ImportError:
+    MUTAGEN_AVAILABLE = False
+
+# 尝试导入拼音库
+try:
+    from pypinyin import Style, lazy_pinyin
+
+    PYPINYIN_AVAILABLE = True
+except ImportError:
+    PYPINYIN_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+MUSIC_EXTENSIONS = (".mp3", ".m4a", ".flac", ".wav", ".ogg")
+
+# 索引结构版本，变化时重建表（2: 拼音按音节以空格分隔存储）
+_SCHEMA_VERSION = 2
+
+
+class MusicMetadata:
+    """
+    音乐元数据类.
+    """
+
+    def __init__(self, file_path: Path, file_size: Optional[int] = None):
+        self.file_path = file_path
+        self.filename = file_path.name
+        self.file_id = file_path.stem  # 文件名去掉扩展名，即歌曲ID
+        self.file_size = (
+            file_size if file_size is not None else file_path.stat().st_size
+        )
+
+        # 从文件提取的元数据
+        self.title = None
+        self.artist = None
+        self.album = None
+        self.duration = None  # 秒数
+
+    def extract_metadata(self) -> bool:
+        """
+        提取音乐文件元数据.
+        """
+        if not MUTAGEN_AVAILABLE:
+            return False
+
+        try:
+            audio_file = MutagenFile(self.file_path)
+            if audio_file is None:
+                return False
+
+            # 基本信息
+            if hasattr(audio_file, "info"):
+                self.duration = getattr(audio_file.info, "length", None)
+
+            # ID3标签信息
+            tags = audio_file.tags if audio_file.tags else {}
+
+            # 标题
+            self.title = self._get_tag_value(tags, ["TIT2", "TITLE", "\xa9nam"])
+
+            # 艺术家
+            self.artist = self._get_tag_value(tags, ["TPE1", "ARTIST", "\xa9ART"])
+
+            # 专辑
+            self.album = self._get_tag_value(tags, ["TALB", "ALBUM", "\xa9alb"])
+
+            return True
+
+        except ID3NoHeaderError:
+            # 没有ID3标签，不是错误
+            return True
+        except Exception as e:
+            logger.debug(f"提取元数据失败 {self.filename}: {e}")
+            return False
+
+    def _get_tag_value(self, tags: dict, tag_names: List[str]) -> Optional[str]:
+        """
+        从多个可能的标签名中获取值.
+        """
+        for tag_name in tag_names:
+            if tag_name in tags:
+                value = tags[tag_name]
+                if isinstance(value, list) and value:
+                    return str(value[0])
+                elif value:
+                    return str(value)
+        return None
+
+    def format_duration(self) -> str:
+        """
+        格式化播放时长.
+        """
+        if self.duration is None:
+            return "未知"
+
+        minutes = int(self.duration) // 60
+        seconds = int(self.duration) % 60
+        return f"{minutes:02d}:{seconds:02d}"
+
+
+def normalize_text(text: str) -> str:
+    """
+    搜索用规范化：转小写并去掉空白.
+    """
+    return "".join(text.lower().split())
+
+
+def to_pinyin(text: str) -> List[str]:
+    """
+    转为无声调全拼音节列表（非汉字按空白切分后原样保留），拼音库不可用时返回空列表.
+    """
+    if not PYPINYIN_AVAILABLE or not text:
+        return []
+    return [token for segment in lazy_pinyin(text) for token in segment.lower().split()]
+
+
+def to_initials(text: str) -> str:
+    """
+    转为拼音首字母，拼音库不可用时返回空字符串.
+    """
+    if not PYPINYIN_AVAILABLE or not text:
+        return ""
+    return normalize_text("".join(lazy_pinyin(text, style=Style.FIRST_LETTER)))
+
+
+def is_latin_letters(text: str) -> bool:
+    """
+    是否全部为 ASCII 字母（可能是拼音或拼音首字母输入）
+    """
+    return text.isascii() and text.isalpha()
+
+
+def _contains_cjk(text: str) -> bool:
+    return any("\u4e00" <= ch <= "\u9fff" for ch in text)
+
+
+def _grams(text: str) -> Set[str]:
+    """
+    文本的单字与二元组集合（单字用于单字符查询）
+    """
+    grams = set(text)
+    grams.update(text[i : i + 2] for i in range(len(text) - 1))
+    return grams
+
+
+def match_syllables(query: str, syllables: Sequence[str]) -> bool:
+    """拼音查询是否与连续的若干整音节匹配.
+
+    例如 "haik" 匹配 ["hai", "kuo"]，"ai" 不匹配 ["hai"]。
+    """
+    for start in range(len(syllables)):
+        pos = 0
+        index = start
+        while index < len(syllables):
+            syllable = syllables[index]
+            rest = query[pos:]
+            if rest.startswith(syllable):
+                pos += len(syllable)
+                index += 1
+                if pos == len(query):
+                    return True
+            elif syllable.startswith(rest):
+                # 只有最后一个音节允许前缀
+                return True
+            else:
+                break
+    return False
+
+
+class _IndexedTrack:
+    """
+    内存中的索引条目：元数据及其规范化的搜索键.
+    """
+
+    __slots__ = ("metadata", "text", "syllables", "initials")
+
+    def __init__(self, metadata: MusicMetadata, text: str, pinyin: str, initials: str):
+        self.metadata = metadata
+        self.text = text
+        self.syllables: Tuple[str, ...] = tuple(pinyin.split())
+        self.initials = initials
+
+    def gram_keys(self) -> Tuple[str, ...]:
+        """
+        建立单字/二元组倒排的键：原文、拼音首字母、连写全拼（拼音匹配的候选必然包含其二元组）
+        """
+        return tuple(
+            key for key in (self.text, self.initials, "".join(self.syllables)) if key
+        )
+
+
+class MusicLibraryIndex:
+    """
+    本地音乐库索引.
+    """
+
+    def __init__(self, music_dir: Path, db_file: Optional[Path] = None):
+        self.music_dir = Path(music_dir)
+        self.db_file = Path(db_file) if db_file else self.music_dir / "library.db"
+
+        self._lock = threading.RLock()
+        self._tracks: Dict[str, _IndexedTrack] = {}
+        # 单字/二元组 -> 路径集合
+        self._postings: Dict[str, Set[str]] = {}
+        # 拼音音节 -> 路径集合（中文查询按同音字匹配）
+        self._syllable_postings: Dict[str, Set[str]] = {}
+        self._loaded = False
+
+        self._ensure_database()
+
+    @contextmanager
+    def _get_connection(self):
+        """
+        获取数据库连接的上下文管理器.
+        """
+        conn = None
+        try:
+            conn = sqlite3.connect(self.db_file)
+            conn.row_factory = sqlite3.Row
+            yield conn
+            conn.commit()
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"音乐库索引操作失败: {e}")
+            raise
+        finally:
+            if conn:
+                conn.close()
+
+    def _ensure_database(self):
+        """
+        确保数据库和表存在，结构版本变化时重建；索引文件损坏或无法打开时删除后重建.
+        """
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self._create_schema()
+            return
+        except sqlite3.DatabaseError as e:
+            logger.warning(f"音乐库索引文件不可用，删除后重建: {self.db_file} ({e})")
+
+        # 索引只是缓存，可随时从音乐目录重新生成
+        for suffix in ("", "-journal", "-wal", "-shm"):
+            try:
+                Path(f"{self.db_file}{suffix}").unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning(f"删除音乐库索引文件失败: {e}")
+        try:
+            self._create_schema()
+        except sqlite3.DatabaseError as e:
+            logger.error(f"重建音乐库索引失败，本地音乐搜索不可用: {e}")
+
+    def _create_schema(self):
+        with self._get_connection() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != _SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS tracks")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tracks (
+                    path TEXT PRIMARY KEY,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    title TEXT,
+                    artist TEXT,
+                    album TEXT,
+                    duration REAL,
+                    search_text TEXT NOT NULL,
+                    pinyin TEXT NOT NULL,
+                    initials TEXT NOT NULL
+                )
+            """)
+            conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def refresh(self) -> int:
+        """增量同步索引与音乐目录.
+
+        只对新增或修改时间/大小变化的文件提取元数据，并移除已删除的文件。
+
+        Returns:
+            本次新增或更新的条目数
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load()
+
+            on_disk = {}
+            if self.music_dir.exists():
+                with os.scandir(self.music_dir) as entries:
+                    for entry in entries:
+                        if entry.name.lower().endswith(
+                            MUSIC_EXTENSIONS
+                        ) and entry.is_file(follow_symlinks=False):
+                            stat = entry.stat()
+                            on_disk[entry.path] = (stat.st_mtime_ns, stat.st_size)
+
+            with self._get_connection() as conn:
+                known = {
+                    row["path"]: (row["mtime_ns"], row["size"])
+                    for row in conn.execute("SELECT path, mtime_ns, size FROM tracks")
+                }
+
+                removed = [path for path in known if path not in on_disk]
+                if removed:
+                    conn.executemany(
+                        "DELETE FROM tracks WHERE path = ?", [(p,) for p in removed]
+                    )
+                    for path in removed:
+                        self._remove_from_memory(path)
+
+                changed = [
+                    path for path, sig in on_disk.items() if known.get(path) != sig
+                ]
+                for path in changed:
+                    mtime_ns, size = on_disk[path]
+                    self._index_file(conn, Path(path), mtime_ns, size)
+
+            if changed or removed:
+                logger.info(
+                    f"音乐库索引已更新: 新增/变化 {len(changed)}，移除 {len(removed)}，"
+                    f"共 {len(self._tracks)} 首"
+                )
+            return len(changed)
+
+    def add_file(self, file_path: Path):
+        """
+        将单个文件加入索引（下载完成后调用，无需重新扫描目录）
+        """
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            with self._get_connection() as conn:
+                self._index_file(conn, file_path, stat.st_mtime_ns, stat.st_size)
+
+    def remove_file(self, file_path: Path):
+        """
+        从索引中移除文件.
+        """
+        path = str(file_path)
+        with self._lock:
+            with self._get_connection() as conn:
+                conn.execute("DELETE FROM tracks WHERE path = ?", (path,))
+            self._remove_from_memory(path)
+
+    def get(self, file_path: Path) -> Optional[MusicMetadata]:
+        """
+        获取已索引文件的元数据，未索引时返回 None.
+        """
+        with self._lock:
+            track = self._tracks.get(str(file_path))
+        return track.metadata if track else None
+
+    def tracks(self) -> List[MusicMetadata]:
+        """
+        按艺术家和标题排序的全部曲目.
+        """
+        with self._lock:
+            playlist = [track.metadata for track in self._tracks.values()]
+        playlist.sort(key=lambda x: (x.artist or "Unknown", x.title or x.filename))
+        return playlist
+
+    def search(self, query: str) -> List[MusicMetadata]:
+        """在标题、艺术家、专辑、文件名中搜索.
+
+        原文按子串匹配；纯字母查询还按整音节匹配全拼、按子串匹配拼音首字母；
+        中文查询还按拼音音节完全匹配同音字。
+        """
+        text = normalize_text(query)
+        if not text:
+            return self.tracks()
+
+        latin = is_latin_letters(text)
+        syllables = to_pinyin(text) if _contains_cjk(text) else []
+
+        with self._lock:
+            matched = set()
+            for path in self._candidates(text):
+                track = self._tracks[path]
+                if text in track.text or (
+                    latin
+                    and (
+                        text in track.initials or match_syllables(text, track.syllables)
+                    )
+                ):
+                    matched.add(path)
+
+            if syllables:
+                for path in self._syllable_candidates(syllables):
+                    if self._has_syllable_run(self._tracks[path].syllables, syllables):
+                        matched.add(path)
+
+            results = [self._tracks[path].metadata for path in matched]
+
+        results.sort(key=lambda x: (x.artist or "Unknown", x.title or x.filename))
+        return results
+
+    def _candidates(self, text: str) -> Iterable[str]:
+        """
+        按单字/二元组倒排表求交集得到候选路径.
+        """
+        grams = [text] if len(text) == 1 else list(_grams(text) - set(text))
+        grams.sort(key=lambda g: len(self._postings.get(g, ())))
+        candidates = set(self._postings.get(grams[0], ()))
+        for gram in grams[1:]:
+            if not candidates:
+                break
+            candidates &= self._postings.get(gram, set())
+        return candidates
+
+    def _syllable_candidates(self, syllables: List[str]) -> Set[str]:
+        """
+        按音节倒排表求交集得到候选路径.
+        """
+        ordered = sorted(
+            set(syllables), key=lambda s: len(self._syllable_postings.get(s, ()))
+        )
+        candidates = set(self._syllable_postings.get(ordered[0], ()))
+        for syllable in ordered[1:]:
+            if not candidates:
+                break
+            candidates &= self._syllable_postings.get(syllable, set())
+        return candidates
+
+    @staticmethod
+    def _has_syllable_run(track: Sequence[str], query: Sequence[str]) -> bool:
+        """
+        曲目音节中是否包含与查询完全相同的连续音节.
+        """
+        size = len(query)
+        return any(
+            tuple(track[i : i + size]) == tuple(query)
+            for i in range(len(track) - size + 1)
+        )
+
+    def _load(self):
+        """
+        从数据库加载索引到内存.
+        """
+        with self._get_connection() as conn:
+            for row in conn.execute("SELECT * FROM tracks"):
+                metadata = MusicMetadata(Path(row["path"]), row["size"])
+                metadata.title = row["title"]
+                metadata.artist = row["artist"]
+                metadata.album = row["album"]
+                metadata.duration = row["duration"]
+                self._add_to_memory(
+                    row["path"],
+                    _IndexedTrack(
+                        metadata, row["search_text"], row["pinyin"], row["initials"]
+                    ),
+                )
+        self._loaded = True
+        logger.debug(f"已加载音乐库索引: {len(self._tracks)} 首")
+
+    def _index_file(
+        self, conn: sqlite3.Connection, file_path: Path, mtime_ns: int, size: int
+    ):
+        """
+        提取单个文件的元数据并写入数据库和内存索引.
+        """
+        metadata = MusicMetadata(file_path, size)
+        metadata.extract_metadata()
+
+        fields = " ".join(
+            filter(None, [metadata.title, metadata.artist, metadata.album])
+        )
+        search_text = normalize_text(f"{fields} {metadata.filename}")
+        pinyin = " ".join(to_pinyin(fields))
+        initials = to_initials(fields)
+
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO tracks (
+                path, mtime_ns, size, title, artist, album, duration,
+                search_text, pinyin, initials
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+            (
+                str(file_path),
+                mtime_ns,
+                size,
+                metadata.title,
+                metadata.artist,
+                metadata.album,
+                metadata.duration,
+                search_text,
+                pinyin,
+                initials,
+            ),
+        )
+
+        path = str(file_path)
+        self._remove_from_memory(path)
+        self._add_to_memory(
+            path, _IndexedTrack(metadata, search_text, pinyin, initials)
+        )
+
+    def _add_to_memory(self, path: str, track: _IndexedTrack):
+        self._tracks[path] = track
+        for key in track.gram_keys():
+            for gram in _grams(key):
+                self._postings.setdefault(gram, set()).add(path)
+        for syllable in set(track.syllables):
+            self._syllable_postings.setdefault(syllable, set()).add(path)
+
+    def _remove_from_memory(self, path: str):
+        track = self._tracks.pop(path, None)
+        if track is None:
+            return
+        for key in track.gram_keys():
+            for gram in _grams(key):
+                postings = self._postings.get(gram)
+                if postings is not None:
+                    postings.discard(path)
+                    if not postings:
+                        del self._postings[gram]
+        for syllable in set(track.syllables):
+            postings = self._syllable_postings.get(syllable)
+            if postings is not None:
+                postings.discard(path)
+                if not postings:
+                    del self._syllable_postings[syllable]
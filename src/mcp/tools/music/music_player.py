@@ -4,119 +4,40 @@
 """
 
 import asyncio
+import bisect
+import hashlib
 import shutil
 import tempfile
 import time
 from pathlib import Path
 from typing import List, Optional, Tuple
 
-import pygame
 import requests
 
-from src.constants.constants import AudioConfig
+from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
 from src.utils.resource_finder import get_user_cache_dir
 
-# 尝试导入音乐元数据库
-try:
-    from mutagen import File as MutagenFile
-    from mutagen.id3 import ID3NoHeaderError
-
-    MUTAGEN_AVAILABLE = True
-except ImportError:
-    MUTAGEN_AVAILABLE = False
+from .cache_manager import MusicCacheManager
+from .library_index import MUSIC_EXTENSIONS, MusicLibraryIndex, MusicMetadata
+from .playback_clock import PlaybackClock
+from .playback_engine import MusicPlaybackEngine
 
 logger = get_logger(__name__)
 
 
-class MusicMetadata:
-    """
-    音乐元数据类.
-    """
-
-    def __init__(self, file_path: Path):
-        self.file_path = file_path
-        self.filename = file_path.name
-        self.file_id = file_path.stem  # 文件名去掉扩展名，即歌曲ID
-        self.file_size = file_path.stat().st_size
-
-        # 从文件提取的元数据
-        self.title = None
-        self.artist = None
-        self.album = None
-        self.duration = None  # 秒数
-
-    def extract_metadata(self) -> bool:
-        """
-        提取音乐文件元数据.
-        """
-        if not MUTAGEN_AVAILABLE:
-            return False
-
-        try:
-            audio_file = MutagenFile(self.file_path)
-            if audio_file is None:
-                return False
-
-            # 基本信息
-            if hasattr(audio_file, "info"):
-                self.duration = getattr(audio_file.info, "length", None)
-
-            # ID3标签信息
-            tags = audio_file.tags if audio_file.tags else {}
-
-            # 标题
-            self.title = self._get_tag_value(tags, ["TIT2", "TITLE", "\xa9nam"])
-
-            # 艺术家
-            self.artist = self._get_tag_value(tags, ["TPE1", "ARTIST", "\xa9ART"])
-
-            # 专辑
-            self.album = self._get_tag_value(tags, ["TALB", "ALBUM", "\xa9alb"])
-
-            return True
-
-        except ID3NoHeaderError:
-            # 没有ID3标签，不是错误
-            return True
-        except Exception as e:
-            logger.debug(f"提取元数据失败 {self.filename}: {e}")
-            return False
-
-    def _get_tag_value(self, tags: dict, tag_names: List[str]) -> Optional[str]:
-        """
-        从多个可能的标签名中获取值.
-        """
-        for tag_name in tag_names:
-            if tag_name in tags:
-                value = tags[tag_name]
-                if isinstance(value, list) and value:
-                    return str(value[0])
-                elif value:
-                    return str(value)
-        return None
-
-    def format_duration(self) -> str:
-        """
-        格式化播放时长.
-        """
-        if self.duration is None:
-            return "未知"
-
-        minutes = int(self.duration) // 60
-        seconds = int(self.duration) % 60
-        return f"{minutes:02d}:{seconds:02d}"
-
-
 class MusicPlayer:
     """音乐播放器 - 专为IoT设备设计
 
     只保留核心功能：搜索、播放、暂停、停止、跳转
     """
 
+    # 歌词显示相对时间标签的延迟（秒）
+    LYRIC_DELAY = 0.5
+
     def __init__(self):
-        # 根据服务器类型优化pygame mixer初始化
-        self._init_pygame_mixer()
+        # 播放引擎（首次播放时创建并接入 AudioCodec 输出）
+        self._engine: Optional[MusicPlaybackEngine] = None
 
         # 核心播放状态
         self.current_song = ""
@@ -125,11 +46,14 @@ class MusicPlayer:
         self.total_duration = 0
         self.is_playing = False
         self.paused = False
-        self.current_position = 0
-        self.start_play_time = 0
+
+        # 播放时钟（正确处理暂停/跳转/恢复）
+        self._clock = PlaybackClock()
+        self._playback_task: Optional[asyncio.Task] = None
 
         # 歌词相关
         self.lyrics = []  # 歌词列表，格式为 [(时间, 文本), ...]
+        self._lyric_times = []  # 歌词时间点，用于二分查找
         self.current_lyric_index = -1  # 当前歌词索引
 
         # 缓存目录设置 - 使用用户缓存目录确保可写
@@ -138,6 +62,20 @@ class MusicPlayer:
         self.temp_cache_dir = self.cache_dir / "temp"
         self._init_cache_dirs()
 
+        # 下载缓存管理（字节预算 + LRU 淘汰 + 完整性校验）
+        config = ConfigManager.get_instance()
+        cache_max_mb = config.get_config("MUSIC_OPTIONS.CACHE_MAX_MB", 1024)
+        self._cache = MusicCacheManager(
+            self.cache_dir,
+            max_bytes=int(cache_max_mb * 1024 * 1024),
+            temp_dir=self.temp_cache_dir,
+        )
+        self._compact_interval = config.get_config(
+            "MUSIC_OPTIONS.CACHE_COMPACT_INTERVAL", 1800
+        )
+        self._compact_task: Optional[asyncio.Task] = None
+        self._current_file: Optional[Path] = None
+
         # API配置
         self.config = {
             "SEARCH_URL": "http://search.kuwo.cn/r.s",
@@ -159,39 +97,43 @@ class MusicPlayer:
         self.app = None
         self._initialize_app_reference()
 
-        # 本地歌单缓存
-        self._local_playlist = None
+        # 本地音乐库持久化索引（按 路径+修改时间+大小 增量更新）
+        self._library = MusicLibraryIndex(self.cache_dir)
         self._last_scan_time = 0
 
         logger.info("音乐播放器单例初始化完成")
 
-    def _init_pygame_mixer(self):
+    def _get_engine(self) -> Optional[MusicPlaybackEngine]:
         """
-        根据服务器类型优化pygame mixer初始化.
+        获取播放引擎，首次调用时创建并作为附加音源接入 AudioCodec.
         """
-        try:
+        if self._engine is not None:
+            return self._engine
+
+        if self.app is None:
+            self._initialize_app_reference()
+        codec = getattr(self.app, "audio_codec", None) if self.app else None
+        if codec is None:
+            logger.error("音频编解码器不可用，无法播放音乐")
+            return None
 
-            # 预初始化mixer以设置缓冲区
-            pygame.mixer.pre_init(
-                frequency=AudioConfig.OUTPUT_SAMPLE_RATE,
-                size=-16,  # 16位有符号
-                channels=AudioConfig.CHANNELS,
-                buffer=1024,
-            )
+        volume = ConfigManager.get_instance().get_config("MUSIC_OPTIONS.VOLUME", 0.8)
+        engine = MusicPlaybackEngine(volume=volume)
 
-            # 正式初始化
-            pygame.mixer.init()
+        # 播放结束回调来自音频线程，切回事件循环处理
+        loop = asyncio.get_running_loop()
 
-            logger.info(
-                f"pygame mixer初始化完成 - 采样率: {AudioConfig.OUTPUT_SAMPLE_RATE}Hz"
+        def on_finished():
+            loop.call_soon_threadsafe(
+                lambda: asyncio.create_task(self._handle_playback_finished())
             )
 
-        except Exception as e:
-            logger.warning(f"优化pygame初始化失败，使用默认配置: {e}")
-            # 回退到默认配置
-            pygame.mixer.init(
-                frequency=AudioConfig.OUTPUT_SAMPLE_RATE, channels=AudioConfig.CHANNELS
-            )
+        engine.on_finished = on_finished
+        codec.add_output_source(engine)
+        self._clock.bind(lambda: engine.position)
+        self._engine = engine
+        logger.info("音乐播放引擎已接入音频输出")
+        return engine
 
     def _initialize_app_reference(self):
         """
@@ -243,61 +185,25 @@ class MusicPlayer:
 
     def _scan_local_music(self, force_refresh: bool = False) -> List[MusicMetadata]:
         """
-        扫描本地音乐缓存，返回歌单.
+        同步本地音乐索引，返回歌单.
         """
         current_time = time.time()
 
-        # 如果不强制刷新且缓存未过期（5分钟），直接返回缓存
-        if (
-            not force_refresh
-            and self._local_playlist is not None
-            and (current_time - self._last_scan_time) < 300
-        ):
-            return self._local_playlist
-
-        playlist = []
-
-        if not self.cache_dir.exists():
-            logger.warning(f"缓存目录不存在: {self.cache_dir}")
-            return playlist
-
-        # 查找所有音乐文件
-        music_files = []
-        for pattern in ["*.mp3", "*.m4a", "*.flac", "*.wav", "*.ogg"]:
-            music_files.extend(self.cache_dir.glob(pattern))
-
-        logger.debug(f"找到 {len(music_files)} 个音乐文件")
-
-        # 扫描每个文件
-        for file_path in music_files:
-            try:
-                metadata = MusicMetadata(file_path)
-
-                # 尝试提取元数据
-                if MUTAGEN_AVAILABLE:
-                    metadata.extract_metadata()
+        # 距上次同步超过5分钟或强制刷新时，增量同步目录变化
+        if force_refresh or (current_time - self._last_scan_time) >= 300:
+            if not self.cache_dir.exists():
+                logger.warning(f"缓存目录不存在: {self.cache_dir}")
+            self._library.refresh()
+            self._last_scan_time = current_time
 
-                playlist.append(metadata)
-
-            except Exception as e:
-                logger.debug(f"处理音乐文件失败 {file_path.name}: {e}")
-
-        # 按艺术家和标题排序
-        playlist.sort(key=lambda x: (x.artist or "Unknown", x.title or x.filename))
-
-        # 更新缓存
-        self._local_playlist = playlist
-        self._last_scan_time = current_time
-
-        logger.info(f"扫描完成，找到 {len(playlist)} 首本地音乐")
-        return playlist
+        return self._library.tracks()
 
     async def get_local_playlist(self, force_refresh: bool = False) -> dict:
         """
         获取本地音乐歌单.
         """
         try:
-            playlist = self._scan_local_music(force_refresh)
+            playlist = await asyncio.to_thread(self._scan_local_music, force_refresh)
 
             if not playlist:
                 return {
@@ -336,7 +242,7 @@ class MusicPlayer:
         搜索本地音乐.
         """
         try:
-            playlist = self._scan_local_music()
+            playlist = await asyncio.to_thread(self._scan_local_music)
 
             if not playlist:
                 return {
@@ -346,34 +252,18 @@ class MusicPlayer:
                     "found_count": 0,
                 }
 
-            query = query.lower()
             results = []
-
-            for metadata in playlist:
-                # 在标题、艺术家、文件名中搜索
-                searchable_text = " ".join(
-                    filter(
-                        None,
-                        [
-                            metadata.title,
-                            metadata.artist,
-                            metadata.album,
-                            metadata.filename,
-                        ],
-                    )
-                ).lower()
-
-                if query in searchable_text:
-                    title = metadata.title or "未知标题"
-                    artist = metadata.artist or "未知艺术家"
-                    song_info = f"{title} - {artist}"
-                    results.append(
-                        {
-                            "song_info": song_info,
-                            "file_id": metadata.file_id,
-                            "duration": metadata.format_duration(),
-                        }
-                    )
+            for metadata in self._library.search(query):
+                title = metadata.title or "未知标题"
+                artist = metadata.artist or "未知艺术家"
+                song_info = f"{title} - {artist}"
+                results.append(
+                    {
+                        "song_info": song_info,
+                        "file_id": metadata.file_id,
+                        "duration": metadata.format_duration(),
+                    }
+                )
 
             return {
                 "status": "success",
@@ -401,7 +291,7 @@ class MusicPlayer:
 
             if not file_path.exists():
                 # 尝试其他格式
-                for ext in [".m4a", ".flac", ".wav", ".ogg"]:
+                for ext in MUSIC_EXTENSIONS[1:]:
                     alt_path = self.cache_dir / f"{file_id}{ext}"
                     if alt_path.exists():
                         file_path = alt_path
@@ -409,18 +299,20 @@ class MusicPlayer:
                 else:
                     return {"status": "error", "message": f"本地文件不存在: {file_id}"}
 
-            # 获取歌曲信息
-            metadata = MusicMetadata(file_path)
-            if MUTAGEN_AVAILABLE:
+            # 获取歌曲信息（优先使用索引中的元数据）
+            metadata = self._library.get(file_path)
+            if metadata is None:
+                metadata = MusicMetadata(file_path)
                 metadata.extract_metadata()
 
-            # 停止当前播放
-            if self.is_playing:
-                pygame.mixer.music.stop()
+            engine = self._get_engine()
+            if engine is None:
+                return {"status": "error", "message": "音频输出不可用"}
 
-            # 加载并播放
-            pygame.mixer.music.load(str(file_path))
-            pygame.mixer.music.play()
+            # 停止当前播放并从头播放
+            engine.play(file_path)
+            self._current_file = file_path
+            await asyncio.to_thread(self._cache.touch, file_path)
 
             # 更新播放状态
             title = metadata.title or "未知标题"
@@ -431,10 +323,10 @@ class MusicPlayer:
             self.current_url = str(file_path)  # 本地文件路径
             self.is_playing = True
             self.paused = False
-            self.current_position = 0
-            self.start_play_time = time.time()
             self.current_lyric_index = -1
             self.lyrics = []  # 本地文件暂不支持歌词
+            self._clock.start()
+            self._start_playback_task()
 
             logger.info(f"开始播放本地音乐: {self.current_song}")
 
@@ -465,13 +357,14 @@ class MusicPlayer:
         return self.total_duration
 
     async def get_position(self):
-        if not self.is_playing or self.paused:
-            return self.current_position
+        current_pos = self._clock.position
+        if not self.is_playing or self.paused or self.total_duration <= 0:
+            return current_pos
 
-        current_pos = min(self.total_duration, time.time() - self.start_play_time)
+        current_pos = min(self.total_duration, current_pos)
 
         # 检查是否播放完成
-        if current_pos >= self.total_duration and self.total_duration > 0:
+        if current_pos >= self.total_duration:
             await self._handle_playback_finished()
 
         return current_pos
@@ -491,10 +384,11 @@ class MusicPlayer:
         """
         if self.is_playing:
             logger.info(f"歌曲播放完成: {self.current_song}")
-            pygame.mixer.music.stop()
+            if self._engine:
+                self._engine.stop()
             self.is_playing = False
             self.paused = False
-            self.current_position = self.total_duration
+            self._clock.stop(self.total_duration)
 
             # 更新UI显示完成状态
             if self.app and hasattr(self.app, "set_chat_message"):
@@ -543,9 +437,10 @@ class MusicPlayer:
 
             elif self.is_playing and self.paused:
                 # 恢复播放
-                pygame.mixer.music.unpause()
+                if self._engine:
+                    self._engine.resume()
                 self.paused = False
-                self.start_play_time = time.time() - self.current_position
+                self._clock.resume()
 
                 # 更新UI
                 if self.app and hasattr(self.app, "set_chat_message"):
@@ -558,13 +453,14 @@ class MusicPlayer:
 
             elif self.is_playing and not self.paused:
                 # 暂停播放
-                pygame.mixer.music.pause()
+                if self._engine:
+                    self._engine.pause()
                 self.paused = True
-                self.current_position = time.time() - self.start_play_time
+                self._clock.pause()
 
                 # 更新UI
                 if self.app and hasattr(self.app, "set_chat_message"):
-                    pos_str = self._format_time(self.current_position)
+                    pos_str = self._format_time(self._clock.position)
                     dur_str = self._format_time(self.total_duration)
                     await self._safe_update_ui(
                         f"已暂停: {self.current_song} [{pos_str}/{dur_str}]"
@@ -587,11 +483,12 @@ class MusicPlayer:
             if not self.is_playing:
                 return {"status": "info", "message": "没有正在播放的歌曲"}
 
-            pygame.mixer.music.stop()
+            if self._engine:
+                self._engine.stop()
             current_song = self.current_song
             self.is_playing = False
             self.paused = False
-            self.current_position = 0
+            self._clock.stop()
 
             # 更新UI
             if self.app and hasattr(self.app, "set_chat_message"):
@@ -612,14 +509,9 @@ class MusicPlayer:
                 return {"status": "error", "message": "没有正在播放的歌曲"}
 
             position = max(0, min(position, self.total_duration))
-            self.current_position = position
-            self.start_play_time = time.time() - position
-
-            pygame.mixer.music.rewind()
-            pygame.mixer.music.set_pos(position)
-
-            if self.paused:
-                pygame.mixer.music.pause()
+            if self._engine:
+                self._engine.seek(position)
+            self._clock.seek(position)
 
             # 更新UI
             pos_str = self._format_time(position)
@@ -761,9 +653,13 @@ class MusicPlayer:
         播放指定URL.
         """
         try:
+            engine = self._get_engine()
+            if engine is None:
+                return False
+
             # 停止当前播放
             if self.is_playing:
-                pygame.mixer.music.stop()
+                engine.stop()
 
             # 检查缓存或下载
             file_path = await self._get_or_download_file(url)
@@ -771,15 +667,14 @@ class MusicPlayer:
                 return False
 
             # 加载并播放
-            pygame.mixer.music.load(str(file_path))
-            pygame.mixer.music.play()
+            engine.play(file_path)
+            self._current_file = file_path
 
             self.current_url = url
             self.is_playing = True
             self.paused = False
-            self.current_position = 0
-            self.start_play_time = time.time()
             self.current_lyric_index = -1  # 重置歌词索引
+            self._clock.start()
 
             logger.info(f"开始播放: {self.current_song}")
 
@@ -787,8 +682,8 @@ class MusicPlayer:
             if self.app and hasattr(self.app, "set_chat_message"):
                 await self._safe_update_ui(f"正在播放: {self.current_song}")
 
-            # 启动歌词更新任务
-            asyncio.create_task(self._lyrics_update_task())
+            # 启动歌词同步任务
+            self._start_playback_task()
 
             return True
 
@@ -806,9 +701,14 @@ class MusicPlayer:
             cache_filename = f"{self.song_id}.mp3"
             cache_path = self.cache_dir / cache_filename
 
-            # 检查缓存是否存在
-            if cache_path.exists():
+            self._ensure_compact_task()
+
+            # 检查缓存是否存在且完整（截断的文件会被删除并重新下载）
+            if cache_path.exists() and await asyncio.to_thread(
+                self._cache.lookup, cache_path
+            ):
                 logger.info(f"使用缓存: {cache_path}")
+                await asyncio.to_thread(self._cache.touch, cache_path)
                 return cache_path
 
             # 缓存不存在，需要下载
@@ -837,16 +737,34 @@ class MusicPlayer:
                 timeout=30,
             )
             response.raise_for_status()
+            # Content-Length 是传输字节数；响应经过压缩时 iter_content 得到的是解压后的数据，
+            # 长度不可比，只在未压缩时校验
+            encoding = response.headers.get("Content-Encoding", "identity").lower()
+            expected = (
+                int(response.headers.get("Content-Length") or 0)
+                if encoding in ("", "identity")
+                else 0
+            )
 
-            # 写入临时文件
-            with open(temp_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+            # 写入临时文件，同时计算长度和校验和
+            size, checksum = await asyncio.to_thread(
+                self._write_response, response, temp_path
+            )
+            if size == 0 or (expected and size != expected):
+                raise IOError(f"下载不完整: {size}/{expected} 字节")
 
             # 下载完成，移动到正式缓存目录
             cache_path = self.cache_dir / filename
             shutil.move(str(temp_path), str(cache_path))
+            await asyncio.to_thread(self._cache.record, cache_path, size, checksum)
+            await asyncio.to_thread(self._library.add_file, cache_path)
+
+            # 超出预算时立即淘汰最久未播放的文件
+            removed = await asyncio.to_thread(
+                self._cache.evict, [cache_path] + self._protected_files()
+            )
+            for path in removed:
+                await asyncio.to_thread(self._library.remove_file, path)
 
             logger.info(f"音乐下载完成并缓存: {cache_path}")
             return cache_path
@@ -932,59 +850,69 @@ class MusicPlayer:
         except Exception as e:
             logger.error(f"获取歌词失败: {e}")
 
-    async def _lyrics_update_task(self):
+    def _start_playback_task(self):
         """
-        歌词更新任务.
+        启动歌词同步与播放完成检测任务（取消上一首歌的任务）
         """
-        if not self.lyrics:
-            return
+        if self._playback_task and not self._playback_task.done():
+            self._playback_task.cancel()
+        self._lyric_times = [time_sec for time_sec, _ in self.lyrics]
+        self._playback_task = asyncio.create_task(self._lyrics_update_task())
+
+    async def _lyrics_update_task(self):
+        """歌词同步任务.
 
+        在下一句歌词（或歌曲结束）的时间点唤醒；暂停期间一直休眠，
+        暂停/恢复/跳转/停止时立即被唤醒重新计算。
+        """
         try:
             while self.is_playing:
-                if self.paused:
-                    await asyncio.sleep(0.5)
+                version = self._clock.version
+                if self._clock.paused:
+                    await self._clock.wait(version)
                     continue
 
-                current_time = time.time() - self.start_play_time
+                position = self._clock.position
 
                 # 检查是否播放完成
-                if current_time >= self.total_duration:
+                if self.total_duration > 0 and position >= self.total_duration:
                     await self._handle_playback_finished()
                     break
 
-                # 查找当前时间对应的歌词
-                current_index = self._find_current_lyric_index(current_time)
+                wake_at = self.total_duration if self.total_duration > 0 else None
 
-                # 如果歌词索引变化了，更新显示
-                if current_index != self.current_lyric_index:
-                    await self._display_current_lyric(current_index)
+                if self._lyric_times:
+                    # 查找当前时间对应的歌词，索引变化时更新显示
+                    current_index = self._find_current_lyric_index(position)
+                    if current_index != self.current_lyric_index:
+                        await self._display_current_lyric(current_index)
 
-                await asyncio.sleep(0.2)
+                    # 下一句歌词开始显示的时间点
+                    next_index = bisect.bisect_right(
+                        self._lyric_times, position - self.LYRIC_DELAY
+                    )
+                    if next_index < len(self._lyric_times):
+                        next_time = self._lyric_times[next_index] + self.LYRIC_DELAY
+                        wake_at = (
+                            next_time if wake_at is None else min(wake_at, next_time)
+                        )
+
+                timeout = None
+                if wake_at is not None:
+                    # 略微推迟，避免浮点误差导致提前唤醒
+                    timeout = max(0.0, wake_at - position) + 0.01
+                await self._clock.wait(version, timeout)
+        except asyncio.CancelledError:
+            pass
         except Exception as e:
             logger.error(f"歌词更新任务异常: {e}")
 
     def _find_current_lyric_index(self, current_time: float) -> int:
         """
-        查找当前时间对应的歌词索引.
+        查找当前时间对应的歌词索引（二分查找）
         """
-        # 查找下一句歌词
-        next_lyric_index = None
-        for i, (time_sec, _) in enumerate(self.lyrics):
-            # 添加一个小的偏移量(0.5秒)，使歌词显示更准确
-            if time_sec > current_time - 0.5:
-                next_lyric_index = i
-                break
-
-        # 确定当前歌词索引
-        if next_lyric_index is not None and next_lyric_index > 0:
-            # 如果找到下一句歌词，当前歌词就是它的前一句
-            return next_lyric_index - 1
-        elif next_lyric_index is None and self.lyrics:
-            # 如果没找到下一句，说明已经到最后一句
-            return len(self.lyrics) - 1
-        else:
-            # 其他情况（如播放刚开始）
-            return 0
+        index = bisect.bisect_right(self._lyric_times, current_time - self.LYRIC_DELAY)
+        return max(index - 1, 0)
 
     async def _display_current_lyric(self, current_index: int):
         """
@@ -996,7 +924,7 @@ class MusicPlayer:
             time_sec, text = self.lyrics[current_index]
 
             # 在歌词前添加时间和进度信息
-            position_str = self._format_time(time.time() - self.start_play_time)
+            position_str = self._format_time(self._clock.position)
             duration_str = self._format_time(self.total_duration)
             display_text = f"[{position_str}/{duration_str}] {text}"
 
@@ -1029,6 +957,51 @@ class MusicPlayer:
         seconds = int(seconds) % 60
         return f"{minutes:02d}:{seconds:02d}"
 
+    @staticmethod
+    def _write_response(response, temp_path: Path) -> Tuple[int, str]:
+        """
+        将下载内容写入临时文件，返回 (字节数, SHA-256)
+        """
+        digest = hashlib.sha256()
+        size = 0
+        with open(temp_path, "wb") as f:
+            for chunk in response.iter_content(chunk_size=65536):
+                if chunk:
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+        return size, digest.hexdigest()
+
+    def _protected_files(self) -> List[Path]:
+        """
+        不可淘汰的缓存文件（当前播放的歌曲）
+        """
+        return [self._current_file] if self._current_file else []
+
+    def _ensure_compact_task(self):
+        """
+        启动后台缓存整理任务（首次访问缓存时调用）
+        """
+        if self._compact_task is None or self._compact_task.done():
+            self._compact_task = asyncio.create_task(self._compact_loop())
+
+    async def _compact_loop(self):
+        """
+        定期整理缓存：校验文件、清理残留临时文件、按预算淘汰.
+        """
+        while True:
+            try:
+                removed = await asyncio.to_thread(
+                    self._cache.compact, self._protected_files()
+                )
+                for path in removed:
+                    await asyncio.to_thread(self._library.remove_file, path)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"音乐缓存整理失败: {e}")
+            await asyncio.sleep(self._compact_interval)
+
     async def _safe_update_ui(self, message: str):
         """
         安全地更新UI.
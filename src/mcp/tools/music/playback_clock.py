@@ -0,0 +1,128 @@
+"""播放时钟.
+
+用单调时钟记录播放位置（也可绑定播放引擎按样本数计算的位置），正确处理暂停、跳转和恢复；
+状态变化时通知等待者，歌词同步任务据此在下一句歌词的时间点精确唤醒，暂停期间则一直休眠。
+"""
+
+import asyncio
+import time
+from typing import Callable, Optional
+
+
+class PlaybackClock:
+    """
+    播放位置时钟.
+    """
+
+    def __init__(self):
+        self._anchor_position = 0.0  # 最近一次启动/恢复/跳转时的位置（秒）
+        self._anchor_time: Optional[float] = None  # 对应的单调时钟时间，暂停时为None
+        self._running = False
+        self._version = 0  # 每次状态变化递增
+        self._changed: Optional[asyncio.Event] = None
+        # 外部位置来源（如按已输出样本数计算的播放引擎位置）
+        self._source: Optional[Callable[[], float]] = None
+
+    @property
+    def running(self) -> bool:
+        """
+        时钟是否处于播放（未停止）状态.
+        """
+        return self._running
+
+    @property
+    def version(self) -> int:
+        """
+        状态版本号，配合 wait() 检测读取位置之后发生的变化.
+        """
+        return self._version
+
+    @property
+    def paused(self) -> bool:
+        """
+        是否处于暂停状态.
+        """
+        return self._running and self._anchor_time is None
+
+    @property
+    def position(self) -> float:
+        """
+        当前播放位置（秒）
+        """
+        if self._running and self._source is not None:
+            return self._source()
+        if self._anchor_time is None:
+            return self._anchor_position
+        return self._anchor_position + (time.monotonic() - self._anchor_time)
+
+    def bind(self, source: Optional[Callable[[], float]]):
+        """
+        绑定外部位置来源，播放期间位置以其为准（传入None解除绑定）
+        """
+        self._source = source
+
+    def start(self, position: float = 0.0):
+        """
+        从指定位置开始计时.
+        """
+        self._running = True
+        self._anchor_position = max(0.0, position)
+        self._anchor_time = time.monotonic()
+        self._notify()
+
+    def pause(self):
+        """
+        暂停计时，冻结当前位置.
+        """
+        if self._anchor_time is not None:
+            self._anchor_position = self.position
+            self._anchor_time = None
+            self._notify()
+
+    def resume(self):
+        """
+        从暂停位置继续计时.
+        """
+        if self._running and self._anchor_time is None:
+            self._anchor_time = time.monotonic()
+            self._notify()
+
+    def seek(self, position: float):
+        """
+        跳转到指定位置，保持当前的暂停/播放状态.
+        """
+        self._anchor_position = max(0.0, position)
+        if self._anchor_time is not None:
+            self._anchor_time = time.monotonic()
+        self._notify()
+
+    def stop(self, position: float = 0.0):
+        """
+        停止计时.
+        """
+        self._running = False
+        self._anchor_position = position
+        self._anchor_time = None
+        self._notify()
+
+    async def wait(self, since: int, timeout: Optional[float] = None) -> bool:
+        """等待时钟状态自版本 since 之后发生变化（暂停/恢复/跳转/停止）或超时.
+
+        Returns:
+            状态发生变化返回True，超时返回False
+        """
+        if self._version != since:
+            return True
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        self._changed.clear()
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def _notify(self):
+        self._version += 1
+        if self._changed is not None:
+            self._changed.set()
@@ -0,0 +1,294 @@
+"""音乐播放引擎.
+
+解码线程将音乐文件流式解码为与语音播放一致的 PCM（OUTPUT_SAMPLE_RATE、单声道、int16），
+写入有界缓冲区；AudioCodec 的播放回调把它作为附加音源与 TTS 混合输出，
+因此音乐与语音共用同一个输出设备，可在语音播放时自动压低音量，也对 AEC 可见。
+播放位置按实际送入播放回调的样本数计算。
+
+解码优先使用 miniaudio（mp3/flac/ogg/wav），不可用或格式不支持（如 m4a）时回退到 ffmpeg。
+"""
+
+import shutil
+import subprocess
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+import numpy as np
+
+from src.audio_codecs.output_mixer import OutputSource
+from src.constants.constants import AudioConfig
+from src.utils.logging_config import get_logger
+
+# 尝试导入 miniaudio 解码库
+try:
+    import miniaudio
+
+    MINIAUDIO_AVAILABLE = True
+except ImportError:
+    MINIAUDIO_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+MINIAUDIO_EXTENSIONS = (".mp3", ".flac", ".ogg", ".wav")
+
+
+class MusicPlaybackEngine(OutputSource):
+    """
+    音乐播放引擎（作为 AudioCodec 的附加输出音源）
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = AudioConfig.OUTPUT_SAMPLE_RATE,
+        buffer_seconds: float = 2.0,
+        chunk_ms: int = 100,
+        volume: float = 0.8,
+    ):
+        self.sample_rate = sample_rate
+        self.gain = volume
+
+        self._chunk_frames = sample_rate * chunk_ms // 1000
+        self._capacity = int(sample_rate * buffer_seconds)
+
+        # 解码缓冲：numpy 块队列 + 样本总数
+        self._chunks = deque()
+        self._buffered = 0
+        self._cond = threading.Condition()
+
+        self._file_path: Optional[Path] = None
+        self._decoder: Optional[threading.Thread] = None
+        self._generation = 0  # 每次加载/跳转递增，使旧解码线程退出
+        self._decode_done = False
+
+        self._playing = False
+        self._paused = False
+        self._played_samples = 0
+        self._start_offset = 0
+
+        # 播放到结尾时回调（在播放回调线程中调用，回调内不应阻塞）
+        self.on_finished: Optional[Callable[[], None]] = None
+
+    # -----------------------
+    # 控制接口（事件循环线程调用）
+    # -----------------------
+    def play(self, file_path: Path, position: float = 0.0):
+        """
+        从指定位置开始播放文件.
+        """
+        self._file_path = Path(file_path)
+        self._restart_decoder(position)
+        self._paused = False
+        self._playing = True
+
+    def pause(self):
+        """
+        暂停输出（解码缓冲保留）
+        """
+        self._paused = True
+
+    def resume(self):
+        """
+        恢复输出.
+        """
+        self._paused = False
+
+    def seek(self, position: float):
+        """
+        跳转到指定位置（保持暂停/播放状态）
+        """
+        if self._file_path is not None:
+            self._restart_decoder(position)
+
+    def stop(self):
+        """
+        停止播放并结束解码线程.
+        """
+        self._playing = False
+        with self._cond:
+            self._generation += 1
+            self._clear_locked()
+            self._cond.notify_all()
+
+    @property
+    def position(self) -> float:
+        """
+        当前播放位置（秒），按已输出的样本数计算.
+        """
+        with self._cond:
+            return (self._start_offset + self._played_samples) / self.sample_rate
+
+    @property
+    def is_active(self) -> bool:
+        """
+        是否正在播放（含暂停）
+        """
+        return self._playing
+
+    # -----------------------
+    # 音源接口（播放回调线程调用）
+    # -----------------------
+    def read(self, frames: int) -> Optional[np.ndarray]:
+        if not self._playing or self._paused:
+            return None
+
+        with self._cond:
+            if self._buffered == 0:
+                if self._decode_done:
+                    self._playing = False
+                    finished = True
+                else:
+                    # 解码跟不上，本帧静音
+                    return None
+            else:
+                finished = False
+                out = self._take_locked(frames)
+                # 与 _restart_decoder 清零计数在同一把锁内，跳转后不会累加旧位置的样本
+                self._played_samples += len(out)
+                self._cond.notify_all()
+
+        if finished:
+            if self.on_finished:
+                try:
+                    self.on_finished()
+                except Exception as e:
+                    logger.warning(f"音乐播放结束回调失败: {e}")
+            return None
+
+        return out
+
+    # -----------------------
+    # 解码
+    # -----------------------
+    def _restart_decoder(self, position: float):
+        position = max(0.0, position)
+        with self._cond:
+            self._generation += 1
+            generation = self._generation
+            self._clear_locked()
+            self._decode_done = False
+            self._start_offset = int(position * self.sample_rate)
+            self._played_samples = 0
+            self._cond.notify_all()
+
+        self._decoder = threading.Thread(
+            target=self._decode_loop,
+            args=(self._file_path, self._start_offset, generation),
+            name="MusicDecoder",
+            daemon=True,
+        )
+        self._decoder.start()
+
+    def _decode_loop(self, file_path: Path, start_frame: int, generation: int):
+        """
+        解码线程：流式解码并写入缓冲区，缓冲区满时等待.
+        """
+        try:
+            for chunk in self._open_stream(file_path, start_frame):
+                if len(chunk) == 0:
+                    continue
+                with self._cond:
+                    while (
+                        self._buffered >= self._capacity
+                        and self._generation == generation
+                    ):
+                        self._cond.wait(0.5)
+                    if self._generation != generation:
+                        return
+                    self._chunks.append(chunk)
+                    self._buffered += len(chunk)
+        except Exception as e:
+            logger.error(f"音乐解码失败 {file_path.name}: {e}")
+        finally:
+            with self._cond:
+                if self._generation == generation:
+                    self._decode_done = True
+                    self._cond.notify_all()
+
+    def _open_stream(self, file_path: Path, start_frame: int) -> Iterator[np.ndarray]:
+        if MINIAUDIO_AVAILABLE and file_path.suffix.lower() in MINIAUDIO_EXTENSIONS:
+            started = False
+            try:
+                for chunk in self._miniaudio_stream(file_path, start_frame):
+                    started = True
+                    yield chunk
+                return
+            except miniaudio.DecodeError as e:
+                # 已输出部分数据时不再回退，避免重复播放
+                if started:
+                    raise
+                logger.warning(f"miniaudio 无法解码 {file_path.name}，尝试 ffmpeg: {e}")
+        yield from self._ffmpeg_stream(file_path, start_frame)
+
+    def _miniaudio_stream(
+        self, file_path: Path, start_frame: int
+    ) -> Iterator[np.ndarray]:
+        stream = miniaudio.stream_file(
+            str(file_path),
+            output_format=miniaudio.SampleFormat.SIGNED16,
+            nchannels=AudioConfig.CHANNELS,
+            sample_rate=self.sample_rate,
+            frames_to_read=self._chunk_frames,
+            seek_frame=start_frame,
+        )
+        for samples in stream:
+            yield np.frombuffer(samples, dtype=np.int16).copy()
+
+    def _ffmpeg_stream(self, file_path: Path, start_frame: int) -> Iterator[np.ndarray]:
+        ffmpeg = shutil.which("ffmpeg")
+        if not ffmpeg:
+            raise RuntimeError("没有可用的解码器（需要 miniaudio 或 ffmpeg）")
+
+        cmd = [
+            ffmpeg,
+            "-v",
+            "error",
+            "-ss",
+            f"{start_frame / self.sample_rate:.3f}",
+            "-i",
+            str(file_path),
+            "-f",
+            "s16le",
+            "-ac",
+            str(AudioConfig.CHANNELS),
+            "-ar",
+            str(self.sample_rate),
+            "-",
+        ]
+        process = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        chunk_bytes = self._chunk_frames * 2 * AudioConfig.CHANNELS
+        try:
+            while True:
+                data = process.stdout.read(chunk_bytes)
+                if not data:
+                    break
+                yield np.frombuffer(data[: len(data) // 2 * 2], dtype=np.int16)
+        finally:
+            process.kill()
+            process.wait()
+
+    # -----------------------
+    # 缓冲区操作（需持有锁）
+    # -----------------------
+    def _take_locked(self, frames: int) -> np.ndarray:
+        parts = []
+        remaining = frames
+        while remaining > 0 and self._chunks:
+            chunk = self._chunks[0]
+            if len(chunk) <= remaining:
+                parts.append(self._chunks.popleft())
+                remaining -= len(chunk)
+            else:
+                parts.append(chunk[:remaining])
+                self._chunks[0] = chunk[remaining:]
+                remaining = 0
+        out = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        self._buffered -= len(out)
+        return out
+
+    def _clear_locked(self):
+        self._chunks.clear()
+        self._buffered = 0
@@ -2,6 +2,8 @@
 Screenshot tool for MCP.
 """
 
+import asyncio
+
 from src.utils.logging_config import get_logger
 
 from .screenshot_camera import ScreenshotCamera
@@ -16,7 +18,7 @@ def get_screenshot_camera_instance():
     return ScreenshotCamera.get_instance()
 
 
-def take_screenshot(arguments: dict) -> str:
+async def take_screenshot(arguments: dict) -> str:
     """截取桌面并分析的工具函数.
 
     Args:
@@ -58,11 +60,11 @@ def take_screenshot(arguments: dict) -> str:
     logger.info(f"Taking screenshot with question: {question}, display: {display_id}")
 
     # 截图
-    success = camera.capture(display_id)
+    success = await asyncio.to_thread(camera.capture, display_id)
     if not success:
         logger.error("Failed to capture screenshot")
         return '{"success": false, "message": "Failed to capture screenshot"}'
 
     # 分析截图
     logger.info("Screenshot captured, starting analysis...")
-    return camera.analyze(question)
+    return await camera.analyze(question)
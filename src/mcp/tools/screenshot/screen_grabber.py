@@ -0,0 +1,100 @@
+"""
+In-process screen grabber.
+
+直接在进程内抓取屏幕像素并返回 NumPy 帧（BGR），替代逐个尝试 gnome-screenshot、scrot 等
+外部命令并经临时文件中转的方式。优先使用 mss（X11 共享内存），不可用时回退到
+PIL ImageGrab。在 Xvfb 等虚拟帧缓冲中同样可用（设置 DISPLAY 即可）。
+"""
+
+import os
+import threading
+from typing import Optional
+
+import numpy as np
+
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# mss 的 X11 连接不能跨线程使用，每个线程各自保留一个实例
+_local = threading.local()
+
+
+def is_available() -> bool:
+    """
+    当前会话是否可以进程内截屏（纯 Wayland 会话没有 X 服务器时返回 False）
+    """
+    return bool(os.environ.get("DISPLAY"))
+
+
+def _get_mss():
+    sct = getattr(_local, "sct", None)
+    if sct is None:
+        import mss
+
+        sct = mss.mss()
+        _local.sct = sct
+    return sct
+
+
+def _select_monitor(monitors: list, display_id) -> Optional[dict]:
+    """从 mss 显示器列表中选择目标区域.
+
+    monitors[0] 是覆盖所有显示器的虚拟屏幕，monitors[1:] 为各个显示器。
+    """
+    if display_id is None:
+        return monitors[0]
+    if display_id == "main":
+        display_id = 1
+    elif display_id == "secondary":
+        display_id = 2
+    if isinstance(display_id, int) and 0 < display_id < len(monitors):
+        return monitors[display_id]
+    logger.warning(f"Display {display_id} not found, capturing all displays")
+    return monitors[0]
+
+
+def _grab_with_mss(display_id) -> Optional[np.ndarray]:
+    try:
+        sct = _get_mss()
+        shot = sct.grab(_select_monitor(sct.monitors, display_id))
+        # BGRA -> BGR，丢弃 alpha 通道
+        return np.ascontiguousarray(np.asarray(shot)[:, :, :3])
+    except ImportError:
+        return None
+    except Exception as e:
+        logger.debug(f"mss screen capture failed: {e}")
+        # 连接可能已失效，下次重新创建
+        _local.sct = None
+        return None
+
+
+def _grab_with_pil() -> Optional[np.ndarray]:
+    try:
+        from PIL import ImageGrab
+
+        image = ImageGrab.grab(all_screens=True).convert("RGB")
+        # RGB -> BGR，与 OpenCV 编码保持一致
+        return np.asarray(image)[:, :, ::-1]
+    except Exception as e:
+        logger.debug(f"PIL screen capture failed: {e}")
+        return None
+
+
+def grab_screen(display_id=None) -> Optional[np.ndarray]:
+    """抓取屏幕画面.
+
+    Args:
+        display_id: None=所有显示器，"main"=主屏，"secondary"=副屏，1,2,3...=具体显示器
+
+    Returns:
+        BGR 格式的图像帧，失败时返回 None
+    """
+    if not is_available():
+        return None
+
+    frame = _grab_with_mss(display_id)
+    if frame is None:
+        # PIL 不支持按显示器截取，只能截取整个虚拟屏幕
+        frame = _grab_with_pil()
+    return frame
@@ -2,6 +2,7 @@
 Screenshot camera implementation for capturing desktop screens.
 """
 
+import asyncio
 import io
 import sys
 import threading
@@ -359,6 +360,55 @@ class ScreenshotCamera(BaseCamera):
             return None
 
     def _capture_linux(self, display_id=None) -> bytes:
+        """Linux截图：优先进程内抓屏，失败时回退到系统截图命令.
+
+        Args:
+            display_id: 显示器ID，None=所有显示器，"main"=主屏，"secondary"=副屏，1,2,3...=具体显示器
+
+        Returns:
+            JPEG格式的图片字节数据
+        """
+        screenshot_data = self._capture_in_process(display_id)
+        if screenshot_data:
+            return screenshot_data
+        return self._capture_linux_commands(display_id)
+
+    def _capture_in_process(self, display_id=None) -> bytes:
+        """进程内抓屏并在内存中缩放、编码为JPEG.
+
+        Args:
+            display_id: 显示器ID
+
+        Returns:
+            JPEG格式的图片字节数据，不可用时返回None
+        """
+        try:
+            from src.mcp.tools.camera.vision_client import (
+                encode_jpeg,
+                get_vision_client,
+            )
+
+            from .screen_grabber import grab_screen
+
+            frame = grab_screen(display_id)
+            if frame is None:
+                return None
+
+            client = get_vision_client()
+            screenshot_data = encode_jpeg(
+                frame, client.screenshot_max_side, client.jpeg_quality
+            )
+            if screenshot_data:
+                logger.debug(
+                    f"Captured screenshot in process: {frame.shape[1]}x{frame.shape[0]}"
+                )
+            return screenshot_data
+
+        except Exception as e:
+            logger.debug(f"In-process screenshot capture failed: {e}")
+            return None
+
+    def _capture_linux_commands(self, display_id=None) -> bytes:
         """使用Linux系统命令截图.
 
         Args:
@@ -431,10 +481,11 @@ class ScreenshotCamera(BaseCamera):
             logger.error(f"Linux screenshot capture failed: {e}")
             return None
 
-    def analyze(self, question: str) -> str:
+    async def analyze_image(self, image: bytes, question: str) -> str:
         """分析截图内容.
 
         Args:
+            image: 截图的JPEG字节数据
             question: 用户的问题或分析要求
 
         Returns:
@@ -443,28 +494,20 @@ class ScreenshotCamera(BaseCamera):
         try:
             logger.info(f"Analyzing screenshot with question: {question}")
 
-            # 获取现有的摄像头实例来复用分析能力
+            # 复用摄像头实现的分析能力，直接传递截图数据
             from src.mcp.tools.camera import get_camera_instance
+            from src.mcp.tools.camera.vision_client import (
+                get_vision_client,
+                shrink_jpeg,
+            )
 
-            camera_instance = get_camera_instance()
-
-            # 将我们的截图数据传递给分析器
-            original_jpeg_data = camera_instance.get_jpeg_data()
-            camera_instance.set_jpeg_data(self.jpeg_data["buf"])
-
-            try:
-                # 使用现有的分析能力
-                result = camera_instance.analyze(question)
-
-                # 恢复原始数据
-                camera_instance.set_jpeg_data(original_jpeg_data["buf"])
-
-                return result
+            # 整屏截图分辨率较高，上传前按配置缩小
+            client = get_vision_client()
+            image = await asyncio.to_thread(
+                shrink_jpeg, image, client.screenshot_max_side, client.jpeg_quality
+            )
 
-            except Exception as e:
-                # 恢复原始数据
-                camera_instance.set_jpeg_data(original_jpeg_data["buf"])
-                raise e
+            return await get_camera_instance().analyze_image(image, question)
 
         except Exception as e:
             logger.error(f"Error analyzing screenshot: {e}", exc_info=True)
@@ -4,12 +4,20 @@
 """
 
 from .scanner import list_running_applications, scan_installed_applications
-from .utils import AppMatcher, find_best_matching_app, get_cached_applications
+from .utils import (
+    AppIndex,
+    AppMatcher,
+    find_best_matching_app,
+    get_app_index,
+    get_cached_applications,
+)
 
 __all__ = [
     "scan_installed_applications",
     "list_running_applications",
     "AppMatcher",
+    "AppIndex",
+    "get_app_index",
     "find_best_matching_app",
     "get_cached_applications",
 ]
@@ -3,11 +3,14 @@
 提供Linux平台下的应用程序关闭功能
 """
 
-import subprocess
-from typing import Any, Dict, List
+import os
+import signal
+from typing import Any, Dict, List, Optional
 
 from src.utils.logging_config import get_logger
 
+from .proc_scanner import ProcessInfo, get_process_table
+
 logger = get_logger(__name__)
 
 
@@ -15,55 +18,46 @@ def list_running_applications(filter_name: str = "") -> List[Dict[str, Any]]:
     """
     列出Linux上正在运行的应用程序.
     """
-    apps = []
-
     try:
-        # 使用ps命令获取进程信息
-        result = subprocess.run(
-            ["ps", "-eo", "pid,ppid,comm,command", "--no-headers"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-
-        if result.returncode == 0:
-            lines = result.stdout.strip().split("\n")
-
-            for line in lines:
-                parts = line.strip().split(None, 3)
-                if len(parts) >= 4:
-                    pid, ppid, comm, command = parts
-
-                    # 过滤GUI应用程序
-                    is_gui_app = (
-                        not command.startswith("/usr/bin/")
-                        and not command.startswith("/bin/")
-                        and not command.startswith("[")  # 内核线程
-                        and len(comm) > 2
-                    )
-
-                    if is_gui_app:
-                        app_name = comm
-
-                        # 应用过滤条件
-                        if not filter_name or filter_name.lower() in app_name.lower():
-                            apps.append(
-                                {
-                                    "pid": int(pid),
-                                    "ppid": int(ppid),
-                                    "name": app_name,
-                                    "display_name": app_name,
-                                    "command": command,
-                                    "type": "application",
-                                }
-                            )
-
-    except (subprocess.TimeoutExpired, subprocess.SubprocessError) as e:
+        # 读取 /proc 进程表，只对新进程判断是否为GUI应用
+        processes = get_process_table().classify("killer", _classify_gui_process)
+    except OSError as e:
         logger.warning(f"[LinuxKiller] Linux进程扫描失败: {e}")
+        return []
+
+    apps = []
+    filter_lower = filter_name.lower()
+    for info, app_name in processes:
+        # 应用过滤条件
+        if not filter_name or filter_lower in app_name.lower():
+            apps.append(
+                {
+                    "pid": info.pid,
+                    "ppid": info.ppid,
+                    "name": app_name,
+                    "display_name": app_name,
+                    "command": info.command,
+                    "type": "application",
+                }
+            )
 
     return apps
 
 
+def _classify_gui_process(info: ProcessInfo) -> Optional[str]:
+    """
+    判断是否为GUI应用程序，是则返回应用名称.
+    """
+    command = info.command
+    is_gui_app = (
+        not command.startswith("/usr/bin/")
+        and not command.startswith("/bin/")
+        and not command.startswith("[")  # 内核线程
+        and len(info.comm) > 2
+    )
+    return info.comm if is_gui_app else None
+
+
 def kill_application(pid: int, force: bool) -> bool:
     """
     在Linux上关闭应用程序.
@@ -73,26 +67,15 @@ def kill_application(pid: int, force: bool) -> bool:
             f"[LinuxKiller] 尝试关闭Linux应用程序，PID: {pid}, 强制关闭: {force}"
         )
 
-        if force:
-            # 强制关闭 (SIGKILL)
-            result = subprocess.run(
-                ["kill", "-9", str(pid)], capture_output=True, timeout=5
-            )
-        else:
-            # 正常关闭 (SIGTERM)
-            result = subprocess.run(
-                ["kill", "-15", str(pid)], capture_output=True, timeout=5
-            )
-
-        success = result.returncode == 0
+        # 强制关闭 (SIGKILL) / 正常关闭 (SIGTERM)
+        os.kill(pid, signal.SIGKILL if force else signal.SIGTERM)
 
-        if success:
-            logger.info(f"[LinuxKiller] 成功关闭应用程序，PID: {pid}")
-        else:
-            logger.warning(f"[LinuxKiller] 关闭应用程序失败，PID: {pid}")
+        logger.info(f"[LinuxKiller] 成功关闭应用程序，PID: {pid}")
+        return True
 
-        return success
-
-    except (subprocess.TimeoutExpired, subprocess.SubprocessError) as e:
+    except ProcessLookupError:
+        logger.warning(f"[LinuxKiller] 关闭应用程序失败，进程不存在，PID: {pid}")
+        return False
+    except OSError as e:
         logger.error(f"[LinuxKiller] Linux关闭应用程序失败: {e}")
         return False
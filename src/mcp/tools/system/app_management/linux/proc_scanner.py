@@ -0,0 +1,181 @@
+"""基于 /proc 的Linux进程扫描器.
+
+直接读取 /proc/<pid>/stat 和 /proc/<pid>/cmdline 获取进程信息，替代 ps 子进程。
+进程信息和分类结果按 (pid, 启动时间) 缓存：每次刷新只读取各进程的 stat 判断是否为新进程，
+只有新进程才读取 cmdline 并分类，pid 被复用时启动时间不同会重新处理。
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+PROC_DIR = "/proc"
+
+
+class ProcessInfo:
+    """
+    进程信息（字段含义与 ps -eo pid,ppid,comm,command 一致）
+    """
+
+    __slots__ = ("pid", "ppid", "comm", "command", "start_time")
+
+    def __init__(self, pid: int, ppid: int, comm: str, command: str, start_time: int):
+        self.pid = pid
+        self.ppid = ppid
+        self.comm = comm
+        self.command = command
+        self.start_time = start_time
+
+
+def _read_stat(pid: int) -> Optional[Tuple[str, int, int]]:
+    """读取 /proc/<pid>/stat.
+
+    Returns:
+        (comm, ppid, starttime)，进程已退出时返回 None
+    """
+    try:
+        with open(f"{PROC_DIR}/{pid}/stat", "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    # comm 位于括号内且可能包含空格和括号，以最后一个 ")" 为界
+    left = data.find(b"(")
+    right = data.rfind(b")")
+    if left < 0 or right < 0:
+        return None
+    # 与 ps 一致截断到 15 个字符（新内核会给部分内核线程提供更长的名称）
+    comm = data[left + 1 : right][:15].decode("utf-8", "replace")
+    fields = data[right + 2 :].split()
+    try:
+        # fields[0] 为 state，ppid 为第4个字段，starttime 为第22个字段
+        return comm, int(fields[1]), int(fields[19])
+    except (IndexError, ValueError):
+        return None
+
+
+def _read_cmdline(pid: int, comm: str) -> str:
+    """
+    读取完整命令行；内核线程没有命令行，与 ps 一样显示为 [comm]
+    """
+    try:
+        with open(f"{PROC_DIR}/{pid}/cmdline", "rb") as f:
+            data = f.read()
+    except OSError:
+        data = b""
+    if not data:
+        return f"[{comm}]"
+    return data.rstrip(b"\0").replace(b"\0", b" ").decode("utf-8", "replace")
+
+
+class ProcessTable:
+    """
+    增量刷新的进程表.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._processes: Dict[int, ProcessInfo] = {}
+        # 分类器名称 -> {pid: (启动时间, 分类结果)}
+        self._classified: Dict[str, Dict[int, Tuple[int, Any]]] = {}
+
+    @staticmethod
+    def is_available() -> bool:
+        return os.path.isdir(PROC_DIR)
+
+    def refresh(self) -> List[ProcessInfo]:
+        """
+        刷新进程表，返回当前所有进程.
+        """
+        with self._lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self) -> List[ProcessInfo]:
+        current: Dict[int, ProcessInfo] = {}
+        new_count = 0
+
+        for entry in os.listdir(PROC_DIR):
+            if not entry.isdigit():
+                continue
+            pid = int(entry)
+            stat = _read_stat(pid)
+            if stat is None:
+                continue
+            comm, ppid, start_time = stat
+
+            info = self._processes.get(pid)
+            if info is not None and info.start_time == start_time and info.comm == comm:
+                # 已知进程，只更新可能变化的父进程
+                info.ppid = ppid
+            else:
+                if info is not None and info.start_time == start_time:
+                    # 同一进程 exec 了新程序（如 sh -c "exec app"），旧分类结果作废
+                    for results in self._classified.values():
+                        results.pop(pid, None)
+                info = ProcessInfo(
+                    pid, ppid, comm, _read_cmdline(pid, comm), start_time
+                )
+                new_count += 1
+            current[pid] = info
+
+        # 清理已退出进程的分类结果
+        for results in self._classified.values():
+            for pid in [p for p in results if p not in current]:
+                del results[pid]
+
+        self._processes = current
+        if new_count:
+            logger.debug(
+                f"[ProcScanner] 进程表已刷新: 共 {len(current)} 个，新增 {new_count} 个"
+            )
+        return list(current.values())
+
+    def classify(
+        self, name: str, classifier: Callable[[ProcessInfo], Any]
+    ) -> List[Tuple[ProcessInfo, Any]]:
+        """刷新进程表并对进程分类，只有新进程才调用 classifier.
+
+        Args:
+            name: 分类器名称（不同用途的分类结果分别缓存）
+            classifier: 分类函数，返回 None 表示排除该进程
+
+        Returns:
+            [(进程信息, 分类结果), ...]，按 pid 排序
+        """
+        with self._lock:
+            processes = self._refresh_locked()
+            results = self._classified.setdefault(name, {})
+
+            matched = []
+            for info in processes:
+                cached = results.get(info.pid)
+                if cached is None or cached[0] != info.start_time:
+                    try:
+                        value = classifier(info)
+                    except Exception as e:
+                        logger.debug(f"[ProcScanner] 分类进程失败 {info.pid}: {e}")
+                        value = None
+                    cached = (info.start_time, value)
+                    results[info.pid] = cached
+                if cached[1] is not None:
+                    matched.append((info, cached[1]))
+
+        matched.sort(key=lambda item: item[0].pid)
+        return matched
+
+
+_process_table: Optional[ProcessTable] = None
+
+
+def get_process_table() -> ProcessTable:
+    """
+    获取进程表单例.
+    """
+    global _process_table
+    if _process_table is None:
+        _process_table = ProcessTable()
+    return _process_table
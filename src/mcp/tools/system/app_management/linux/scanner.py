@@ -4,15 +4,35 @@
 """
 
 import platform
-import subprocess
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 from src.utils.logging_config import get_logger
 
+from ..utils import directory_fingerprint
+from .proc_scanner import ProcessInfo, get_process_table
+
 logger = get_logger(__name__)
 
 
+def _get_desktop_dirs() -> List[Path]:
+    """
+    .desktop 文件所在目录.
+    """
+    return [
+        Path("/usr/share/applications"),
+        Path("/usr/local/share/applications"),
+        Path.home() / ".local/share/applications",
+    ]
+
+
+def get_change_fingerprint() -> str:
+    """
+    已安装应用变化指纹：.desktop 目录的修改时间（增删文件时变化）
+    """
+    return directory_fingerprint(_get_desktop_dirs())
+
+
 def scan_installed_applications() -> List[Dict[str, str]]:
     """扫描Linux系统中已安装的应用程序.
 
@@ -25,14 +45,7 @@ def scan_installed_applications() -> List[Dict[str, str]]:
     apps = []
 
     # 扫描 .desktop 文件
-    desktop_dirs = [
-        "/usr/share/applications",
-        "/usr/local/share/applications",
-        Path.home() / ".local/share/applications",
-    ]
-
-    for desktop_dir in desktop_dirs:
-        desktop_path = Path(desktop_dir)
+    for desktop_path in _get_desktop_dirs():
         if desktop_path.exists():
             for desktop_file in desktop_path.glob("*.desktop"):
                 try:
@@ -98,40 +111,21 @@ def scan_running_applications() -> List[Dict[str, str]]:
     if platform.system() != "Linux":
         return []
 
-    apps = []
-
     try:
-        # 使用ps命令获取进程信息
-        result = subprocess.run(
-            ["ps", "-eo", "pid,ppid,comm,command"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-
-        if result.returncode == 0:
-            lines = result.stdout.strip().split("\n")[1:]  # 跳过标题行
-
-            for line in lines:
-                parts = line.strip().split(None, 3)
-                if len(parts) >= 4:
-                    pid, ppid, comm, command = parts
-
-                    # 过滤掉不需要的进程
-                    if _should_include_process(comm, command):
-                        display_name = _extract_app_name(comm, command)
-                        clean_name = _clean_app_name(display_name)
-
-                        apps.append(
-                            {
-                                "pid": int(pid),
-                                "ppid": int(ppid),
-                                "name": clean_name,
-                                "display_name": display_name,
-                                "command": command,
-                                "type": "application",
-                            }
-                        )
+        # 读取 /proc 进程表，只对新进程做过滤和名称提取
+        processes = get_process_table().classify("scanner", _classify_running_process)
+
+        apps = [
+            {
+                "pid": info.pid,
+                "ppid": info.ppid,
+                "name": clean_name,
+                "display_name": display_name,
+                "command": info.command,
+                "type": "application",
+            }
+            for info, (display_name, clean_name) in processes
+        ]
 
         logger.info(f"[LinuxScanner] 找到 {len(apps)} 个正在运行的应用程序")
         return apps
@@ -141,6 +135,16 @@ def scan_running_applications() -> List[Dict[str, str]]:
         return []
 
 
+def _classify_running_process(info: ProcessInfo) -> Optional[Tuple[str, str]]:
+    """
+    过滤进程并提取应用名称，返回 (显示名称, 清理后名称)，不需要的进程返回 None.
+    """
+    if not _should_include_process(info.comm, info.command):
+        return None
+    display_name = _extract_app_name(info.comm, info.command)
+    return display_name, _clean_app_name(display_name)
+
+
 def _parse_desktop_file(desktop_file: Path) -> Dict[str, str]:
     """解析.desktop文件.
 
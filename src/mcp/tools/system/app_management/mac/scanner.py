@@ -10,9 +10,18 @@ from typing import Dict, List
 
 from src.utils.logging_config import get_logger
 
+from ..utils import directory_fingerprint
+
 logger = get_logger(__name__)
 
 
+def get_change_fingerprint() -> str:
+    """
+    已安装应用变化指纹：应用程序目录的修改时间（安装/删除 .app 时变化）
+    """
+    return directory_fingerprint([Path("/Applications"), Path.home() / "Applications"])
+
+
 def scan_installed_applications() -> List[Dict[str, str]]:
     """扫描macOS系统中已安装的应用程序.
 
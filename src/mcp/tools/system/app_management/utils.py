@@ -3,19 +3,40 @@
 提供统一的应用程序匹配、查找和缓存功能
 """
 
+import asyncio
+import hashlib
+import json
+import os
 import platform
 import re
 import time
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from src.utils.logging_config import get_logger
+from src.utils.resource_finder import get_user_cache_dir
 
 logger = get_logger(__name__)
 
-# 全局应用缓存
+# 全局应用缓存（应用目录/注册表发生变化时才重新扫描）
 _cached_applications: Optional[List[Dict[str, Any]]] = None
 _cache_timestamp: float = 0
-_cache_duration = 300  # 缓存5分钟
+_cache_fingerprint: Optional[str] = None
+_last_check_time: float = 0
+_check_interval = 5  # 两次变化检测的最小间隔（秒）
+
+# 持久化快照，冷启动时指纹未变化则无需重新扫描
+_SNAPSHOT_FILE = "installed_apps.json"
+_SNAPSHOT_VERSION = 1
+
+# 已安装应用的匹配索引（随应用缓存一起重建）
+_app_index: Optional["AppIndex"] = None
+
+# 预编译的名称标准化正则
+_VERSION_RE = re.compile(r"\s+v?\d+[\.\d]*")
+_PAREN_NUMBER_RE = re.compile(r"\s*\(\d+\)")
+_BRACKET_RE = re.compile(r"\s*\[.*?\]")
+_NON_WORD_RE = re.compile(r"[^a-zA-Z0-9\u4e00-\u9fff]")
 
 
 class AppMatcher:
@@ -125,9 +146,9 @@ class AppMatcher:
         name = name.lower().replace(".exe", "")
 
         # 移除版本号和特殊字符
-        name = re.sub(r"\s+v?\d+[\.\d]*", "", name)
-        name = re.sub(r"\s*\(\d+\)", "", name)
-        name = re.sub(r"\s*\[.*?\]", "", name)
+        name = _VERSION_RE.sub("", name)
+        name = _PAREN_NUMBER_RE.sub("", name)
+        name = _BRACKET_RE.sub("", name)
         name = " ".join(name.split())
 
         return name.strip()
@@ -164,75 +185,7 @@ class AppMatcher:
         if not target_name or not app_info:
             return 0
 
-        target_lower = target_name.lower()
-        app_name = app_info.get("name", "").lower()
-        display_name = app_info.get("display_name", "").lower()
-        window_title = app_info.get("window_title", "").lower()
-        exe_path = app_info.get("command", "").lower()
-
-        # 1. 精确匹配 (100分)
-        if target_lower == app_name or target_lower == display_name:
-            return 100
-
-        # 2. 特殊映射匹配 (95-98分) - 优先匹配更具体的关键词
-        best_special_score = 0
-
-        for key in cls.SPECIAL_MAPPINGS:
-            if key in target_lower or target_lower == key:
-                # 检查是否有匹配的别名
-                for alias in cls.SPECIAL_MAPPINGS[key]:
-                    if alias.lower() in app_name or alias.lower() in display_name:
-                        # 计算匹配度：更具体的匹配得分更高
-                        if target_lower == key:
-                            score = 98  # 精确匹配特殊映射键
-                        elif len(key) > len(target_lower) * 0.8:
-                            score = 97  # 长度相近的匹配
-                        else:
-                            score = 95  # 一般特殊映射匹配
-
-                        if score > best_special_score:
-                            best_special_score = score
-
-        if best_special_score > 0:
-            return best_special_score
-
-        # 3. 标准化名称匹配 (90分)
-        normalized_target = cls.normalize_name(target_name)
-        normalized_app = cls.normalize_name(app_info.get("name", ""))
-        normalized_display = cls.normalize_name(app_info.get("display_name", ""))
-
-        if (
-            normalized_target == normalized_app
-            or normalized_target == normalized_display
-        ):
-            return 90
-
-        # 4. 包含匹配 (70-80分)
-        if target_lower in app_name:
-            return 80
-        if target_lower in display_name:
-            return 75
-        if app_name and app_name in target_lower:
-            # 避免短名称误匹配长名称
-            if len(app_name) < len(target_lower) * 0.5:
-                return 50  # 降低分数
-            return 70
-
-        # 5. 窗口标题匹配 (60分)
-        if window_title and target_lower in window_title:
-            return 60
-
-        # 6. 路径匹配 (50分)
-        if exe_path and target_lower in exe_path:
-            return 50
-
-        # 7. 模糊匹配 (30分)
-        if cls._fuzzy_match(target_lower, app_name) or cls._fuzzy_match(
-            target_lower, display_name
-        ):
-            return 30
-
-        return 0
+        return _score(_AppQuery(target_name), _AppEntry(app_info))
 
     @classmethod
     def _fuzzy_match(cls, target: str, candidate: str) -> bool:
@@ -243,40 +196,426 @@ class AppMatcher:
             return False
 
         # 移除所有非字母数字字符进行比较
-        target_clean = re.sub(r"[^a-zA-Z0-9\u4e00-\u9fff]", "", target)
-        candidate_clean = re.sub(r"[^a-zA-Z0-9\u4e00-\u9fff]", "", candidate)
+        target_clean = _NON_WORD_RE.sub("", target)
+        candidate_clean = _NON_WORD_RE.sub("", candidate)
 
         return target_clean in candidate_clean or candidate_clean in target_clean
 
 
+class _AppEntry:
+    """
+    预处理后的应用信息（小写、标准化、去符号的名称）
+    """
+
+    __slots__ = (
+        "app",
+        "name",
+        "display_name",
+        "window_title",
+        "command",
+        "normalized_name",
+        "normalized_display",
+        "clean_name",
+        "clean_display",
+    )
+
+    def __init__(self, app_info: Dict[str, Any]):
+        self.app = app_info
+        self.name = app_info.get("name", "").lower()
+        self.display_name = app_info.get("display_name", "").lower()
+        self.window_title = app_info.get("window_title", "").lower()
+        self.command = app_info.get("command", "").lower()
+        self.normalized_name = AppMatcher.normalize_name(app_info.get("name", ""))
+        self.normalized_display = AppMatcher.normalize_name(
+            app_info.get("display_name", "")
+        )
+        self.clean_name = _NON_WORD_RE.sub("", self.name)
+        self.clean_display = _NON_WORD_RE.sub("", self.display_name)
+
+
+class _AppQuery:
+    """
+    预处理后的查询（每次查询只计算一次）
+    """
+
+    __slots__ = ("lower", "normalized", "clean", "special")
+
+    def __init__(self, target_name: str):
+        self.lower = target_name.lower()
+        self.normalized = AppMatcher.normalize_name(target_name)
+        self.clean = _NON_WORD_RE.sub("", self.lower)
+
+        # 命中的特殊映射：(分数, 别名列表)，按分数从高到低排列
+        special = []
+        for key, aliases in AppMatcher.SPECIAL_MAPPINGS.items():
+            if key in self.lower:
+                # 计算匹配度：更具体的匹配得分更高
+                if self.lower == key:
+                    score = 98  # 精确匹配特殊映射键
+                elif len(key) > len(self.lower) * 0.8:
+                    score = 97  # 长度相近的匹配
+                else:
+                    score = 95  # 一般特殊映射匹配
+                special.append((score, [alias.lower() for alias in aliases]))
+        special.sort(key=lambda item: item[0], reverse=True)
+        self.special: List[Tuple[int, List[str]]] = special
+
+
+def _score(query: _AppQuery, entry: _AppEntry) -> int:
+    """
+    计算匹配度分数 (0-100)，规则见 AppMatcher.match_application.
+    """
+    target = query.lower
+    app_name = entry.name
+    display_name = entry.display_name
+
+    # 1. 精确匹配 (100分)
+    if target == app_name or target == display_name:
+        return 100
+
+    # 2. 特殊映射匹配 (95-98分) - 优先匹配更具体的关键词
+    for score, aliases in query.special:
+        for alias in aliases:
+            if alias in app_name or alias in display_name:
+                return score
+
+    # 3. 标准化名称匹配 (90分)
+    if query.normalized in (entry.normalized_name, entry.normalized_display):
+        return 90
+
+    # 4. 包含匹配 (70-80分)
+    if target in app_name:
+        return 80
+    if target in display_name:
+        return 75
+    if app_name and app_name in target:
+        # 避免短名称误匹配长名称
+        if len(app_name) < len(target) * 0.5:
+            return 50  # 降低分数
+        return 70
+
+    # 5. 窗口标题匹配 (60分)
+    if entry.window_title and target in entry.window_title:
+        return 60
+
+    # 6. 路径匹配 (50分)
+    if entry.command and target in entry.command:
+        return 50
+
+    # 7. 模糊匹配 (30分)
+    for raw, clean in (
+        (app_name, entry.clean_name),
+        (display_name, entry.clean_display),
+    ):
+        if target and raw and (query.clean in clean or clean in query.clean):
+            return 30
+
+    return 0
+
+
+def _bigrams(text: str) -> Set[str]:
+    return {text[i : i + 2] for i in range(len(text) - 1)}
+
+
+def _substrings(text: str) -> Iterable[str]:
+    for i in range(len(text)):
+        for j in range(i + 1, len(text) + 1):
+            yield text[i:j]
+
+
+class AppIndex:
+    """应用程序匹配索引.
+
+    每次扫描后构建一次：预先标准化所有名称，建立 精确名称/标准化名称/去符号名称 映射和
+    字符二元组倒排索引。查询时先收集可能得分的候选应用，只对候选计算分数，
+    结果与对全部应用逐个调用 AppMatcher.match_application 一致。
+    """
+
+    def __init__(self, applications: List[Dict[str, Any]]):
+        self.applications = applications
+        self._entries = [_AppEntry(app) for app in applications]
+
+        # 名称 -> 应用序号
+        self._by_name: Dict[str, Set[int]] = {}
+        self._by_normalized: Dict[str, Set[int]] = {}
+        self._by_clean: Dict[str, Set[int]] = {}
+        # 二元组倒排索引：名称/显示名、窗口标题+路径、去符号名称分开建立
+        self._name_grams: Dict[str, Set[int]] = {}
+        self._extra_grams: Dict[str, Set[int]] = {}
+        self._clean_grams: Dict[str, Set[int]] = {}
+        # 去符号后为空的名称可被任何查询模糊匹配
+        self._empty_clean: Set[int] = set()
+
+        for i, entry in enumerate(self._entries):
+            for name in (entry.name, entry.display_name):
+                if name:
+                    self._by_name.setdefault(name, set()).add(i)
+                    self._add_grams(self._name_grams, name, i)
+            for name in (entry.normalized_name, entry.normalized_display):
+                self._by_normalized.setdefault(name, set()).add(i)
+            for raw, clean in (
+                (entry.name, entry.clean_name),
+                (entry.display_name, entry.clean_display),
+            ):
+                if not raw:
+                    continue
+                if clean:
+                    self._by_clean.setdefault(clean, set()).add(i)
+                    self._add_grams(self._clean_grams, clean, i)
+                else:
+                    self._empty_clean.add(i)
+            for text in (entry.window_title, entry.command):
+                if text:
+                    self._add_grams(self._extra_grams, text, i)
+
+    @staticmethod
+    def _add_grams(postings: Dict[str, Set[int]], text: str, i: int):
+        for gram in _bigrams(text):
+            postings.setdefault(gram, set()).add(i)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _containing(
+        self, postings: Dict[str, Set[int]], text: str
+    ) -> Optional[Set[int]]:
+        """
+        可能包含 text 的应用（二元组求交集）；text 太短无法过滤时返回 None.
+        """
+        grams = _bigrams(text)
+        if not grams:
+            return None
+        result = None
+        for gram in sorted(grams, key=lambda g: len(postings.get(g, ()))):
+            ids = postings.get(gram)
+            if not ids:
+                return set()
+            result = set(ids) if result is None else result & ids
+            if not result:
+                break
+        return result
+
+    def _candidates(self, query: _AppQuery) -> Optional[Set[int]]:
+        """
+        收集可能得分的应用序号；无法有效过滤时返回 None（全部评分）
+        """
+        target = query.lower
+        if len(target) < 2 or not query.clean or len(query.clean) < 2:
+            return None
+
+        candidates: Set[int] = set()
+
+        # 精确/标准化名称
+        candidates |= self._by_name.get(target, set())
+        candidates |= self._by_normalized.get(query.normalized, set())
+
+        # 特殊映射别名包含于名称中
+        for _, aliases in query.special:
+            for alias in aliases:
+                ids = self._containing(self._name_grams, alias)
+                if ids is None:
+                    return None
+                candidates |= ids
+
+        # 查询包含于名称/标题/路径中
+        candidates |= self._containing(self._name_grams, target)
+        candidates |= self._containing(self._extra_grams, target)
+        candidates |= self._containing(self._clean_grams, query.clean)
+
+        # 名称包含于查询中（查询很短，枚举其子串）
+        for sub in set(_substrings(target)):
+            candidates |= self._by_name.get(sub, set())
+        for sub in set(_substrings(query.clean)):
+            candidates |= self._by_clean.get(sub, set())
+        candidates |= self._empty_clean
+
+        return candidates
+
+    def match(self, target_name: str) -> List[Tuple[int, Dict[str, Any]]]:
+        """查找匹配的应用程序.
+
+        Returns:
+            [(分数, 应用信息), ...]，按分数从高到低排列，同分保持扫描顺序
+        """
+        if not target_name:
+            return []
+
+        query = _AppQuery(target_name)
+        candidates = self._candidates(query)
+        ids = range(len(self._entries)) if candidates is None else sorted(candidates)
+
+        matches = []
+        for i in ids:
+            entry = self._entries[i]
+            score = _score(query, entry)
+            if score > 0:
+                matches.append((score, entry.app))
+
+        matches.sort(key=lambda x: x[0], reverse=True)
+        return matches
+
+
+def directory_fingerprint(
+    paths: Iterable, recursive: bool = False, extra: Iterable[str] = ()
+) -> str:
+    """计算目录变化指纹.
+
+    目录中新增、删除或重命名文件时目录的修改时间会变化，只需对目录本身 stat，
+    无需读取其中的文件。
+
+    Args:
+        paths: 监视的目录
+        recursive: 是否包含所有子目录
+        extra: 附加的变化标识（如注册表键的写入时间）
+    """
+    parts = []
+    pending = [str(p) for p in paths]
+    while pending:
+        path = pending.pop()
+        try:
+            parts.append(f"{path}:{os.stat(path).st_mtime_ns}")
+        except OSError:
+            parts.append(f"{path}:-")
+            continue
+        if recursive:
+            try:
+                with os.scandir(path) as entries:
+                    pending.extend(
+                        entry.path
+                        for entry in entries
+                        if entry.is_dir(follow_symlinks=False)
+                    )
+            except OSError:
+                pass
+    parts.sort()
+    parts.extend(extra)
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def _compute_fingerprint() -> Optional[str]:
+    """
+    当前系统已安装应用的变化指纹，扫描器不支持时返回 None.
+    """
+    scanner = get_system_scanner()
+    if scanner is None or not hasattr(scanner, "get_change_fingerprint"):
+        return None
+    try:
+        return f"{platform.system()}:{scanner.get_change_fingerprint()}"
+    except Exception as e:
+        logger.debug(f"[AppUtils] 计算应用变化指纹失败: {e}")
+        return None
+
+
+def _get_snapshot_path() -> Path:
+    return get_user_cache_dir() / _SNAPSHOT_FILE
+
+
+def _load_snapshot() -> Optional[Dict[str, Any]]:
+    """
+    读取持久化的应用列表快照.
+    """
+    try:
+        with open(_get_snapshot_path(), "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        if snapshot.get("version") != _SNAPSHOT_VERSION:
+            return None
+        return snapshot
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.debug(f"[AppUtils] 读取应用快照失败: {e}")
+        return None
+
+
+def _save_snapshot(applications: List[Dict[str, Any]], fingerprint: str):
+    """
+    原子写入应用列表快照.
+    """
+    path = _get_snapshot_path()
+    tmp_path = path.with_suffix(".tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": _SNAPSHOT_VERSION,
+                    "fingerprint": fingerprint,
+                    "scanned_at": time.time(),
+                    "applications": applications,
+                },
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning(f"[AppUtils] 保存应用快照失败: {e}")
+
+
+async def _is_cache_current() -> bool:
+    """检查内存缓存是否仍然有效.
+
+    两次检测间隔不足 _check_interval 时直接视为有效；系统不支持变化检测时退化为
+    5分钟过期。
+    """
+    global _last_check_time
+
+    if _cached_applications is None:
+        return False
+
+    current_time = time.time()
+    if current_time - _last_check_time < _check_interval:
+        return True
+    _last_check_time = current_time
+
+    if _cache_fingerprint is None:
+        return current_time - _cache_timestamp < 300
+
+    fingerprint = await asyncio.to_thread(_compute_fingerprint)
+    if fingerprint != _cache_fingerprint:
+        logger.info("[AppUtils] 检测到已安装应用发生变化")
+        return False
+    return True
+
+
 async def get_cached_applications(force_refresh: bool = False) -> List[Dict[str, Any]]:
     """获取缓存的应用程序列表.
 
+    应用目录（.desktop 目录、开始菜单、/Applications）或注册表发生变化时才重新扫描；
+    冷启动时优先使用持久化快照。
+
     Args:
         force_refresh: 是否强制刷新缓存
 
     Returns:
         应用程序列表
     """
-    global _cached_applications, _cache_timestamp
-
-    current_time = time.time()
+    global _cached_applications, _cache_timestamp, _cache_fingerprint, _app_index
+    global _last_check_time
 
-    # 检查缓存是否有效
-    if (
-        not force_refresh
-        and _cached_applications is not None
-        and (current_time - _cache_timestamp) < _cache_duration
-    ):
+    if not force_refresh and await _is_cache_current():
         logger.debug(
-            f"[AppUtils] 使用缓存的应用程序列表，缓存时间: {int(current_time - _cache_timestamp)}秒前"
+            f"[AppUtils] 使用缓存的应用程序列表，"
+            f"扫描时间: {int(time.time() - _cache_timestamp)}秒前"
         )
         return _cached_applications
 
+    fingerprint = await asyncio.to_thread(_compute_fingerprint)
+
+    # 冷启动：快照指纹与当前一致时直接使用
+    if not force_refresh and _cached_applications is None and fingerprint:
+        snapshot = await asyncio.to_thread(_load_snapshot)
+        if snapshot and snapshot.get("fingerprint") == fingerprint:
+            _cached_applications = snapshot.get("applications", [])
+            _cache_timestamp = snapshot.get("scanned_at", time.time())
+            _cache_fingerprint = fingerprint
+            _last_check_time = time.time()
+            _app_index = None
+            logger.info(
+                f"[AppUtils] 从快照加载应用程序列表，共 {len(_cached_applications)} 个应用"
+            )
+            return _cached_applications
+
     # 重新扫描应用程序
     try:
-        import json
-
         from .scanner import scan_installed_applications
 
         logger.info("[AppUtils] 刷新应用程序缓存")
@@ -287,7 +626,14 @@ async def get_cached_applications(force_refresh: bool = False) -> List[Dict[str,
 
         if result.get("success", False):
             _cached_applications = result.get("applications", [])
-            _cache_timestamp = current_time
+            _cache_timestamp = time.time()
+            _cache_fingerprint = fingerprint
+            _last_check_time = _cache_timestamp
+            _app_index = None
+            if fingerprint:
+                await asyncio.to_thread(
+                    _save_snapshot, _cached_applications, fingerprint
+                )
             logger.info(
                 f"[AppUtils] 应用程序缓存已刷新，找到 {len(_cached_applications)} 个应用"
             )
@@ -303,6 +649,19 @@ async def get_cached_applications(force_refresh: bool = False) -> List[Dict[str,
         return _cached_applications or []
 
 
+async def get_app_index(force_refresh: bool = False) -> "AppIndex":
+    """
+    获取已安装应用的匹配索引，应用缓存刷新后重建.
+    """
+    global _app_index
+
+    applications = await get_cached_applications(force_refresh)
+    if _app_index is None or _app_index.applications is not applications:
+        _app_index = AppIndex(applications)
+        logger.debug(f"[AppUtils] 应用匹配索引已重建，共 {len(_app_index)} 个应用")
+    return _app_index
+
+
 async def find_best_matching_app(
     app_name: str, app_type: str = "any"
 ) -> Optional[Dict[str, Any]]:
@@ -318,8 +677,6 @@ async def find_best_matching_app(
     try:
         if app_type == "running":
             # 获取正在运行的应用程序
-            import json
-
             from .scanner import list_running_applications
 
             result_json = await list_running_applications({})
@@ -329,25 +686,21 @@ async def find_best_matching_app(
                 return None
 
             applications = result.get("applications", [])
+            if not applications:
+                return None
+            index = AppIndex(applications)
         else:
-            # 获取已安装的应用程序
-            applications = await get_cached_applications()
+            # 获取已安装的应用程序索引
+            index = await get_app_index()
 
-        if not applications:
+        if not len(index):
             return None
 
-        # 计算所有应用的匹配度
-        matches = []
-        for app in applications:
-            score = AppMatcher.match_application(app_name, app)
-            if score > 0:
-                matches.append((score, app))
-
+        # 只对候选应用计算匹配度，按分数排序
+        matches = index.match(app_name)
         if not matches:
             return None
 
-        # 按分数排序，返回最佳匹配
-        matches.sort(key=lambda x: x[0], reverse=True)
         best_score, best_app = matches[0]
 
         logger.info(
@@ -364,10 +717,16 @@ def clear_app_cache():
     """
     清空应用程序缓存.
     """
-    global _cached_applications, _cache_timestamp
+    global _cached_applications, _cache_timestamp, _cache_fingerprint, _app_index
 
     _cached_applications = None
     _cache_timestamp = 0
+    _cache_fingerprint = None
+    _app_index = None
+    try:
+        _get_snapshot_path().unlink()
+    except OSError:
+        pass
     logger.info("[AppUtils] 应用程序缓存已清空")
 
 
@@ -383,8 +742,8 @@ def get_cache_info() -> Dict[str, Any]:
         "cached": _cached_applications is not None,
         "count": len(_cached_applications) if _cached_applications else 0,
         "age_seconds": int(cache_age) if cache_age >= 0 else None,
-        "valid": cache_age >= 0 and cache_age < _cache_duration,
-        "cache_duration": _cache_duration,
+        "change_tracking": _cache_fingerprint is not None,
+        "check_interval": _check_interval,
     }
 
 
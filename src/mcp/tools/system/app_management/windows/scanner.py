@@ -11,8 +11,59 @@ from typing import Dict, List, Optional
 
 from src.utils.logging_config import get_logger
 
+from ..utils import directory_fingerprint
+
 logger = get_logger(__name__)
 
+# 已安装程序的注册表位置（与 _scan_main_registry_apps 扫描的位置一致）
+UNINSTALL_KEY = r"Software\Microsoft\Windows\CurrentVersion\Uninstall"
+
+
+def _get_start_menu_paths() -> List[str]:
+    """
+    开始菜单目录.
+    """
+    return [
+        os.path.join(
+            os.environ.get("PROGRAMDATA", ""),
+            "Microsoft",
+            "Windows",
+            "Start Menu",
+            "Programs",
+        ),
+        os.path.join(
+            os.environ.get("APPDATA", ""),
+            "Microsoft",
+            "Windows",
+            "Start Menu",
+            "Programs",
+        ),
+    ]
+
+
+def _registry_fingerprint() -> str:
+    """
+    卸载信息注册表键的子键数量和最后写入时间（安装/卸载程序时变化）
+    """
+    try:
+        import winreg
+
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, UNINSTALL_KEY) as key:
+            subkeys, _, last_modified = winreg.QueryInfoKey(key)
+        return f"{subkeys}:{last_modified}"
+    except OSError as e:
+        logger.debug(f"[WindowsScanner] 读取注册表变化信息失败: {e}")
+        return ""
+
+
+def get_change_fingerprint() -> str:
+    """
+    已安装应用变化指纹：开始菜单目录树的修改时间 + 卸载信息注册表键的写入时间.
+    """
+    return directory_fingerprint(
+        _get_start_menu_paths(), recursive=True, extra=[_registry_fingerprint()]
+    )
+
 
 def scan_installed_applications() -> List[Dict[str, str]]:
     """扫描Windows系统中已安装的应用程序.
@@ -160,25 +211,7 @@ def _scan_main_start_menu_apps() -> List[Dict[str, str]]:
     """
     apps = []
 
-    # 开始菜单目录
-    start_menu_paths = [
-        os.path.join(
-            os.environ.get("PROGRAMDATA", ""),
-            "Microsoft",
-            "Windows",
-            "Start Menu",
-            "Programs",
-        ),
-        os.path.join(
-            os.environ.get("APPDATA", ""),
-            "Microsoft",
-            "Windows",
-            "Start Menu",
-            "Programs",
-        ),
-    ]
-
-    for start_path in start_menu_paths:
+    for start_path in _get_start_menu_paths():
         if os.path.exists(start_path):
             try:
                 for root, dirs, files in os.walk(start_path):
@@ -1,32 +1,164 @@
 """倒计时器服务.
 
-管理倒计时任务的创建、执行、取消和状态查询
+管理倒计时任务的创建、执行、取消和状态查询。所有计时器按到期时间放在一个最小堆中，由单个
+调度任务休眠到最近的到期时间；计时器持久化到用户数据目录，应用重启后恢复，重启期间错过的
+计时器按 TIMER_OPTIONS.MISSED_POLICY 处理。
 """
 
 import asyncio
+import heapq
 import json
-from asyncio import Task
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
+from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
+from src.utils.resource_finder import get_user_data_dir
 
 logger = get_logger(__name__)
 
+STORE_VERSION = 1
+
+# 错过的计时器处理策略
+MISSED_RUN = "run"  # 重启后立即执行（超出宽限时间的丢弃）
+MISSED_SKIP = "skip"  # 全部丢弃
+
 
 class TimerService:
     """
     倒计时器服务，管理所有倒计时任务.
     """
 
-    def __init__(self):
+    # 单次休眠上限（秒），便于及时感知系统时间调整
+    MAX_SLEEP = 60.0
+
+    def __init__(self, store_file: Optional[Path] = None):
         # 使用字典存储活动的计时器，键是 timer_id，值是 TimerTask 对象
         self._timers: Dict[int, "TimerTask"] = {}
+        # 到期时间最小堆: (到期时间戳, timer_id)，取消的计时器惰性删除
+        self._heap: List[Tuple[float, int]] = []
         self._next_timer_id = 0
-        # 使用锁来保护对 _timers 和 _next_timer_id 的访问，确保线程安全
+        # 使用锁来保护对 _timers、_heap 和 _next_timer_id 的访问
         self._lock = asyncio.Lock()
         self.DEFAULT_DELAY = 5  # 默认延迟秒数
 
+        self._store_file = store_file or get_user_data_dir() / "timers.json"
+        self._save_lock = asyncio.Lock()
+        # 恢复持久化计时器的任务；恢复完成前所有公开方法都等待它
+        self._start_task: Optional[asyncio.Task] = None
+        self._scheduler: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        # 到期执行中的任务（执行完毕即移除）
+        self._running: set = set()
+
+        config = ConfigManager.get_instance()
+        self._missed_policy = config.get_config(
+            "TIMER_OPTIONS.MISSED_POLICY", MISSED_RUN
+        )
+        self._missed_grace = float(
+            config.get_config("TIMER_OPTIONS.MISSED_GRACE_SECONDS", 600)
+        )
+
+    # -----------------------
+    # 生命周期
+    # -----------------------
+    async def start(self):
+        """
+        恢复持久化的计时器并启动调度任务（可重复调用，恢复完成后才返回）
+        """
+        if self._start_task is None:
+            self._start_task = asyncio.create_task(self._restore())
+        task = self._start_task
+        try:
+            # 调用方被取消时不中断恢复过程
+            await asyncio.shield(task)
+        except Exception:
+            # 恢复失败，下次调用时重试
+            if self._start_task is task:
+                self._start_task = None
+            raise
+
+    async def _restore(self):
+        """
+        从磁盘恢复计时器，按错过策略处理过期的计时器.
+        """
+        self._wakeup = asyncio.Event()
+
+        records = await asyncio.to_thread(self._load_store)
+        now = time.time()
+        restored = missed = dropped = 0
+        async with self._lock:
+            for record in records.get("timers", []):
+                try:
+                    timer_task = TimerTask.from_dict(record, self)
+                except (KeyError, TypeError, ValueError) as e:
+                    logger.warning(f"忽略无效的倒计时记录 {record}: {e}")
+                    continue
+                if timer_task.timer_id in self._timers:
+                    continue
+
+                overdue = now - timer_task.deadline
+                if overdue > 0:
+                    if (
+                        self._missed_policy == MISSED_SKIP
+                        or overdue > self._missed_grace
+                    ):
+                        logger.warning(
+                            f"丢弃重启期间错过的倒计时 {timer_task.timer_id}"
+                            f"（已过期 {overdue:.0f} 秒）: {timer_task.command}"
+                        )
+                        dropped += 1
+                        continue
+                    missed += 1
+
+                self._timers[timer_task.timer_id] = timer_task
+                self._heap.append((timer_task.deadline, timer_task.timer_id))
+                restored += 1
+
+            heapq.heapify(self._heap)
+            self._next_timer_id = max(
+                [int(records.get("next_id", 0))]
+                + [timer_id + 1 for timer_id in self._timers]
+            )
+
+        if restored or dropped:
+            logger.info(
+                f"已恢复 {restored} 个倒计时（其中 {missed} 个已过期将立即执行），"
+                f"丢弃 {dropped} 个"
+            )
+        if dropped:
+            await self._save()
+
+        self._scheduler = asyncio.create_task(self._run_scheduler())
+
+    async def stop(self):
+        """
+        停止调度（计时器保留在磁盘上，下次启动时恢复）
+        """
+        start_task, self._start_task = self._start_task, None
+        if start_task is not None and not start_task.done():
+            start_task.cancel()
+            try:
+                await start_task
+            except asyncio.CancelledError:
+                pass
+        if self._scheduler:
+            self._scheduler.cancel()
+            try:
+                await self._scheduler
+            except asyncio.CancelledError:
+                pass
+            self._scheduler = None
+        for task in list(self._running):
+            task.cancel()
+        self._running.clear()
+        async with self._lock:
+            self._timers.clear()
+            self._heap.clear()
+
     async def start_countdown(
         self, command: str, delay: int = None, description: str = ""
     ) -> Dict[str, Any]:
@@ -67,8 +199,7 @@ class TimerService:
                 "message": f"命令格式错误，无法解析JSON: {command}",
             }
 
-        # 获取当前事件循环
-        loop = asyncio.get_running_loop()
+        await self.start()
 
         async with self._lock:
             timer_id = self._next_timer_id
@@ -83,11 +214,13 @@ class TimerService:
                 service=self,
             )
 
-            # 创建异步任务
-            task = loop.create_task(timer_task.run())
-            timer_task.task = task
-
             self._timers[timer_id] = timer_task
+            heapq.heappush(self._heap, (timer_task.deadline, timer_id))
+            # 新计时器比当前最早的还早时需唤醒调度任务
+            if self._heap[0][1] == timer_id:
+                self._wakeup.set()
+
+        await self._save()
 
         logger.info(f"启动倒计时 {timer_id}，将在 {delay} 秒后执行命令: {command}")
 
@@ -98,10 +231,8 @@ class TimerService:
             "delay": delay,
             "command": command,
             "description": description,
-            "start_time": datetime.now().isoformat(),
-            "estimated_execution_time": (
-                datetime.now() + timedelta(seconds=delay)
-            ).isoformat(),
+            "start_time": timer_task.start_time.isoformat(),
+            "estimated_execution_time": timer_task.execution_time.isoformat(),
         }
 
     async def cancel_countdown(self, timer_id: int) -> Dict[str, Any]:
@@ -119,26 +250,28 @@ class TimerService:
             logger.error(f"取消倒计时失败：无效的 timer_id {timer_id}")
             return {"success": False, "message": f"无效的 timer_id: {timer_id}"}
 
+        await self.start()
+
         async with self._lock:
-            if timer_id in self._timers:
-                timer_task = self._timers.pop(timer_id)
-                if timer_task.task:
-                    timer_task.task.cancel()
-
-                logger.info(f"倒计时 {timer_id} 已成功取消")
-                return {
-                    "success": True,
-                    "message": f"倒计时 {timer_id} 已取消",
-                    "timer_id": timer_id,
-                    "cancelled_at": datetime.now().isoformat(),
-                }
-            else:
-                logger.warning(f"尝试取消不存在或已完成的倒计时 {timer_id}")
-                return {
-                    "success": False,
-                    "message": f"找不到ID为 {timer_id} 的活动倒计时",
-                    "timer_id": timer_id,
-                }
+            # 堆中的条目在弹出时跳过
+            timer_task = self._timers.pop(timer_id, None)
+
+        if timer_task is None:
+            logger.warning(f"尝试取消不存在或已完成的倒计时 {timer_id}")
+            return {
+                "success": False,
+                "message": f"找不到ID为 {timer_id} 的活动倒计时",
+                "timer_id": timer_id,
+            }
+
+        await self._save()
+        logger.info(f"倒计时 {timer_id} 已成功取消")
+        return {
+            "success": True,
+            "message": f"倒计时 {timer_id} 已取消",
+            "timer_id": timer_id,
+            "cancelled_at": datetime.now().isoformat(),
+        }
 
     async def get_active_timers(self) -> Dict[str, Any]:
         """获取所有活动的倒计时任务状态.
@@ -146,11 +279,13 @@ class TimerService:
         Returns:
             Dict[str, Any]: 活动计时器列表
         """
+        await self.start()
+
         async with self._lock:
             active_timers = []
             current_time = datetime.now()
 
-            for timer_id, timer_task in self._timers.items():
+            for timer_id, timer_task in sorted(self._timers.items()):
                 remaining_time = timer_task.get_remaining_time()
                 if remaining_time > 0:
                     active_timers.append(
@@ -173,30 +308,117 @@ class TimerService:
                 "current_time": current_time.isoformat(),
             }
 
-    async def cleanup_timer(self, timer_id: int):
-        """
-        从管理器中移除已完成的计时器.
-        """
-        async with self._lock:
-            if timer_id in self._timers:
-                del self._timers[timer_id]
-                logger.debug(f"已清理完成的倒计时 {timer_id}")
-
     async def cleanup_all(self):
         """
-        清理所有倒计时任务（应用关闭时调用）
+        清理所有倒计时任务（应用关闭时调用，已持久化的计时器在下次启动时恢复）
         """
         logger.info("正在清理所有倒计时任务...")
-        async with self._lock:
-            active_timer_ids = list(self._timers.keys())
-            for timer_id in active_timer_ids:
-                if timer_id in self._timers:
-                    timer_task = self._timers.pop(timer_id)
-                    if timer_task.task:
-                        timer_task.task.cancel()
-                    logger.info(f"已取消倒计时任务 {timer_id}")
+        await self.stop()
         logger.info("倒计时任务清理完成")
 
+    # -----------------------
+    # 调度
+    # -----------------------
+    async def _run_scheduler(self):
+        """
+        单个调度任务：休眠到堆顶计时器到期，取出所有到期的计时器执行.
+        """
+        try:
+            while True:
+                async with self._lock:
+                    due = self._pop_due(time.time())
+                    timeout = self._next_timeout()
+                    self._wakeup.clear()
+
+                if due:
+                    for timer_task in due:
+                        task = asyncio.create_task(self._fire(timer_task))
+                        self._running.add(task)
+                        task.add_done_callback(self._running.discard)
+                    await self._save()
+                    continue
+
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        except asyncio.CancelledError:
+            pass
+
+    def _pop_due(self, now: float) -> List["TimerTask"]:
+        """
+        弹出所有已到期的计时器（调用方需持有锁）
+        """
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, timer_id = heapq.heappop(self._heap)
+            timer_task = self._timers.pop(timer_id, None)
+            if timer_task is not None:
+                due.append(timer_task)
+        return due
+
+    def _next_timeout(self) -> Optional[float]:
+        """
+        距最近到期的秒数，无计时器时返回 None（调用方需持有锁）
+        """
+        # 丢弃堆顶已取消的条目
+        while self._heap and self._heap[0][1] not in self._timers:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return None
+        return min(self.MAX_SLEEP, max(0.0, self._heap[0][0] - time.time()))
+
+    async def _fire(self, timer_task: "TimerTask"):
+        try:
+            await timer_task._execute_command()
+        except asyncio.CancelledError:
+            logger.info(f"倒计时 {timer_task.timer_id} 被取消")
+        except Exception as e:
+            logger.error(
+                f"倒计时 {timer_task.timer_id} 执行过程中出错: {e}", exc_info=True
+            )
+
+    # -----------------------
+    # 持久化
+    # -----------------------
+    async def _save(self):
+        """
+        将当前计时器写入磁盘（按调用顺序串行写入）
+        """
+        async with self._save_lock:
+            async with self._lock:
+                data = {
+                    "version": STORE_VERSION,
+                    "next_id": self._next_timer_id,
+                    "timers": [t.to_dict() for t in self._timers.values()],
+                }
+            try:
+                await asyncio.to_thread(self._write_store, data)
+            except OSError as e:
+                logger.error(f"保存倒计时失败: {e}")
+
+    def _load_store(self) -> dict:
+        try:
+            data = json.loads(self._store_file.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.error(f"读取倒计时存储失败 {self._store_file}: {e}")
+            return {}
+        if not isinstance(data, dict) or data.get("version") != STORE_VERSION:
+            logger.warning(f"忽略不兼容的倒计时存储: {self._store_file}")
+            return {}
+        return data
+
+    def _write_store(self, data: dict):
+        # 先写临时文件再替换，避免中途退出留下损坏的文件
+        temp_file = self._store_file.with_suffix(".tmp")
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self._store_file)
+
 
 class TimerTask:
     """
@@ -210,34 +432,44 @@ class TimerTask:
         delay: int,
         description: str,
         service: TimerService,
+        created_at: Optional[float] = None,
     ):
         self.timer_id = timer_id
         self.command = command
         self.delay = delay
         self.description = description
         self.service = service
-        self.start_time = datetime.now()
-        self.execution_time = self.start_time + timedelta(seconds=delay)
-        self.task: Optional[Task] = None
+        # 使用时间戳，便于持久化后跨进程恢复
+        self.created_at = time.time() if created_at is None else created_at
+        self.deadline = self.created_at + delay
 
-    async def run(self):
-        """
-        执行倒计时任务.
-        """
-        try:
-            # 等待延迟时间
-            await asyncio.sleep(self.delay)
+    @property
+    def start_time(self) -> datetime:
+        return datetime.fromtimestamp(self.created_at)
 
-            # 执行命令
-            await self._execute_command()
+    @property
+    def execution_time(self) -> datetime:
+        return datetime.fromtimestamp(self.deadline)
 
-        except asyncio.CancelledError:
-            logger.info(f"倒计时 {self.timer_id} 被取消")
-        except Exception as e:
-            logger.error(f"倒计时 {self.timer_id} 执行过程中出错: {e}", exc_info=True)
-        finally:
-            # 清理自己
-            await self.service.cleanup_timer(self.timer_id)
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "timer_id": self.timer_id,
+            "command": self.command,
+            "delay": self.delay,
+            "description": self.description,
+            "created_at": self.created_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], service: TimerService) -> "TimerTask":
+        return cls(
+            timer_id=int(data["timer_id"]),
+            command=str(data["command"]),
+            delay=int(data["delay"]),
+            description=data.get("description", ""),
+            service=service,
+            created_at=float(data["created_at"]),
+        )
 
     async def _execute_command(self):
         """
@@ -261,12 +493,7 @@ class TimerTask:
 
             mcp_server = McpServer.get_instance()
 
-            # 查找工具
-            tool = None
-            for t in mcp_server.tools:
-                if t.name == tool_name:
-                    tool = t
-                    break
+            tool = mcp_server.get_tool(tool_name)
 
             if not tool:
                 raise ValueError(f"MCP工具不存在: {tool_name}")
@@ -323,15 +550,13 @@ class TimerTask:
         """
         获取剩余时间（秒）
         """
-        now = datetime.now()
-        remaining = (self.execution_time - now).total_seconds()
-        return max(0, remaining)
+        return max(0, self.deadline - time.time())
 
     def get_progress(self) -> float:
         """
         获取进度（0-1之间的浮点数）
         """
-        elapsed = (datetime.now() - self.start_time).total_seconds()
+        elapsed = time.time() - self.created_at
         return min(1.0, elapsed / self.delay)
 
 
@@ -5,6 +5,7 @@ from typing import Any
 from src.audio_codecs.audio_codec import AudioCodec
 from src.constants.constants import DeviceState, ListeningMode
 from src.plugins.base import Plugin
+from src.utils import latency_tracer
 
 # from src.utils.opus_loader import setup_opus
 # setup_opus()
@@ -56,13 +57,21 @@ class AudioPlugin(Plugin):
                 pass
 
     async def on_incoming_json(self, message: Any) -> None:
-        # 示例：不处理
+        # TTS 结束：本段语音播完后的静音不计为播放中断
+        if (
+            self.codec
+            and isinstance(message, dict)
+            and message.get("type") == "tts"
+            and message.get("state") == "stop"
+        ):
+            self.codec.mark_playback_end()
         await asyncio.sleep(0)
 
     async def on_incoming_audio(self, data: bytes) -> None:
         if self.codec:
             try:
                 await self.codec.write_audio(data)
+                latency_tracer.get_latency_tracer().mark(latency_tracer.FIRST_DECODED)
             except Exception:
                 pass
 
@@ -8,13 +8,17 @@ class Plugin:
     """
 
     name: str = "plugin"
+    # setup 依赖的插件名称：这些插件 setup 完成后才开始本插件的 setup，其余插件并发执行
+    depends_on: tuple[str, ...] = ()
 
     def __init__(self) -> None:
         self._started = False
 
     async def setup(self, app: Any) -> None:
         """
-        插件准备阶段（在应用 run 早期调用）。
+        插件准备阶段（在应用 run 早期调用，与其它插件并发执行）。
+
+        耗时的同步操作（如加载模型）应放到线程中执行，避免阻塞其它插件。
         """
         await asyncio.sleep(0)
 
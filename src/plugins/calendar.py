@@ -36,6 +36,8 @@ class _AppAdapter:
 
 class CalendarPlugin(Plugin):
     name = "calendar"
+    # 提醒服务与 MCP 日程工具共用单例，等 MCP 工具注册完成后再接管
+    depends_on = ("mcp",)
 
     def __init__(self) -> None:
         super().__init__()
@@ -1,7 +1,14 @@
-from typing import Any, List
+import asyncio
+import time
+from typing import Any, List, Optional
+
+from src.utils.logging_config import get_logger
+from src.utils.startup_timeline import StartupTimeline
 
 from .base import Plugin
 
+logger = get_logger(__name__)
+
 
 class PluginManager:
     """
@@ -32,20 +39,74 @@ class PluginManager:
         except Exception:
             return None
 
-    async def setup_all(self, app: Any) -> None:
-        for p in list(self._plugins):
+    async def setup_all(
+        self, app: Any, timeline: Optional[StartupTimeline] = None
+    ) -> None:
+        """并发执行各插件 setup，按 depends_on 声明的依赖排序.
+
+        依赖插件 setup 失败不阻塞依赖方；依赖存在环时退化为按注册顺序串行执行。
+        """
+        plugins = list(self._plugins)
+        if self._has_dependency_cycle(plugins):
+            logger.warning("插件依赖存在环，按注册顺序串行 setup")
+            for p in plugins:
+                await self._setup_one(p, app, timeline)
+            return
+
+        done = {getattr(p, "name", ""): asyncio.Event() for p in plugins}
+
+        async def _run(p: Plugin) -> None:
+            for dep in getattr(p, "depends_on", ()):
+                event = done.get(dep)
+                if event is not None:
+                    await event.wait()
             try:
-                await p.setup(app)
-            except Exception:
-                # 出错不阻断其它插件
-                pass
+                await self._setup_one(p, app, timeline)
+            finally:
+                done[getattr(p, "name", "")].set()
+
+        await asyncio.gather(*(_run(p) for p in plugins))
+
+    async def _setup_one(
+        self, p: Plugin, app: Any, timeline: Optional[StartupTimeline]
+    ) -> None:
+        start = time.perf_counter()
+        try:
+            await p.setup(app)
+        except Exception:
+            # 出错不阻断其它插件
+            pass
+        finally:
+            if timeline is not None:
+                timeline.record(f"setup:{p.name}", start, time.perf_counter())
+
+    @staticmethod
+    def _has_dependency_cycle(plugins: List[Plugin]) -> bool:
+        deps = {p.name: set(getattr(p, "depends_on", ())) for p in plugins}
+        visiting, visited = set(), set()
+
+        def _visit(name: str) -> bool:
+            if name in visiting:
+                return True
+            if name in visited or name not in deps:
+                return False
+            visiting.add(name)
+            cyclic = any(_visit(dep) for dep in deps[name])
+            visiting.discard(name)
+            visited.add(name)
+            return cyclic
+
+        return any(_visit(name) for name in deps)
 
-    async def start_all(self) -> None:
+    async def start_all(self, timeline: Optional[StartupTimeline] = None) -> None:
         for p in list(self._plugins):
+            start = time.perf_counter()
             try:
                 await p.start()
             except Exception:
                 pass
+            if timeline is not None:
+                timeline.record(f"start:{p.name}", start, time.perf_counter())
 
     async def notify_protocol_connected(self, protocol: Any) -> None:
         for p in list(self._plugins):
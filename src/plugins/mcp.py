@@ -1,7 +1,11 @@
+import asyncio
 from typing import Any, Optional
 
 from src.mcp.mcp_server import McpServer
 from src.plugins.base import Plugin
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
 
 
 class McpPlugin(Plugin):
@@ -28,7 +32,8 @@ class McpPlugin(Plugin):
         try:
             self._server.set_send_callback(_send)
             # 注册通用工具（包含 calendar 工具）。提醒服务的运行改由 CalendarPlugin 管理
-            self._server.add_common_tools()
+            # 各工具模块导入较慢，放到线程中与其它插件并发
+            await asyncio.to_thread(self._server.add_common_tools)
             # 若音乐播放器存在，将其app引用指向当前应用（example模式下用于UI更新）
             try:
                 from src.mcp.tools.music import get_music_player_instance
@@ -43,6 +48,15 @@ class McpPlugin(Plugin):
         except Exception:
             pass
 
+    async def start(self) -> None:
+        # 恢复上次运行时未到期的倒计时
+        try:
+            from src.mcp.tools.timer.timer_service import get_timer_service
+
+            await get_timer_service().start()
+        except Exception as e:
+            logger.error(f"恢复倒计时失败: {e}")
+
     async def on_incoming_json(self, message: Any) -> None:
         if not isinstance(message, dict):
             return
@@ -65,3 +79,24 @@ class McpPlugin(Plugin):
                 self._server.set_send_callback(None)  # type: ignore[arg-type]
         except Exception:
             pass
+        # 停止倒计时调度（计时器已持久化，下次启动时恢复）
+        try:
+            from src.mcp.tools.timer.timer_service import get_timer_service
+
+            await get_timer_service().cleanup_all()
+        except Exception:
+            pass
+        # 关闭八字计算工作进程
+        try:
+            from src.mcp.tools.bazi.executor import shutdown_bazi_executor
+
+            shutdown_bazi_executor()
+        except Exception:
+            pass
+        # 关闭视觉解释服务连接池
+        try:
+            from src.mcp.tools.camera.vision_client import close_vision_client
+
+            await close_vision_client()
+        except Exception:
+            pass
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any
 
 from src.plugins.base import Plugin
@@ -14,9 +15,8 @@ class WakeWordPlugin(Plugin):
     async def setup(self, app: Any) -> None:
         self.app = app
         try:
-            from src.audio_processing.wake_word_detect import WakeWordDetector
-
-            self.detector = WakeWordDetector()
+            # 导入 sherpa_onnx 与加载 KWS 模型较慢，放到线程中与其它插件并发
+            self.detector = await asyncio.to_thread(self._create_detector)
             if not getattr(self.detector, "enabled", False):
                 self.detector = None
                 return
@@ -27,6 +27,12 @@ class WakeWordPlugin(Plugin):
         except Exception:
             self.detector = None
 
+    @staticmethod
+    def _create_detector():
+        from src.audio_processing.wake_word_detect import WakeWordDetector
+
+        return WakeWordDetector()
+
     async def start(self) -> None:
         if not self.detector:
             return
@@ -10,6 +10,7 @@ from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 
 from src.constants.constants import AudioConfig
 from src.protocols.protocol import Protocol
+from src.utils import latency_tracer
 from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
 
@@ -463,7 +464,7 @@ class MqttProtocol(Protocol):
                 try:
                     # 验证数据包
                     if len(data) < 16:  # 至少需要16字节的nonce
-                        logger.error(f"无效的音频数据包大小: {len(data)}")
+                        logger.error("无效的音频数据包大小: %d", len(data))
                         continue
 
                     # 分离nonce和加密数据
@@ -478,10 +479,13 @@ class MqttProtocol(Protocol):
                     # 调试信息
                     if debug_counter % 100 == 0:
                         logger.debug(
-                            f"已解密音频数据包 #{debug_counter}, 大小: {len(decrypted)} 字节"
+                            "已解密音频数据包 #%d, 大小: %d 字节",
+                            debug_counter,
+                            len(decrypted),
                         )
 
                     # 处理解密后的音频数据
+                    self._tracer.mark(latency_tracer.FIRST_DOWNLINK)
                     if self._on_incoming_audio:
 
                         def process_audio(audio_data=decrypted):
@@ -495,7 +499,7 @@ class MqttProtocol(Protocol):
                         self.loop.call_soon_threadsafe(process_audio)
 
                 except Exception as e:
-                    logger.error(f"处理音频数据包错误: {e}")
+                    logger.error("处理音频数据包错误: %s", e)
                     continue
 
             except socket.timeout:
@@ -556,6 +560,7 @@ class MqttProtocol(Protocol):
 
             # 发送数据包
             self.udp_socket.sendto(packet, (self.udp_server, self.udp_port))
+            self._tracer.mark(latency_tracer.FIRST_UPLINK)
 
             # 每发送10个包打印一次日志
             if self.local_sequence % 10 == 0:
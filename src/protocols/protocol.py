@@ -1,6 +1,7 @@
 import json
 
 from src.constants.constants import AbortReason, ListeningMode
+from src.utils.latency_tracer import get_latency_tracer
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -18,6 +19,8 @@ class Protocol:
         # 新增连接状态变化回调
         self._on_connection_state_changed = None
         self._on_reconnecting = None
+        # 延迟追踪：子类在首个上行/下行音频包时记录
+        self._tracer = get_latency_tracer()
 
     def on_incoming_json(self, callback):
         """
@@ -7,6 +7,7 @@ import websockets
 
 from src.constants.constants import AudioConfig
 from src.protocols.protocol import Protocol
+from src.utils import latency_tracer
 from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
 
@@ -375,6 +376,7 @@ class WebsocketProtocol(Protocol):
                             logger.error(f"无效的JSON消息: {message}, 错误: {e}")
                     elif isinstance(message, bytes):
                         # 二进制消息，可能是音频
+                        self._tracer.mark(latency_tracer.FIRST_DOWNLINK)
                         if self._on_incoming_audio:
                             self._on_incoming_audio(message)
                 except Exception as e:
@@ -415,6 +417,7 @@ class WebsocketProtocol(Protocol):
 
         try:
             await self.websocket.send(data)
+            self._tracer.mark(latency_tracer.FIRST_UPLINK)
         except websockets.ConnectionClosed as e:
             logger.warning(f"发送音频时连接已关闭: {e}")
             await self._handle_connection_loss(f"发送音频失败: {e.code} {e.reason}")
@@ -1,12 +1,48 @@
+import atexit
 import json
+import os
+import tempfile
+import threading
 import uuid
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from src.utils.logging_config import get_logger
 from src.utils.resource_finder import resource_finder
 
 logger = get_logger(__name__)
 
+# 配置修改后延迟写盘的时间（秒），期间的多次修改合并为一次写入
+_SAVE_DELAY = 0.5
+
+_MISSING = object()
+
+
+class ConfigAccessor:
+    """预编译的配置读取器.
+
+    点分隔路径只解析一次；配置未变化时直接返回缓存值，适合频繁读取的路径。
+    """
+
+    __slots__ = ("_manager", "path", "_keys", "_default", "_version", "_value")
+
+    def __init__(self, manager: "ConfigManager", path: str, default: Any = None):
+        self._manager = manager
+        self.path = path
+        self._keys = manager._compile_path(path)
+        self._default = default
+        self._version = -1
+        self._value = None
+
+    def get(self) -> Any:
+        manager = self._manager
+        if self._version != manager._version:
+            value = manager._lookup(self._keys)
+            self._value = self._default if value is _MISSING else value
+            self._version = manager._version
+        return self._value
+
+    __call__ = get
+
 
 class ConfigManager:
     """配置管理器 - 单例模式"""
@@ -42,6 +78,11 @@ class ConfigManager:
             "frame_width": 640,
             "frame_height": 480,
             "fps": 30,
+            "keep_alive_seconds": 30,
+            "vision_timeout": 15,
+            "vision_jpeg_quality": 85,
+            "vision_max_side": 320,
+            "screenshot_max_side": 1920,
             "Local_VL_url": "https://open.bigmodel.cn/api/paas/v4/",
             "VLapi_key": "",
             "models": "glm-4v-plus",
@@ -58,12 +99,42 @@ class ConfigManager:
                 "description": "显示/隐藏窗口",
             },
         },
+        "LATENCY_TRACE": {
+            "ENABLED": True,
+            "MAX_BYTES": 5242880,
+            "BACKUP_COUNT": 3,
+            "HISTORY": 200,
+            "SHOW_IN_CLI": False,
+        },
+        "AUDIO_METRICS": {
+            "LOG_INTERVAL": 300,
+        },
+        "DISPLAY": {
+            "GUI_MAX_FPS": 30,
+            "CLI_MAX_FPS": 10,
+        },
+        "MUSIC_OPTIONS": {
+            "VOLUME": 0.8,
+            "DUCKING_GAIN": 0.2,
+            "CACHE_MAX_MB": 1024,
+            "CACHE_COMPACT_INTERVAL": 1800,
+        },
         "AEC_OPTIONS": {
             "ENABLED": False,
             "BUFFER_MAX_LENGTH": 200,
             "FRAME_DELAY": 3,
             "FILTER_LENGTH_RATIO": 0.4,
             "ENABLE_PREPROCESS": True,
+            "STREAM_DELAY_MS": 40,
+            "AUTO_DELAY": True,
+        },
+        "TIMER_OPTIONS": {
+            "MISSED_POLICY": "run",  # 可选值: run（宽限时间内补执行）, skip
+            "MISSED_GRACE_SECONDS": 600,
+        },
+        "BAZI_OPTIONS": {
+            "EXECUTION_MODE": "process",  # 可选值: process, thread, inline
+            "MAX_WORKERS": 1,
         },
         "AUDIO_DEVICES": {
             "input_device_id": None,
@@ -92,6 +163,18 @@ class ConfigManager:
             return
         self._initialized = True
 
+        # 配置版本号（每次修改/重载递增，读取器据此判断缓存是否有效）
+        self._version = 0
+        self._lock = threading.RLock()
+        self._paths: Dict[str, Tuple[str, ...]] = {}
+        # 订阅: (路径键, 回调)
+        self._subscribers: List[Tuple[Tuple[str, ...], Callable[[str, Any], None]]] = []
+        # 延迟写盘
+        self._save_timer: Optional[threading.Timer] = None
+        self._dirty = False
+        self._save_lock = threading.Lock()
+        atexit.register(self.flush)
+
         # 初始化配置文件路径
         self._init_config_paths()
 
@@ -112,6 +195,7 @@ class ConfigManager:
             project_root = resource_finder.get_project_root()
             self.config_dir = project_root / "config"
             self.config_dir.mkdir(parents=True, exist_ok=True)
+            resource_finder.invalidate("config")
             logger.info(f"创建配置目录: {self.config_dir.absolute()}")
 
         self.config_file = self.config_dir / "config.json"
@@ -130,6 +214,7 @@ class ConfigManager:
         models_dir = project_root / "models"
         if not models_dir.exists():
             models_dir.mkdir(parents=True, exist_ok=True)
+            resource_finder.invalidate("models")
             logger.info(f"创建模型目录: {models_dir.absolute()}")
 
         # 创建 cache 目录
@@ -160,6 +245,7 @@ class ConfigManager:
                 # 创建默认配置文件
                 logger.info("配置文件不存在，创建默认配置")
                 self._save_config(self.DEFAULT_CONFIG)
+                resource_finder.invalidate("config/config.json")
                 return self.DEFAULT_CONFIG.copy()
 
         except Exception as e:
@@ -168,16 +254,32 @@ class ConfigManager:
 
     def _save_config(self, config: dict) -> bool:
         """
-        保存配置到文件.
+        保存配置到文件（先写临时文件再替换，写入中断不会损坏原配置）
         """
         try:
-            # 确保配置目录存在
-            self.config_dir.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                content = json.dumps(config, indent=2, ensure_ascii=False)
+
+            with self._save_lock:
+                # 确保配置目录存在
+                self.config_dir.mkdir(parents=True, exist_ok=True)
+
+                fd, temp_path = tempfile.mkstemp(
+                    dir=self.config_dir, prefix=".config.", suffix=".tmp"
+                )
+                try:
+                    with os.fdopen(fd, "w", encoding="utf-8") as f:
+                        f.write(content)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(temp_path, self.config_file)
+                except BaseException:
+                    try:
+                        os.unlink(temp_path)
+                    except OSError:
+                        pass
+                    raise
 
-            # 保存配置文件
-            self.config_file.write_text(
-                json.dumps(config, indent=2, ensure_ascii=False), encoding="utf-8"
-            )
             logger.debug(f"配置已保存到: {self.config_file}")
             return True
 
@@ -185,6 +287,35 @@ class ConfigManager:
             logger.error(f"配置保存错误: {e}")
             return False
 
+    def _schedule_save(self):
+        """
+        标记配置待保存，延迟 _SAVE_DELAY 秒后在后台线程写盘.
+        """
+        with self._lock:
+            self._dirty = True
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(_SAVE_DELAY, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self) -> bool:
+        """
+        立即写入待保存的修改（无修改时直接返回）
+        """
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return True
+            self._dirty = False
+        success = self._save_config(self._config)
+        if not success:
+            with self._lock:
+                self._dirty = True
+        return success
+
     @staticmethod
     def _merge_configs(default: dict, custom: dict) -> dict:
         """
@@ -202,41 +333,125 @@ class ConfigManager:
                 result[key] = value
         return result
 
+    def _compile_path(self, path: str) -> Tuple[str, ...]:
+        keys = self._paths.get(path)
+        if keys is None:
+            keys = tuple(path.split("."))
+            self._paths[path] = keys
+        return keys
+
+    def _lookup(self, keys: Tuple[str, ...]) -> Any:
+        value = self._config
+        try:
+            for key in keys:
+                value = value[key]
+            return value
+        except (KeyError, TypeError):
+            return _MISSING
+
     def get_config(self, path: str, default: Any = None) -> Any:
         """
         通过路径获取配置值
         path: 点分隔的配置路径，如 "SYSTEM_OPTIONS.NETWORK.MQTT_INFO"
         """
-        try:
-            value = self._config
-            for key in path.split("."):
-                value = value[key]
-            return value
-        except (KeyError, TypeError):
-            return default
+        value = self._lookup(self._compile_path(path))
+        return default if value is _MISSING else value
+
+    def accessor(self, path: str, default: Any = None) -> ConfigAccessor:
+        """获取预编译的配置读取器，用于频繁读取的路径.
 
-    def update_config(self, path: str, value: Any) -> bool:
+        Example:
+            device_id = config.accessor("SYSTEM_OPTIONS.DEVICE_ID")
+            device_id.get()
+        """
+        return ConfigAccessor(self, path, default)
+
+    def subscribe(
+        self, path: str, callback: Callable[[str, Any], None]
+    ) -> Callable[[], None]:
+        """订阅配置变化.
+
+        path 本身、其上级或下级配置被修改（或重新加载后发生变化）时调用
+        callback(path, 新值)。回调在修改配置的线程中同步执行，异步组件应自行切回事件循环。
+
+        Returns:
+            取消订阅的函数
+        """
+        entry = (self._compile_path(path), callback)
+        with self._lock:
+            self._subscribers.append(entry)
+
+        def unsubscribe():
+            with self._lock:
+                try:
+                    self._subscribers.remove(entry)
+                except ValueError:
+                    pass
+
+        return unsubscribe
+
+    def _notify(self, changed: List[Tuple[str, ...]]):
+        """
+        通知订阅了 changed 中任一路径（含上下级）的订阅者.
+        """
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for keys, callback in subscribers:
+            if not any(keys[: len(c)] == c or c[: len(keys)] == keys for c in changed):
+                continue
+            value = self._lookup(keys)
+            try:
+                callback(".".join(keys), None if value is _MISSING else value)
+            except Exception as e:
+                logger.error(f"配置变更回调失败 {'.'.join(keys)}: {e}")
+
+    def update_config(self, path: str, value: Any, flush: bool = False) -> bool:
         """
         更新特定配置项
         path: 点分隔的配置路径，如 "SYSTEM_OPTIONS.NETWORK.MQTT_INFO"
+        flush: 是否立即写盘并返回写入结果
+
+        修改立即生效并通知订阅者；默认写盘延迟合并执行（见 flush()），此时返回值只表示
+        内存中的修改成功，需要确认已写入时传 flush=True 或调用 flush()
         """
         try:
-            current = self._config
-            *parts, last = path.split(".")
-            for part in parts:
-                current = current.setdefault(part, {})
-            current[last] = value
-            return self._save_config(self._config)
+            keys = self._compile_path(path)
+            with self._lock:
+                current = self._config
+                for part in keys[:-1]:
+                    current = current.setdefault(part, {})
+                current[keys[-1]] = value
+                self._version += 1
+            self._schedule_save()
+            self._notify([keys])
         except Exception as e:
             logger.error(f"配置更新错误 {path}: {e}")
             return False
+        return self.flush() if flush else True
 
     def reload_config(self) -> bool:
         """
-        重新加载配置文件.
+        重新加载配置文件（先写入待保存的修改）
         """
         try:
-            self._config = self._load_config()
+            self.flush()
+            with self._lock:
+                old_config = self._config
+                self._config = self._load_config()
+                self._version += 1
+                subscribed = [keys for keys, _ in self._subscribers]
+            changed = []
+            for keys in subscribed:
+                old = old_config
+                try:
+                    for key in keys:
+                        old = old[key]
+                except (KeyError, TypeError):
+                    old = _MISSING
+                if old != self._lookup(keys):
+                    changed.append(keys)
+            if changed:
+                self._notify(changed)
             logger.info("配置文件已重新加载")
             return True
         except Exception as e:
@@ -255,7 +470,9 @@ class ConfigManager:
         """
         if not self.get_config("SYSTEM_OPTIONS.CLIENT_ID"):
             client_id = self.generate_uuid()
-            success = self.update_config("SYSTEM_OPTIONS.CLIENT_ID", client_id)
+            success = self.update_config(
+                "SYSTEM_OPTIONS.CLIENT_ID", client_id, flush=True
+            )
             if success:
                 logger.info(f"已生成新的客户端ID: {client_id}")
             else:
@@ -271,7 +488,7 @@ class ConfigManager:
                 mac_address = device_fingerprint.get_mac_address_from_efuse()
                 if mac_address:
                     success = self.update_config(
-                        "SYSTEM_OPTIONS.DEVICE_ID", mac_address
+                        "SYSTEM_OPTIONS.DEVICE_ID", mac_address, flush=True
                     )
                     if success:
                         logger.info(f"从efuse.json获取DEVICE_ID: {mac_address}")
@@ -284,7 +501,7 @@ class ConfigManager:
                     mac_from_fingerprint = fingerprint.get("mac_address")
                     if mac_from_fingerprint:
                         success = self.update_config(
-                            "SYSTEM_OPTIONS.DEVICE_ID", mac_from_fingerprint
+                            "SYSTEM_OPTIONS.DEVICE_ID", mac_from_fingerprint, flush=True
                         )
                         if success:
                             logger.info(
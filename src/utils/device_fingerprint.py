@@ -9,7 +9,7 @@ import machineid
 import psutil
 
 from src.utils.logging_config import get_logger
-from src.utils.resource_finder import find_config_dir
+from src.utils.resource_finder import find_config_dir, invalidate_resource_cache
 
 # 获取日志记录器
 logger = get_logger(__name__)
@@ -58,6 +58,7 @@ class DeviceFingerprint:
             # 备用方案：使用相对路径并确保目录存在
             config_path = Path("config")
             config_path.mkdir(parents=True, exist_ok=True)
+            invalidate_resource_cache("config")
             self.efuse_file = config_path / "efuse.json"
             logger.info(f"创建配置目录: {config_path.absolute()}")
 
@@ -0,0 +1,265 @@
+"""语音交互延迟追踪.
+
+每轮对话（唤醒/按键开始聆听 -> 服务端识别 -> 首个语音帧播放）对应一个 span，各模块在关键
+节点调用 mark() 记录单调时钟时间。一轮结束时把各节点相对开始时间的毫秒数写入滚动的
+JSONL 文件（logs/latency.jsonl），并维护最近若干轮的 p50/p95 统计。
+
+mark() 可在音频回调线程中调用：节点已记录或当前没有进行中的 span 时直接返回。
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+from logging.handlers import QueueListener, RotatingFileHandler
+from typing import Deque, Dict, List, Optional
+
+from src.utils.config_manager import ConfigManager
+from src.utils.logging_config import NonBlockingQueueHandler, get_logger
+
+logger = get_logger(__name__)
+
+# 节点名称
+WAKE_WORD = "wake_word"  # 唤醒词检测到
+LISTEN_START = "listen_start"  # 已发送开始聆听
+FIRST_UPLINK = "first_uplink"  # 首个麦克风音频包已发出
+STT = "stt"  # 收到服务端识别结果
+TTS_START = "tts_start"  # 收到 TTS 开始
+FIRST_DOWNLINK = "first_downlink"  # 收到首个 TTS 音频包
+FIRST_DECODED = "first_decoded"  # 首个 TTS 音频包解码入队
+FIRST_PLAYED = "first_played"  # 首个 TTS 样本送入输出设备
+
+# 导出的区间：名称 -> (起点, 终点)
+INTERVALS = {
+    "wake_to_listen": (WAKE_WORD, LISTEN_START),
+    "listen_to_uplink": (LISTEN_START, FIRST_UPLINK),
+    "stt_to_tts_start": (STT, TTS_START),
+    "stt_to_first_audio": (STT, FIRST_PLAYED),
+    "downlink_to_played": (FIRST_DOWNLINK, FIRST_PLAYED),
+    "turn_to_first_audio": (None, FIRST_PLAYED),
+}
+
+# 未结束的 span 超过该时长视为被放弃
+_SPAN_TIMEOUT = 120.0
+
+
+class TurnSpan:
+    """
+    一轮对话的时间记录.
+    """
+
+    __slots__ = ("turn_id", "trigger", "start", "wall_start", "marks")
+
+    def __init__(self, trigger: str):
+        self.turn_id = uuid.uuid4().hex[:12]
+        self.trigger = trigger
+        self.start = time.monotonic()
+        self.wall_start = time.time()
+        self.marks: Dict[str, float] = {}
+
+    def elapsed_ms(self, event: Optional[str]) -> Optional[float]:
+        if event is None:
+            return 0.0
+        t = self.marks.get(event)
+        return None if t is None else (t - self.start) * 1000
+
+    def intervals(self) -> Dict[str, float]:
+        result = {}
+        for name, (begin, end) in INTERVALS.items():
+            a, b = self.elapsed_ms(begin), self.elapsed_ms(end)
+            if a is not None and b is not None and b >= a:
+                result[name] = round(b - a, 1)
+        return result
+
+    def to_record(self, reason: str) -> dict:
+        return {
+            "turn_id": self.turn_id,
+            "trigger": self.trigger,
+            "started_at": round(self.wall_start, 3),
+            "end_reason": reason,
+            "marks_ms": {
+                event: round((t - self.start) * 1000, 1)
+                for event, t in sorted(self.marks.items(), key=lambda item: item[1])
+            },
+            "intervals_ms": self.intervals(),
+        }
+
+
+def _percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(p / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class LatencyTracer:
+    """
+    语音交互延迟追踪器.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        config = ConfigManager.get_instance()
+        self.enabled = bool(config.get_config("LATENCY_TRACE.ENABLED", True))
+        self._max_bytes = config.get_config("LATENCY_TRACE.MAX_BYTES", 5 * 1024 * 1024)
+        self._backup_count = config.get_config("LATENCY_TRACE.BACKUP_COUNT", 3)
+        history = config.get_config("LATENCY_TRACE.HISTORY", 200)
+
+        self._span: Optional[TurnSpan] = None
+        self._span_lock = threading.Lock()
+        self._history: Dict[str, Deque[float]] = {
+            name: deque(maxlen=history) for name in INTERVALS
+        }
+
+        self._writer: Optional[logging.Logger] = None
+        self._listener: Optional[QueueListener] = None
+
+    # -----------------------
+    # 记录接口
+    # -----------------------
+    def begin_turn(self, trigger: str, reuse: bool = True) -> None:
+        """开始新一轮.
+
+        Args:
+            trigger: 触发方式（wake_word/manual/auto/continue/realtime）
+            reuse: 当前 span 尚未开始聆听时沿用（如唤醒词检测后紧接着开始自动对话）
+        """
+        if not self.enabled:
+            return
+        with self._span_lock:
+            span = self._span
+            if span is not None:
+                fresh = time.monotonic() - span.start < _SPAN_TIMEOUT
+                if reuse and fresh and LISTEN_START not in span.marks:
+                    return
+                self._finish_locked(span, "superseded" if fresh else "timeout")
+            self._span = TurnSpan(trigger)
+
+    def mark(self, event: str) -> None:
+        """
+        记录节点时间（每轮只记录首次），可在任意线程调用.
+        """
+        span = self._span
+        if span is None or event in span.marks:
+            return
+        span.marks.setdefault(event, time.monotonic())
+
+    def has_active_turn(self) -> bool:
+        return self._span is not None
+
+    def end_turn(self, reason: str) -> None:
+        """
+        结束当前一轮并导出.
+        """
+        with self._span_lock:
+            span, self._span = self._span, None
+            if span is not None:
+                self._finish_locked(span, reason)
+
+    # -----------------------
+    # 统计
+    # -----------------------
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        最近若干轮各区间的 p50/p95（毫秒）
+        """
+        result = {}
+        for name, values in self._history.items():
+            if values:
+                samples = list(values)
+                result[name] = {
+                    "count": len(samples),
+                    "p50": round(_percentile(samples, 50), 1),
+                    "p95": round(_percentile(samples, 95), 1),
+                }
+        return result
+
+    def summary_text(self) -> str:
+        """
+        首音延迟的简短描述，用于界面显示.
+        """
+        stats = self.summary()
+        parts = []
+        for name, label in (
+            ("stt_to_first_audio", "识别->首音"),
+            ("turn_to_first_audio", "开始->首音"),
+        ):
+            if name in stats:
+                s = stats[name]
+                parts.append(f"{label} p50 {s['p50']:.0f}ms p95 {s['p95']:.0f}ms")
+        if not parts:
+            return "暂无数据"
+        return (
+            " | ".join(parts)
+            + f" (n={stats.get('turn_to_first_audio', {}).get('count', 0)})"
+        )
+
+    # -----------------------
+    # 导出
+    # -----------------------
+    def _finish_locked(self, span: TurnSpan, reason: str):
+        if not span.marks:
+            return
+        record = span.to_record(reason)
+        for name, value in record["intervals_ms"].items():
+            self._history[name].append(value)
+        try:
+            self._get_writer().info(json.dumps(record, ensure_ascii=False))
+        except Exception as e:
+            logger.debug(f"写入延迟记录失败: {e}")
+
+    def _get_writer(self) -> logging.Logger:
+        """
+        JSONL 写入器：独立的 logger，经队列由后台线程写入滚动文件.
+        """
+        if self._writer is None:
+            from src.utils.resource_finder import get_project_root
+
+            log_dir = get_project_root() / "logs"
+            log_dir.mkdir(exist_ok=True)
+            file_handler = RotatingFileHandler(
+                log_dir / "latency.jsonl",
+                maxBytes=self._max_bytes,
+                backupCount=self._backup_count,
+                encoding="utf-8",
+            )
+            file_handler.setFormatter(logging.Formatter("%(message)s"))
+
+            log_queue = queue.Queue(1000)
+            self._listener = QueueListener(log_queue, file_handler)
+            self._listener.start()
+
+            writer = logging.Logger("latency_trace")
+            writer.addHandler(NonBlockingQueueHandler(log_queue))
+            writer.propagate = False
+            self._writer = writer
+        return self._writer
+
+    def close(self):
+        """
+        结束当前一轮并停止写入线程.
+        """
+        self.end_turn("shutdown")
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.stop()
+        self._writer = None
+
+
+def get_latency_tracer() -> LatencyTracer:
+    """
+    获取延迟追踪器单例.
+    """
+    return LatencyTracer.get_instance()
@@ -1,8 +1,133 @@
+"""日志配置.
+
+业务代码中的日志调用只把记录放入内存队列（QueueHandler），格式化输出和写文件由后台线程
+（QueueListener）完成，避免事件循环或音频回调线程被磁盘写入阻塞；同一位置短时间内重复的
+WARNING 及以上级别的日志会被限流，并在恢复输出时附带被省略的条数。
+
+限流按调用位置（文件 + 行号）计数，与消息是 f-string 还是 %-格式无关：同一位置带不同参数
+的日志视为同一条。热路径上的日志应使用 %-格式（logger.debug("...%s", x)），未启用该级别时
+不会格式化参数；构造参数本身开销较大时先用 logger.isEnabledFor() 判断。
+"""
+
+import atexit
 import logging
-from logging.handlers import TimedRotatingFileHandler
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+from typing import Dict, List, Optional
 
 from colorlog import ColoredFormatter
 
+# 日志队列上限，写入线程跟不上时丢弃新记录而不是阻塞调用方
+LOG_QUEUE_SIZE = 10000
+
+# 限流：同一调用位置在窗口期内最多输出的条数，只对不低于 RATE_LIMIT_LEVEL 的日志生效
+RATE_LIMIT_WINDOW = 10.0
+RATE_LIMIT_BURST = 5
+RATE_LIMIT_LEVEL = logging.WARNING
+
+# 退出时等待后台线程写完剩余日志的最长时间（秒）
+STOP_TIMEOUT = 5.0
+
+_listener: Optional[QueueListener] = None
+_atexit_registered = False
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    按 (调用位置, 级别) 限流重复的告警/错误日志，CRITICAL 级别不限流.
+    """
+
+    def __init__(
+        self,
+        window: float = RATE_LIMIT_WINDOW,
+        burst: int = RATE_LIMIT_BURST,
+        max_keys: int = 2048,
+    ):
+        super().__init__()
+        self.window = window
+        self.burst = burst
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        # key -> [窗口开始时间, 窗口内条数, 被省略条数]
+        self._counters: Dict[tuple, List] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.CRITICAL or record.levelno < RATE_LIMIT_LEVEL:
+            return True
+
+        # 按调用位置而非消息文本计数，f-string 中变化的参数不会产生新的键
+        key = (record.pathname, record.lineno, record.levelno)
+        now = record.created
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                if len(self._counters) >= self.max_keys:
+                    self._prune(now)
+                self._counters[key] = [now, 1, 0]
+                return True
+
+            if now - counter[0] >= self.window:
+                suppressed = counter[2]
+                counter[:] = [now, 1, 0]
+                if suppressed:
+                    record.msg = f"{record.msg}（过去 {self.window:g} 秒内省略了 {suppressed} 条重复日志）"
+                return True
+
+            counter[1] += 1
+            if counter[1] <= self.burst:
+                return True
+            counter[2] += 1
+            return False
+
+    def _prune(self, now: float):
+        expired = [
+            key
+            for key, counter in self._counters.items()
+            if now - counter[0] >= self.window
+        ]
+        for key in expired:
+            del self._counters[key]
+        if len(self._counters) >= self.max_keys:
+            self._counters.clear()
+
+
+class _LogQueueListener(QueueListener):
+    """
+    停止时阻塞等待放入结束标记，队列满时也能等后台线程写完剩余日志.
+    """
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel, timeout=STOP_TIMEOUT)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    非阻塞队列处理器：调用线程只合并消息参数，队列满时丢弃记录.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 在调用线程合并参数（参数对象之后可能被修改），异常堆栈也在此时格式化，
+        # 时间戳、颜色等格式化交给后台线程
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
 
 def setup_logging():
     """
@@ -23,6 +148,7 @@ def setup_logging():
     root_logger.setLevel(logging.INFO)  # 设置根日志级别
 
     # 清除已有的处理器（避免重复添加）
+    stop_logging()
     if root_logger.handlers:
         root_logger.handlers.clear()
 
@@ -63,9 +189,20 @@ def setup_logging():
     console_handler.setFormatter(color_formatter)
     file_handler.setFormatter(formatter)
 
-    # 添加处理器到根日志记录器
-    root_logger.addHandler(console_handler)
-    root_logger.addHandler(file_handler)
+    # 根日志记录器只挂队列处理器，控制台和文件输出在后台线程中进行
+    global _listener, _atexit_registered
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter())
+    root_logger.addHandler(queue_handler)
+
+    _listener = _LogQueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    _listener.start()
+    if not _atexit_registered:
+        atexit.register(stop_logging)
+        _atexit_registered = True
 
     # 输出日志配置信息
     logging.info("日志系统已初始化，日志文件: %s", log_file)
@@ -73,6 +210,20 @@ def setup_logging():
     return log_file
 
 
+def stop_logging():
+    """
+    停止后台写日志线程，输出队列中剩余的日志.
+    """
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        try:
+            listener.stop()
+        except queue.Full:
+            # 后台线程长时间无法消费（如输出被阻塞），放弃等待
+            pass
+
+
 def get_logger(name):
     """获取统一配置的日志记录器.
 
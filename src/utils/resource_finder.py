@@ -1,11 +1,71 @@
+import json
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# 打包时生成的资源清单（位于 assets 目录下，随 assets 一起打包）
+MANIFEST_NAME = "resource_manifest.json"
+MANIFEST_PATH = Path("assets") / MANIFEST_NAME
+MANIFEST_VERSION = 1
+
+# 未找到的结果缓存时长（秒），过期后重新查找；创建资源后应调用 invalidate()
+_NEGATIVE_TTL = 30.0
+
+
+class ResourceManifest:
+    """打包资源清单.
+
+    记录某个基础路径下打包资源（assets/models/libs）的全部文件和目录，查找这些目录下的资源时
+    直接查表，不访问文件系统。清单由 scripts/build_resource_manifest.py 在打包前生成，
+    只在打包环境中使用（开发环境文件随时变化，清单可能过期）。
+    """
+
+    def __init__(
+        self, base_path: Path, roots: List[str], files: Set[str], dirs: Set[str]
+    ):
+        self.base_path = base_path
+        self.roots = set(roots)
+        self.files = files
+        self.dirs = dirs | self.roots
+
+    @classmethod
+    def load(cls, base_path: Path) -> Optional["ResourceManifest"]:
+        manifest_file = base_path / MANIFEST_PATH
+        try:
+            data = json.loads(manifest_file.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取资源清单失败，忽略: {manifest_file}, {e}")
+            return None
+        if data.get("version") != MANIFEST_VERSION:
+            logger.warning(f"资源清单版本不匹配，忽略: {manifest_file}")
+            return None
+        return cls(
+            base_path,
+            data.get("roots", []),
+            set(data.get("files", [])),
+            set(data.get("dirs", [])),
+        )
+
+    def covers(self, relative: str) -> bool:
+        """
+        该路径是否在清单覆盖的目录内（覆盖范围内清单即为权威结果）
+        """
+        return relative.split("/", 1)[0] in self.roots
+
+    def lookup(self, relative: str, resource_type: str) -> Optional[Path]:
+        entries = self.files if resource_type == "file" else self.dirs
+        if relative in entries:
+            return self.base_path / relative
+        return None
+
 
 class ResourceFinder:
     """
@@ -15,6 +75,10 @@ class ResourceFinder:
     _instance = None
     _base_paths = None
     _app_name = None
+    # (相对路径, 类型) -> (结果, 缓存时间)
+    _cache: Dict[Tuple[str, str], Tuple[Optional[Path], float]] = {}
+    _cache_lock = threading.Lock()
+    _manifests: Dict[Path, ResourceManifest] = {}
 
     def __new__(cls):
         if cls._instance is None:
@@ -28,10 +92,33 @@ class ResourceFinder:
         if self._base_paths is None:
             self._app_name = self._detect_app_name()
             self._base_paths = self._get_base_paths()
+            self._manifests = self._load_manifests()
             logger.debug(
                 f"资源查找器初始化，应用名: {self._app_name}, 基础路径: {[str(p) for p in self._base_paths]}"
             )
 
+    def _load_manifests(self) -> Dict[Path, ResourceManifest]:
+        """
+        加载各基础路径下的资源清单（仅打包环境）
+        """
+        manifests = {}
+        if not getattr(sys, "frozen", False):
+            return manifests
+        for base_path in self._base_paths:
+            manifest = ResourceManifest.load(base_path)
+            if manifest is not None:
+                manifests[base_path] = manifest
+                logger.debug(
+                    f"已加载资源清单: {base_path / MANIFEST_PATH}，"
+                    f"{len(manifest.files)} 个文件"
+                )
+        if not manifests:
+            logger.info(
+                f"打包环境未找到资源清单 {MANIFEST_PATH}，资源查找回退为逐路径检查；"
+                "请在打包前运行 scripts/build_resource_manifest.py"
+            )
+        return manifests
+
     def _detect_app_name(self) -> str:
         """
         动态检测应用名称，避免硬编码 优先级：环境变量 > .app bundle名 > 可执行文件名 > 项目目录名 > 默认值.
@@ -295,6 +382,8 @@ class ResourceFinder:
     ) -> Optional[Path]:
         """查找资源文件或目录.
 
+        相对路径的查找结果（包括未找到）会被缓存，资源被创建或删除后调用 invalidate()。
+
         Args:
             resource_path: 相对于项目根目录的资源路径
             resource_type: 资源类型，"file" 或 "dir"
@@ -303,7 +392,6 @@ class ResourceFinder:
             找到的资源绝对路径，未找到返回None
         """
         resource_path = Path(resource_path)
-        logger.debug(f"查找资源: {resource_path}, 类型: {resource_type}")
 
         # 如果已经是绝对路径且存在，直接返回
         if resource_path.is_absolute():
@@ -317,10 +405,37 @@ class ResourceFinder:
                 logger.debug(f"绝对路径不存在: {resource_path}")
                 return None
 
-        # 在所有基础路径中查找
-        logger.debug(f"在 {len(self._base_paths)} 个基础路径中查找资源")
+        key = (resource_path.as_posix(), resource_type)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            result, cached_at = cached
+            if result is not None or time.monotonic() - cached_at < _NEGATIVE_TTL:
+                return result
+
+        result = self._search(key[0], resource_type)
+        with self._cache_lock:
+            self._cache[key] = (result, time.monotonic())
+        return result
+
+    def _search(self, relative: str, resource_type: str) -> Optional[Path]:
+        """
+        在所有基础路径中查找（有资源清单的基础路径直接查表）
+        """
+        logger.debug(
+            f"查找资源: {relative}, 类型: {resource_type}，"
+            f"在 {len(self._base_paths)} 个基础路径中查找"
+        )
         for i, base_path in enumerate(self._base_paths):
-            full_path = base_path / resource_path
+            manifest = self._manifests.get(base_path)
+            if manifest is not None and manifest.covers(relative):
+                full_path = manifest.lookup(relative, resource_type)
+                if full_path is not None:
+                    logger.info(f"✓ 找到资源（清单）: {full_path}")
+                    return full_path
+                continue
+
+            full_path = base_path / relative
             logger.debug(f"尝试路径 {i+1}: {full_path}")
 
             if resource_type == "file" and full_path.is_file():
@@ -330,10 +445,31 @@ class ResourceFinder:
                 logger.info(f"✓ 找到目录: {full_path}")
                 return full_path
 
-        logger.warning(f"✗ 未找到资源: {resource_path}")
+        logger.warning(f"✗ 未找到资源: {relative}")
         logger.debug(f"搜索的基础路径: {[str(p) for p in self._base_paths]}")
         return None
 
+    def invalidate(self, resource_path: Union[str, Path, None] = None):
+        """清除查找缓存.
+
+        Args:
+            resource_path: 被创建/删除的资源路径，同时清除其上级和下级路径的缓存；
+                为None时清除全部缓存
+        """
+        with self._cache_lock:
+            if resource_path is None:
+                self._cache.clear()
+                return
+            target = Path(resource_path).as_posix().rstrip("/")
+            for key in list(self._cache):
+                path = key[0]
+                if (
+                    path == target
+                    or path.startswith(target + "/")
+                    or target.startswith(path + "/")
+                ):
+                    del self._cache[key]
+
     def find_file(self, file_path: Union[str, Path]) -> Optional[Path]:
         """查找文件.
 
@@ -539,6 +675,13 @@ resource_finder = ResourceFinder()
 
 
 # 便捷函数
+def invalidate_resource_cache(resource_path: Union[str, Path, None] = None):
+    """
+    清除资源查找缓存的便捷函数.
+    """
+    resource_finder.invalidate(resource_path)
+
+
 def find_file(file_path: Union[str, Path]) -> Optional[Path]:
     """
     查找文件的便捷函数.
@@ -0,0 +1,220 @@
+"""启动性能分析.
+
+main.py --profile-startup 时启用：在导入其它项目模块之前安装导入计时器，记录每个模块的导入
+耗时（累计耗时与扣除子模块后的自身耗时，含工作线程中的导入），应用就绪后连同启动阶段耗时
+（含各插件 setup/start）写出报告到 logs/startup_profile.txt 与 startup_profile.json。
+
+本模块顶层只依赖标准库，保证安装计时器时不会提前导入被测模块。
+"""
+
+import importlib.abc
+import json
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+
+class _ImportRecord:
+    __slots__ = ("name", "cumulative", "own", "thread")
+
+    def __init__(self, name: str, thread: str):
+        self.name = name
+        self.cumulative = 0.0
+        self.own = 0.0
+        self.thread = thread
+
+
+class ImportProfiler(importlib.abc.MetaPathFinder):
+    """导入计时器.
+
+    作为 sys.meta_path 的第一个查找器，把查找委托给其余查找器，并包装返回的模块加载器的
+    create_module/exec_module 计时。只包装每个模块独有的加载器实例（如源码和扩展模块加载器），
+    共享的加载器（内置/冻结模块、打包环境的归档加载器）不计时。
+    """
+
+    def __init__(self):
+        self.records: Dict[str, _ImportRecord] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def install(self):
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        try:
+            sys.meta_path.remove(self)
+        except ValueError:
+            pass
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find_spec = getattr(finder, "find_spec", None)
+            if find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                self._wrap_loader(fullname, spec.loader)
+                return spec
+        return None
+
+    def _wrap_loader(self, fullname: str, loader):
+        if loader is None or isinstance(loader, type):
+            return
+        if getattr(loader, "name", None) != fullname:
+            return
+        for method in ("create_module", "exec_module"):
+            original = getattr(loader, method, None)
+            if original is not None:
+                setattr(loader, method, self._timed(fullname, original))
+
+    def _timed(self, fullname: str, func):
+        def wrapper(*args, **kwargs):
+            stack = getattr(self._local, "stack", None)
+            if stack is None:
+                stack = self._local.stack = []
+            # 栈元素: [模块名, 子模块累计耗时]
+            stack.append([fullname, 0.0])
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                _, children = stack.pop()
+                if stack:
+                    stack[-1][1] += elapsed
+                self._add(fullname, elapsed, elapsed - children)
+
+        return wrapper
+
+    def _add(self, fullname: str, cumulative: float, own: float):
+        with self._lock:
+            record = self.records.get(fullname)
+            if record is None:
+                record = _ImportRecord(fullname, threading.current_thread().name)
+                self.records[fullname] = record
+            record.cumulative += cumulative
+            record.own += own
+
+    def top_modules(self, limit: int = 30) -> List[dict]:
+        """
+        累计耗时最高的模块.
+        """
+        with self._lock:
+            records = sorted(
+                self.records.values(), key=lambda r: r.cumulative, reverse=True
+            )
+        return [
+            {
+                "module": r.name,
+                "cumulative_ms": round(r.cumulative * 1000, 1),
+                "self_ms": round(r.own * 1000, 1),
+                "thread": r.thread,
+            }
+            for r in records[:limit]
+        ]
+
+    def by_package(self) -> List[dict]:
+        """
+        按顶层包汇总自身耗时（如 PyQt5、cv2、sherpa_onnx）
+        """
+        totals: Dict[str, float] = defaultdict(float)
+        counts: Dict[str, int] = defaultdict(int)
+        with self._lock:
+            for record in self.records.values():
+                package = record.name.partition(".")[0]
+                totals[package] += record.own
+                counts[package] += 1
+        return [
+            {
+                "package": name,
+                "self_ms": round(total * 1000, 1),
+                "modules": counts[name],
+            }
+            for name, total in sorted(totals.items(), key=lambda i: i[1], reverse=True)
+        ]
+
+
+_profiler: Optional[ImportProfiler] = None
+
+
+def install_import_profiler() -> ImportProfiler:
+    """
+    安装导入计时器（应尽早调用）
+    """
+    global _profiler
+    if _profiler is None:
+        _profiler = ImportProfiler()
+    _profiler.install()
+    return _profiler
+
+
+def format_report(timeline_data: dict, profiler: Optional[ImportProfiler]) -> str:
+    lines = []
+    if timeline_data.get("ready_ms") is not None:
+        lines.append(f"启动就绪耗时: {timeline_data['ready_ms']:.0f}ms")
+    lines.append("")
+    lines.append("启动阶段（开始时间 / 耗时，毫秒）:")
+    for phase in timeline_data["phases"]:
+        name = "  " * phase["depth"] + phase["name"]
+        lines.append(
+            f"  {name:<36}{phase['start_ms']:>9.0f}{phase['duration_ms']:>9.0f}"
+        )
+
+    if profiler is not None:
+        lines.append("")
+        lines.append("顶层包导入耗时（自身耗时合计，毫秒）:")
+        for item in profiler.by_package()[:20]:
+            lines.append(
+                f"  {item['package']:<36}{item['self_ms']:>9.1f}"
+                f"  ({item['modules']} 个模块)"
+            )
+        lines.append("")
+        lines.append("模块导入耗时（累计 / 自身，毫秒）:")
+        for item in profiler.top_modules(40):
+            lines.append(
+                f"  {item['module']:<48}{item['cumulative_ms']:>9.1f}"
+                f"{item['self_ms']:>9.1f}  [{item['thread']}]"
+            )
+    return "\n".join(lines)
+
+
+def write_report(timeline) -> None:
+    """
+    写出启动性能报告（作为启动就绪回调）
+    """
+    from src.utils.logging_config import get_logger
+    from src.utils.resource_finder import get_project_root
+
+    logger = get_logger(__name__)
+    profiler = _profiler
+    if profiler is not None:
+        # 就绪后的按需导入不计入启动
+        profiler.uninstall()
+
+    timeline_data = timeline.as_dict()
+    log_dir = get_project_root() / "logs"
+    log_dir.mkdir(exist_ok=True)
+    text_file = log_dir / "startup_profile.txt"
+    json_file = log_dir / "startup_profile.json"
+    try:
+        text_file.write_text(format_report(timeline_data, profiler), encoding="utf-8")
+        json_file.write_text(
+            json.dumps(
+                {
+                    "timeline": timeline_data,
+                    "packages": profiler.by_package() if profiler else [],
+                    "modules": profiler.top_modules(200) if profiler else [],
+                },
+                ensure_ascii=False,
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+        logger.info(f"启动性能报告已写入: {text_file}")
+    except OSError as e:
+        logger.error(f"写入启动性能报告失败: {e}")
@@ -0,0 +1,139 @@
+"""启动耗时记录.
+
+main.py 最先导入本模块，以此作为计时起点；启动各阶段（模块导入、激活、协议、插件导入/
+setup/start）调用 phase()/record() 记录起止时间，应用就绪后输出分阶段耗时明细。
+并发执行的阶段（如各插件 setup）按开始时间排列，可直接看出关键路径。
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, List, Optional
+
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# 计时起点：本模块首次导入的时间
+_ORIGIN = time.perf_counter()
+
+
+class _Phase:
+    __slots__ = ("name", "start", "end", "depth")
+
+    def __init__(self, name: str, start: float, end: float, depth: int):
+        self.name = name
+        self.start = start
+        self.end = end
+        self.depth = depth
+
+
+class StartupTimeline:
+    """
+    启动阶段耗时记录器.
+    """
+
+    def __init__(self, origin: Optional[float] = None):
+        self.origin = _ORIGIN if origin is None else origin
+        self._phases: List[_Phase] = []
+        self._lock = threading.Lock()
+        self._depth = 0
+        self.ready_at: Optional[float] = None
+        self._ready_callbacks: List[Callable[["StartupTimeline"], None]] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        记录一个顺序执行的阶段，嵌套阶段在报告中缩进显示.
+        """
+        start = time.perf_counter()
+        depth = self._depth
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self.record(name, start, time.perf_counter(), depth)
+
+    def record(self, name: str, start: float, end: float, depth: Optional[int] = None):
+        """
+        记录一个阶段（可在任意线程调用，用于并发执行的任务）
+        """
+        if depth is None:
+            depth = self._depth
+        with self._lock:
+            self._phases.append(_Phase(name, start, end, depth))
+
+    def on_ready(self, callback: Callable[["StartupTimeline"], None]):
+        """
+        注册就绪回调（如写出启动性能报告）
+        """
+        self._ready_callbacks.append(callback)
+
+    def mark_ready(self) -> float:
+        """标记应用就绪并调用就绪回调.
+
+        Returns:
+            距计时起点的毫秒数
+        """
+        if self.ready_at is None:
+            self.ready_at = time.perf_counter()
+            for callback in self._ready_callbacks:
+                try:
+                    callback(self)
+                except Exception as e:
+                    logger.error(f"启动就绪回调失败: {e}")
+        return (self.ready_at - self.origin) * 1000
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            phases = sorted(self._phases, key=lambda p: p.start)
+        return {
+            "ready_ms": (
+                round((self.ready_at - self.origin) * 1000, 1)
+                if self.ready_at is not None
+                else None
+            ),
+            "phases": [
+                {
+                    "name": p.name,
+                    "start_ms": round((p.start - self.origin) * 1000, 1),
+                    "duration_ms": round((p.end - p.start) * 1000, 1),
+                    "depth": p.depth,
+                }
+                for p in phases
+            ],
+        }
+
+    def report(self) -> str:
+        """
+        分阶段耗时明细（开始时间 + 耗时，单位毫秒）
+        """
+        data = self.as_dict()
+        lines = []
+        if data["ready_ms"] is not None:
+            lines.append(f"启动就绪耗时 {data['ready_ms']:.0f}ms")
+        else:
+            lines.append("启动耗时明细")
+        for phase in data["phases"]:
+            name = "  " * phase["depth"] + phase["name"]
+            lines.append(
+                f"  {name:<32} @{phase['start_ms']:>7.0f}ms  {phase['duration_ms']:>7.0f}ms"
+            )
+        return "\n".join(lines)
+
+    def log_report(self):
+        logger.info(self.report())
+
+
+_timeline: Optional[StartupTimeline] = None
+
+
+def get_startup_timeline() -> StartupTimeline:
+    """
+    获取启动耗时记录器单例.
+    """
+    global _timeline
+    if _timeline is None:
+        _timeline = StartupTimeline()
+    return _timeline
@@ -415,6 +415,11 @@ class CameraWidget(QWidget):
             height = self._get_spin_value("frame_height_spin")
             fps = self._get_spin_value("fps_spin")
 
+            # 释放拍照工具常驻占用的摄像头，避免设备被独占
+            from src.mcp.tools.camera.capture_service import get_capture_service
+
+            get_capture_service().release()
+
             # 初始化摄像头
             self.camera = cv2.VideoCapture(camera_index)
 
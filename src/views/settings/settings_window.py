@@ -209,6 +209,11 @@ class SettingsWindow(QDialog):
             for config_path, value in all_config_data.items():
                 self.config_manager.update_config(config_path, value)
 
+            # 立即写盘，确认写入成功后才提示保存成功（重启前也必须已写入）
+            if not self.config_manager.flush():
+                self.logger.error("配置写入文件失败")
+                return False
+
             self.logger.info("配置保存成功")
             return True
 
@@ -293,6 +298,9 @@ class SettingsWindow(QDialog):
 
             self.logger.info(f"重启命令: {python} {script} {' '.join(args)}")
 
+            # os.execv 不会执行 atexit，先写入尚未落盘的配置
+            self.config_manager.flush()
+
             # 关闭当前应用
             QApplication.quit()
 